@@ -0,0 +1,41 @@
+"""Compare cold (parsed) and warm (cached) loads of a large .sfmt deck.
+
+Run from the repository root with: python3 bench/bench_deck_cache.py [lines]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from data_object import DataObject  # noqa: E402
+from file_reader import FileReader  # noqa: E402
+
+
+DEFAULT_LINES: int = 200000
+
+
+def main() -> None:
+    """Load the same deck without and with its cache."""
+    lines: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path: str = os.path.join(tmp_dir, "synthetic.sfmt")
+        with open(path, 'w', encoding='utf-8') as f:
+            for i in range(lines):
+                f.write("word {} - meaning {} / sense {} - reading {}\n"
+                        .format(i, i % 50000, i % 300, i % 2000))
+
+        for name in ("cold", "warm"):
+            start: float = time.perf_counter()
+            pool = FileReader.read_deck(path)
+            loaded: float = time.perf_counter() - start
+            d_objs = DataObject.from_pool(pool)
+            total: float = time.perf_counter() - start
+            assert d_objs[-1].check("word {}".format(lines - 1))
+            print("{}: pool {:.3f}s, with DataObjects {:.3f}s".format(
+                name, loaded, total))
+
+
+if __name__ == '__main__':
+    main()
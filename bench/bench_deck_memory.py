@@ -0,0 +1,101 @@
+"""Report the peak memory of loading a large synthetic .sfmt deck.
+
+The deck is loaded once with the original per object nested lists, and
+once with the pooled DataObjects, each in a fresh process.
+
+Run from the repository root with: python3 bench/bench_deck_memory.py [lines]
+"""
+import gc
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import FrozenSet, List
+
+SRC_PATH: str = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             "..", "src")
+sys.path.insert(0, SRC_PATH)
+
+DEFAULT_LINES: int = 1000000
+
+
+class LegacyDataObject:
+    """The original DataObject layout, a dict with nested lists."""
+
+    def __init__(self, data: List[List[str]]) -> None:
+        """Store the data and its cleaned strings like the original."""
+        from normalizer import normalize
+        self.data: List[List[str]] = data
+        self.keys: FrozenSet[str] = frozenset(
+            normalize(string) for segment in data for string in segment)
+
+
+def write_deck(path: str, lines: int) -> None:
+    """Write a synthetic deck with a realistic amount of repeated strings."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(lines):
+            f.write("word {} - meaning {} / sense {} - reading {}\n".format(
+                i, i % 50000, i % 300, i % 2000))
+
+
+def peak_rss_mb() -> float:
+    """Return the peak resident set size of this process in MB."""
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':  # Reported in bytes instead of KB.
+        peak //= 1024
+    return peak / 1024
+
+
+def current_rss_mb() -> float:
+    """Return the current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm", 'r') as f:
+            pages: int = int(f.read().split()[1])
+        return pages * resource.getpagesize() / (1024 * 1024)
+    except OSError:  # Not available on this platform.
+        return float('nan')
+
+
+def load(mode: str, path: str) -> None:
+    """Load the deck with the given layout and print the results."""
+    baseline: float = peak_rss_mb()
+    start: float = time.perf_counter()
+    if mode == "legacy":
+        d_objs: list = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                d_objs.append(LegacyDataObject(
+                    [[s.strip() for s in segment.split("/")]
+                     for segment in line.strip().split("-")]))
+    else:
+        from file_reader import FileReader
+        d_objs = []
+        FileReader.read_sfmt(path, d_objs)
+    elapsed: float = time.perf_counter() - start
+    gc.collect()
+    print("{:<8}{:>10}{:>14.1f}{:>14.1f}{:>14.1f}{:>10.2f}".format(
+        mode, len(d_objs), baseline, peak_rss_mb(), current_rss_mb(),
+        elapsed))
+
+
+def main() -> None:
+    """Write the deck and load it with each layout in a new process."""
+    if len(sys.argv) == 3:
+        load(sys.argv[1], sys.argv[2])
+        return
+    lines: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path: str = os.path.join(tmp_dir, "synthetic.sfmt")
+        write_deck(path, lines)
+        print("{:<8}{:>10}{:>14}{:>14}{:>14}{:>10}".format(
+            "layout", "cards", "start (MB)", "peak (MB)", "loaded (MB)",
+            "time (s)"))
+        for mode in ("legacy", "pool"):
+            subprocess.run([sys.executable, __file__, mode, path],
+                           check=True, cwd=SRC_PATH)
+
+
+if __name__ == '__main__':
+    main()
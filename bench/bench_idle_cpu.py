@@ -0,0 +1,54 @@
+"""Compare the idle CPU use of busy-wait polling and the Tk mainloop.
+
+Needs a display. Run from the repository root with:
+    python3 bench/bench_idle_cpu.py [seconds]
+"""
+import sys
+import time
+import tkinter as tk
+
+
+DEFAULT_SECONDS: float = 5.0
+# The interval the main form runs the scheduled actions at, in ms.
+ACTION_POLL_INTERVAL: int = 50
+
+
+def busy_wait(root: tk.Tk, seconds: float) -> None:
+    """Update the form in a tight loop, like the old main loop."""
+    end: float = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        root.update_idletasks()
+        root.update()
+
+
+def main_loop(root: tk.Tk, seconds: float) -> None:
+    """Run the Tk mainloop, with the after polling of the main form."""
+    def poll() -> None:
+        root.after(ACTION_POLL_INTERVAL, poll)
+
+    root.after(ACTION_POLL_INTERVAL, poll)
+    root.after(int(seconds * 1000), root.quit)
+    root.mainloop()
+
+
+def main() -> None:
+    """Measure the CPU time used by each loop while the form is idle."""
+    seconds: float = float(sys.argv[1]) if len(sys.argv) > 1 \
+        else DEFAULT_SECONDS
+    try:
+        root: tk.Tk = tk.Tk()
+    except tk.TclError as e:
+        print("unable to open a window <{}>".format(e))
+        return
+    root.geometry('854x405')
+    for name, loop in (("busy wait", busy_wait), ("mainloop", main_loop)):
+        start: float = time.process_time()
+        loop(root, seconds)
+        used: float = time.process_time() - start
+        print("{:>10}: {:.2f} s CPU over {:.0f} s ({:.1f}% of a core)".format(
+            name, used, seconds, used / seconds * 100))
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare the answer normalizer against the original chained replaces.
+
+Run from the repository root with: python3 bench/bench_normalizer.py
+"""
+import os
+import sys
+import timeit
+from typing import Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from normalizer import Normalizer  # noqa: E402
+
+
+NUMBER: int = 20000  # Calls per timing.
+
+SAMPLES: Dict[str, List[str]] = {
+    "ascii": ["To call (a friend)", "What is my favorite ice cream?",
+              "  mint $%(&@ -/ ))--/)$(&^", "tO cALL a fRIeND"],
+    "cjk": ["你好", "我是学生。", "请问，洗手间在哪里？", "你 好 ^#*$&"],
+    "mixed": ["nǐ hǎo / ni3 hao3", "你好 - hello", "wǒ (I) 我",
+              "qǐng - please - 请!"],
+}
+
+
+def legacy_clean_string(line: str) -> str:
+    """Return the string cleaned the way DataObject originally did."""
+    symbols: List[str] = [
+        '~', '`', '!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '-',
+        '_', '=', '+', '[', ']', '{', '}', '|', '\\', ':', ';', '\'', '"',
+        ',', '<', '.', '>', '/', '?']
+    for s in symbols:
+        line = line.replace(s, "")
+    line = line.replace(" ", "")
+    return line.lower().strip()
+
+
+def main() -> None:
+    """Time each implementation on every sample set."""
+    print("{:<8}{:>14}{:>14}{:>14}{:>10}".format(
+        "set", "legacy (us)", "table (us)", "cached (us)", "speedup"))
+    for name, lines in SAMPLES.items():
+        uncached = Normalizer().normalize.__wrapped__
+        cached = Normalizer().normalize
+        for line in lines:  # Both versions must agree.
+            assert legacy_clean_string(line) == uncached(line), line
+
+        results: List[float] = []
+        for func in (legacy_clean_string, uncached, cached):
+            seconds: float = timeit.timeit(
+                lambda: [func(line) for line in lines], number=NUMBER)
+            results.append(seconds / (NUMBER * len(lines)) * 1e6)
+        print("{:<8}{:>14.3f}{:>14.3f}{:>14.3f}{:>9.1f}x".format(
+            name, results[0], results[1], results[2],
+            results[0] / results[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Time loading many data files with different numbers of load workers.
+
+Run from the repository root with:
+    python3 bench/bench_parallel_load.py [files] [lines per file]
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from file_reader import FileReader  # noqa: E402
+from settings import Settings  # noqa: E402
+
+
+DEFAULT_FILES: int = 16
+DEFAULT_LINES: int = 50000
+WORKER_COUNTS: List[int] = [0, 1, 2, 4, 8]
+
+
+def write_decks(dir_path: str, files: int, lines: int) -> List[str]:
+    """Write synthetic .sfmt files and return their names."""
+    names: List[str] = []
+    for file_idx in range(files):
+        name: str = "deck_{}.sfmt".format(file_idx)
+        with open(os.path.join(dir_path, name), 'w', encoding='utf-8') as f:
+            for i in range(lines):
+                f.write("word {} {} - meaning {} / sense {} - reading {}\n"
+                        .format(file_idx, i, i % 5000, i % 300, i % 2000))
+        names.append(name)
+    return names
+
+
+def main() -> None:
+    """Load the same files with each worker count and print the timings."""
+    files: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_FILES
+    lines: int = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LINES
+    print("cpus: {}, files: {}, lines per file: {}".format(
+        os.cpu_count(), files, lines))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        names: List[str] = write_decks(tmp_dir, files, lines)
+        Settings.directory_path = tmp_dir
+        serial: float = 0
+        print("{:>8}{:>12}{:>10}".format("workers", "time (s)", "speedup"))
+        for workers in WORKER_COUNTS:
+            start: float = time.perf_counter()
+            pools = FileReader.read_decks(names, workers)
+            elapsed: float = time.perf_counter() - start
+            assert pools is not None and len(pools) == files
+            if workers == 0:
+                serial = elapsed
+            print("{:>8}{:>12.2f}{:>9.2f}x".format(
+                workers, elapsed, serial / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""Compare the old Queue based QuizQueue with the deque QuizQueue.
+
+Times recycling a card, and refilling the queue (the eager shuffle, and the
+time to the first card of a lazy shuffle).
+
+Run from the repository root with: python3 bench/bench_quiz_queue.py [cards]
+"""
+import os
+import random
+import sys
+import time
+from queue import Queue
+from random import Random
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from quiz_queue import QuizQueue  # noqa: E402
+
+
+DEFAULT_CARDS: int = 500000
+LEGACY_RECYCLES: int = 5
+RECYCLES: int = 100000
+
+
+class LegacyQuizQueue:
+    """The recycle of the old QuizQueue, which copies the whole queue."""
+
+    def __init__(self, data: List[object]):
+        """Fill the queue with the data in a random order."""
+        shuffled: List[object] = list(data)
+        random.shuffle(shuffled)
+        self.__queue: Queue = Queue()
+        for item in shuffled:
+            self.__queue.put(item)
+        self.__last_item: object = self.__queue.get()
+
+    def recycle(self) -> None:
+        """Re-insert the last item after the first 3 items."""
+        new_queue: Queue = Queue()
+        idx: int = 0
+        while not self.__queue.empty() and idx < 3:
+            new_queue.put(self.__queue.get())
+            idx += 1
+        new_queue.put(self.__last_item)
+        while not self.__queue.empty():
+            new_queue.put(self.__queue.get())
+        self.__queue = new_queue
+
+
+def legacy_fill(length: int) -> List[int]:
+    """Order the indices the way the old refill did, in O(n^2)."""
+    data_indicies: List[int] = list(range(length))
+    order: List[int] = []
+    while len(data_indicies) != 0:
+        curr_idx: int = random.randint(0, len(data_indicies) - 1)
+        order.append(data_indicies[curr_idx])
+        del data_indicies[curr_idx]
+    return order
+
+
+def time_refill(data: List[object], lazy: bool) -> float:
+    """Return the time to get the first card from a new queue."""
+    queue: QuizQueue = QuizQueue(data, lazy=lazy, rng=Random(0))
+    start: float = time.perf_counter()
+    queue.dequeue()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Time recycling and refilling a large deck with both queues."""
+    cards: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CARDS
+    data: List[object] = [object() for _ in range(cards)]
+    print("cards: {}".format(cards))
+
+    legacy: LegacyQuizQueue = LegacyQuizQueue(data)
+    start: float = time.perf_counter()
+    for _ in range(LEGACY_RECYCLES):
+        legacy.recycle()
+    legacy_time: float = (time.perf_counter() - start) / LEGACY_RECYCLES
+
+    queue: QuizQueue = QuizQueue(data)
+    queue.dequeue()
+    start = time.perf_counter()
+    for _ in range(RECYCLES):
+        queue.recycle()
+    deque_time: float = (time.perf_counter() - start) / RECYCLES
+
+    print("legacy recycle: {:.3f} ms".format(legacy_time * 1000))
+    print("deque recycle:  {:.6f} ms ({:.0f}x faster)".format(
+        deque_time * 1000, legacy_time / deque_time))
+
+    start = time.perf_counter()
+    legacy_fill(cards)
+    print("legacy refill:        {:.3f} s".format(
+        time.perf_counter() - start))
+    print("shuffle refill:       {:.3f} s".format(time_refill(data, False)))
+    print("lazy refill (1st):    {:.6f} s".format(time_refill(data, True)))
+
+
+if __name__ == '__main__':
+    main()
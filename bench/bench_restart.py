@@ -0,0 +1,54 @@
+"""Compare a cold start with a restart that reuses the loaded decks.
+
+Run from the repository root with: python3 bench/bench_restart.py [lines]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from deck_manager import DeckManager  # noqa: E402
+from grader import Grader  # noqa: E402
+from settings import Settings  # noqa: E402
+
+
+DEFAULT_LINES: int = 200000
+
+
+def soft_restart(decks: DeckManager, file_names: list) -> Grader:
+    """Create a grader the way the main form does on a soft restart."""
+    grader: Grader = Grader(None, decks)
+    grader.retain_files(file_names)
+    assert grader.stale_files(file_names) == []
+    grader.finish_loading()
+    return grader
+
+
+def main() -> None:
+    """Start cold once, then restart reusing the decks."""
+    lines: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_LINES
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_name: str = "synthetic.sfmt"
+        with open(os.path.join(tmp_dir, file_name), 'w',
+                  encoding='utf-8') as f:
+            for i in range(lines):
+                f.write("word {} - meaning {} / sense {} - reading {}\n"
+                        .format(i, i % 50000, i % 300, i % 2000))
+        Settings.directory_path = tmp_dir
+        Settings.review_log = False
+
+        start: float = time.perf_counter()
+        cold: Grader = Grader([file_name])
+        print("cold start: {:.3f}s".format(time.perf_counter() - start))
+
+        start = time.perf_counter()
+        warm: Grader = soft_restart(cold.decks, [file_name])
+        print("restart reusing decks: {:.3f}s".format(
+            time.perf_counter() - start))
+        assert warm.total_number_of_items == lines
+
+
+if __name__ == '__main__':
+    main()
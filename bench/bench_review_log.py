@@ -0,0 +1,75 @@
+"""Time replaying, recording to and compacting a large review log.
+
+Run from the repository root with:
+    python3 bench/bench_review_log.py [events] [cards]
+"""
+import os
+import sys
+import tempfile
+import time
+from random import Random
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from review_log import ReviewLog, ReviewState, LOG_MAGIC, \
+    RECORD_FORMAT  # noqa: E402
+
+
+DEFAULT_EVENTS: int = 10000000
+DEFAULT_CARDS: int = 100000
+# The number of records recorded through the ReviewLog.
+RECORDED_EVENTS: int = 1000000
+# The number of records packed at a time when writing the log.
+WRITE_CHUNK: int = 1 << 16
+
+
+def write_log(path: str, events: int, cards: int) -> None:
+    """Write a log of random review events directly."""
+    rng: Random = Random(0)
+    with open(path, 'wb') as f:
+        f.write(LOG_MAGIC)
+        for start in range(0, events, WRITE_CHUNK):
+            f.write(b"".join(
+                RECORD_FORMAT.pack(rng.randrange(cards), 1.7e9 + idx, idx,
+                                   idx // 2, 1, idx % 5, 0.0, 0.0, 0.0)
+                for idx in range(start, min(start + WRITE_CHUNK, events))))
+
+
+def main() -> None:
+    """Replay a large log, then record to it until it is compacted."""
+    events: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EVENTS
+    cards: int = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_CARDS
+    print("events: {}, cards: {}".format(events, cards))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path: str = ReviewLog.log_path(tmp_dir)
+        write_log(path, events, cards)
+        print("log size: {:.0f} MB".format(os.path.getsize(path) / 1e6))
+
+        start: float = time.perf_counter()
+        log: ReviewLog = ReviewLog(path)
+        print("replay: {:.2f} s ({} cards)".format(
+            time.perf_counter() - start, len(log)))
+
+        # Recording only updates memory and queues the record, the writer
+        # thread writes them (and compacts the log) in the background.
+        state: ReviewState = ReviewState(1, 1, 1.7e9, 1, (1.0, 2.0))
+        start = time.perf_counter()
+        for idx in range(RECORDED_EVENTS):
+            log.record(idx % cards, state)
+        recorded: float = time.perf_counter() - start
+        log.close()
+        closed: float = time.perf_counter() - start
+        print("record: {:.2f} us per review, {:.2f} s until written".format(
+            recorded / RECORDED_EVENTS * 1e6, closed))
+        print("compacted log size: {:.1f} MB".format(
+            os.path.getsize(path) / 1e6))
+
+        start = time.perf_counter()
+        log = ReviewLog(path)
+        print("replay after compaction: {:.3f} s".format(
+            time.perf_counter() - start))
+        log.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Time picking and recording cards with each scheduler on a large deck.
+
+Run from the repository root with:
+    python3 bench/bench_scheduler.py [cards] [reviews]
+"""
+import os
+import sys
+import time
+from random import Random
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from quiz_queue import QuizQueue  # noqa: E402
+from scheduler import LeitnerScheduler, SM2Scheduler  # noqa: E402
+
+
+DEFAULT_CARDS: int = 500000
+DEFAULT_REVIEWS: int = 500000
+# The chance of answering a card correctly.
+CORRECT_RATE: float = 0.8
+
+
+def main() -> None:
+    """Review the same deck with each scheduler and print the timings."""
+    cards: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CARDS
+    reviews: int = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REVIEWS
+    data: List[object] = [object() for _ in range(cards)]
+    print("cards: {}, reviews: {}".format(cards, reviews))
+    for scheduler_type in (QuizQueue, LeitnerScheduler, SM2Scheduler):
+        scheduler = scheduler_type(data, rng=Random(0))
+        answers: Random = Random(1)
+        start: float = time.perf_counter()
+        for _ in range(reviews):
+            scheduler.next()
+            scheduler.record(answers.random() < CORRECT_RATE)
+        elapsed: float = time.perf_counter() - start
+        print("{:>18}: {:.2f} us per review".format(
+            scheduler_type.__name__, elapsed / reviews * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""Load test the quiz server with many concurrent sessions.
+
+The server is started on a synthetic deck, then every simulated session
+opens its own connection, starts a session, and answers and moves on to
+the next question for a number of rounds. The latency of every request is
+recorded, the session start included.
+
+Run from the repository root with:
+    python3 bench/bench_server.py [--sessions N] [--rounds N] [--cards N]
+                                  [--websocket]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import secrets
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+
+DEFAULT_SESSIONS: int = 1000
+DEFAULT_ROUNDS: int = 10
+DEFAULT_CARDS: int = 5000
+SRC_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "..", "src")
+DECK_NAME: str = "synthetic.sfmt"
+
+
+async def http_request(reader: asyncio.StreamReader,
+                       writer: asyncio.StreamWriter, method: str, path: str,
+                       request: dict = None) -> dict:
+    """Send a request on a keep-alive connection, and return the reply."""
+    body: bytes = b"" if request is None else json.dumps(request).encode()
+    writer.write("{} {} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {}"
+                 "\r\n\r\n".format(method, path, len(body)).encode() + body)
+    head: bytes = await reader.readuntil(b"\r\n\r\n")
+    length: int = 0
+    for line in head.decode('latin-1').split("\r\n"):
+        name, _, value = line.partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+
+async def ws_request(reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter, request: dict) -> dict:
+    """Send a message on a WebSocket, and return the reply."""
+    payload: bytes = json.dumps(request).encode()
+    mask: bytes = secrets.token_bytes(4)
+    masked: bytes = bytes(byte ^ mask[idx % 4]
+                          for idx, byte in enumerate(payload))
+    if len(payload) < 126:
+        head: bytes = struct.pack('!BB', 0x81, 0x80 | len(payload))
+    else:
+        head = struct.pack('!BBH', 0x81, 0x80 | 126, len(payload))
+    writer.write(head + mask + masked)
+    frame: bytes = await reader.readexactly(2)
+    length: int = frame[1] & 0x7F
+    if length == 126:
+        length, = struct.unpack('!H', await reader.readexactly(2))
+    elif length == 127:
+        length, = struct.unpack('!Q', await reader.readexactly(8))
+    return json.loads(await reader.readexactly(length))
+
+
+async def run_session(port: int, rounds: int, use_websocket: bool,
+                      latencies: List[float]) -> None:
+    """Simulate one user, adding the latency of each request."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        start: float = time.perf_counter()
+        if use_websocket:
+            key: str = base64.b64encode(secrets.token_bytes(16)).decode()
+            writer.write(("GET /ws HTTP/1.1\r\nHost: localhost\r\n"
+                          "Upgrade: websocket\r\nConnection: Upgrade\r\n"
+                          "Sec-WebSocket-Key: {}\r\nSec-WebSocket-Version: 13"
+                          "\r\n\r\n").format(key).encode())
+            await reader.readuntil(b"\r\n\r\n")
+            await ws_request(reader, writer, {"action": "question"})
+        else:
+            reply: dict = await http_request(reader, writer, "POST",
+                                             "/sessions")
+            path: str = "/sessions/" + reply["session"]
+        latencies.append(time.perf_counter() - start)
+
+        for _ in range(rounds):
+            for action in ("answer", "next"):
+                start = time.perf_counter()
+                if use_websocket:
+                    reply = await ws_request(
+                        reader, writer, {"action": action, "answer": "x"})
+                else:
+                    reply = await http_request(
+                        reader, writer, "POST", path + "/" + action,
+                        {"answer": "x"} if action == "answer" else None)
+                latencies.append(time.perf_counter() - start)
+                assert "error" not in reply, reply
+    finally:
+        writer.close()
+
+
+def start_server(directory: str) -> Tuple[subprocess.Popen, int]:
+    """Start the server on a free port, and return it and its port."""
+    server: subprocess.Popen = subprocess.Popen(
+        [sys.executable, "server.py", "--port", "0", "--directory",
+         directory, DECK_NAME],
+        cwd=SRC_DIR, stdout=subprocess.PIPE, text=True)
+    line: str = server.stdout.readline()
+    if not line.startswith("serving"):
+        server.kill()
+        raise RuntimeError("the server didn't start")
+    return server, int(line.rsplit(":", 1)[1])
+
+
+async def run_load(port: int, sessions: int, rounds: int,
+                   use_websocket: bool) -> Tuple[List[float], float]:
+    """Run every session at once, return the latencies and total time."""
+    latencies: List[float] = []
+    start: float = time.perf_counter()
+    await asyncio.gather(*(
+        run_session(port, rounds, use_websocket, latencies)
+        for _ in range(sessions)))
+    return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    """Start the server, load it, and print the latency and throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS)
+    parser.add_argument('--rounds', type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument('--cards', type=int, default=DEFAULT_CARDS)
+    parser.add_argument('--websocket', action='store_true')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, DECK_NAME), 'w',
+                  encoding='utf-8') as f:
+            for i in range(args.cards):
+                f.write("word {} - meaning {} / sense {}\n".format(
+                    i, i % 500, i % 30))
+        server, port = start_server(tmp_dir)
+        try:
+            latencies, elapsed = asyncio.run(run_load(
+                port, args.sessions, args.rounds, args.websocket))
+        finally:
+            server.terminate()
+            server.wait()
+
+    quantiles: List[float] = statistics.quantiles(latencies, n=100)
+    print("{} {} sessions, {} requests in {:.2f}s: {:.0f} req/s, "
+          "p50 {:.1f}ms, p99 {:.1f}ms".format(
+              args.sessions, "websocket" if args.websocket else "http",
+              len(latencies), elapsed, len(latencies) / elapsed,
+              quantiles[49] * 1000, quantiles[98] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Compare the startup time of the terminal quiz and the GUI.
+
+Each entry point is imported in a new interpreter, which is everything
+done before the settings and data files are read. The GUI can't be shown
+without a display, so only its imports (including tkinter) are timed.
+
+Run from the repository root with: python3 bench/bench_startup.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import List
+
+
+DEFAULT_RUNS: int = 20
+SRC_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "..", "src")
+# The module imported by each entry point.
+ENTRY_POINTS = (("cli", "cli"), ("gui", "main_form"))
+
+
+def time_import(module: str) -> float:
+    """Return the time taken to start python and import the module."""
+    start: float = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import " + module],
+                   cwd=SRC_DIR, check=True)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Time importing each entry point."""
+    runs: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RUNS
+    baseline: List[float] = [time_import("sys") for _ in range(runs)]
+    print("python: median {:.1f}ms".format(
+        statistics.median(baseline) * 1000))
+    for name, module in ENTRY_POINTS:
+        times: List[float] = [time_import(module) for _ in range(runs)]
+        print("{}: median {:.1f}ms".format(
+            name, statistics.median(times) * 1000))
+
+
+if __name__ == '__main__':
+    main()
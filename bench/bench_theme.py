@@ -0,0 +1,53 @@
+"""Count the config calls made by the wrong answer flash of the main form.
+
+The elements only count their config calls, so this runs without a display.
+Run from the repository root with: python3 bench/bench_theme.py [elements]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from settings import Settings  # noqa: E402
+from theme import Theme, ThemeGroup  # noqa: E402
+
+
+DEFAULT_ELEMENTS: int = 1000
+
+
+class CountingElement:
+    """Element that counts how often it is configured."""
+
+    calls: int = 0
+
+    def config(self, **options) -> None:
+        """Count the call."""
+        CountingElement.calls += 1
+
+
+def main() -> None:
+    """Run the flash sequence of MainForm.answer_wrong."""
+    elements: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ELEMENTS
+    Settings.theme_colors = [
+        "#000000", "#111111", "#222222", "#333333", "#00ff00", "#ff0000"]
+    theme: Theme = Theme()
+    for idx in range(elements):
+        theme.add_to_group(CountingElement(),
+                           list(ThemeGroup)[idx % len(ThemeGroup)])
+    theme.set_theme_color()
+
+    CountingElement.calls = 0
+    start: float = time.perf_counter()
+    for set_color in (theme.set_incorrect_color, theme.set_theme_color,
+                      theme.set_incorrect_color, theme.set_theme_color,
+                      theme.set_incorrect_color, theme.set_theme_color):
+        set_color()
+    theme.set_theme_color()  # Already applied, nothing is configured.
+    print("{} elements: {} config calls in {:.2f}ms".format(
+        elements, CountingElement.calls,
+        (time.perf_counter() - start) * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Compare the weighted sampler with weighting the whole deck per question.
+
+Run from the repository root with:
+    python3 bench/bench_weighted_sampler.py [cards] [reviews]
+"""
+import os
+import sys
+import time
+from random import Random
+from typing import List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from weighted_sampler import WeightedSampler, INITIAL_ERROR, \
+    MIN_WEIGHT  # noqa: E402
+
+
+DEFAULT_CARDS: int = 1000000
+DEFAULT_REVIEWS: int = 100000
+# Reviews done with the full pass, which is much slower.
+FULL_PASS_REVIEWS: int = 20
+# The chance of answering a card correctly.
+CORRECT_RATE: float = 0.8
+
+
+def main() -> None:
+    """Time a review with the Fenwick tree and with a full pass."""
+    cards: int = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_CARDS
+    reviews: int = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_REVIEWS
+    data: List[object] = [object() for _ in range(cards)]
+    answers: Random = Random(1)
+    print("cards: {}".format(cards))
+
+    # Weighting with a full pass over the weights for every question.
+    rng: Random = Random(0)
+    weights: List[float] = [MIN_WEIGHT + INITIAL_ERROR] * cards
+    start: float = time.perf_counter()
+    for _ in range(FULL_PASS_REVIEWS):
+        idx: int = rng.choices(range(cards), weights)[0]
+        weights[idx] = MIN_WEIGHT + (
+            0.0 if answers.random() < CORRECT_RATE else 1.0)
+    full_time: float = (time.perf_counter() - start) / FULL_PASS_REVIEWS
+
+    start = time.perf_counter()
+    sampler: WeightedSampler = WeightedSampler(data, Random(0))
+    print("sampler build: {:.2f} s".format(time.perf_counter() - start))
+    start = time.perf_counter()
+    for _ in range(reviews):
+        sampler.next()
+        sampler.record(answers.random() < CORRECT_RATE)
+    tree_time: float = (time.perf_counter() - start) / reviews
+
+    print("full pass:    {:.3f} ms per review".format(full_time * 1000))
+    print("fenwick tree: {:.3f} ms per review ({:.0f}x faster)".format(
+        tree_time * 1000, full_time / tree_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Deck wide index from normalized answers to their DataObjects."""
+from typing import Dict, Iterable, List, Set
+from data_object import DataObject
+from normalizer import normalize
+
+
+class AnswerIndex:
+    """Inverted index mapping every normalized answer to its DataObjects.
+
+    This allows checking if a response is valid for any loaded DataObject
+    with a single dictionary lookup, instead of checking every string of
+    every DataObject. The index is kept up to date by adding and removing
+    DataObjects as the loaded files change.
+    """
+
+    def __init__(self, d_objs: Iterable[DataObject] = ()) -> None:
+        """Create the index, adding all of the given DataObjects."""
+        self.__index: Dict[str, Set[DataObject]] = {}
+        self.add(d_objs)
+
+    def add(self, d_objs: Iterable[DataObject]) -> None:
+        """Add DataObjects to the index.
+
+        Args:
+            d_objs (Iterable[DataObject]): The objects to be added.
+        """
+        index: Dict[str, Set[DataObject]] = self.__index
+        for d_obj in d_objs:
+            for key in d_obj.keys:
+                entry: Set[DataObject] = index.get(key)
+                if entry is None:
+                    index[key] = {d_obj}
+                else:
+                    entry.add(d_obj)
+
+    def remove(self, d_objs: Iterable[DataObject]) -> None:
+        """Remove DataObjects from the index.
+
+        Objects that are not in the index are ignored.
+
+        Args:
+            d_objs (Iterable[DataObject]): The objects to be removed.
+        """
+        index: Dict[str, Set[DataObject]] = self.__index
+        for d_obj in d_objs:
+            for key in d_obj.keys:
+                entry: Set[DataObject] = index.get(key)
+                if entry is None:
+                    continue
+                entry.discard(d_obj)
+                # Remove empty entries so the index doesn't grow forever
+                # as files are loaded and unloaded.
+                if len(entry) == 0:
+                    del index[key]
+
+    def lookup(self, compare_str: str) -> Set[DataObject]:
+        """Return every DataObject containing the given string.
+
+        Args:
+            compare_str (str): The string to be looked up.
+
+        Returns:
+            Set[DataObject]: The objects containing the string, this should
+                not be modified.
+        """
+        return self.__index.get(normalize(compare_str), set())
+
+    def contains(self, compare_str: str) -> bool:
+        """Return if any of the DataObjects contain the given string."""
+        return len(self.lookup(compare_str)) != 0
+
+    def confusables(self, d_obj: DataObject) -> List[DataObject]:
+        """Return the other DataObjects that share an answer with `d_obj`.
+
+        These are the objects where a correct answer for one of them is
+        also a correct answer for the other.
+
+        Args:
+            d_obj (DataObject): The object to find confusables for.
+
+        Returns:
+            List[DataObject]: Every other object sharing an answer.
+        """
+        found: Set[DataObject] = set()
+        for key in d_obj.keys:
+            found.update(self.__index.get(key, ()))
+        found.discard(d_obj)
+        return list(found)
+
+    def __len__(self) -> int:
+        """Return the number of distinct normalized answers."""
+        return len(self.__index)
@@ -0,0 +1,74 @@
+"""Quiz on the data files in the terminal, without the GUI.
+
+Run from the src directory with:
+    python3 cli.py [FILE ...]
+
+The files are relative to the data directory, the active files from the
+settings are used if none are given. The settings are read from
+settings.json the same as the GUI. Press Ctrl-D (or Ctrl-C) to stop.
+"""
+import argparse
+import sys
+from typing import List, Optional
+from file_reader import FileReader
+from grader import Grader
+from review_log import ReviewLog
+from settings import Settings
+
+
+# Shown before the answer is entered.
+PROMPT: str = "> "
+
+
+def quiz(grader: Grader) -> None:
+    """Ask the questions of the grader until the input ends."""
+    while True:
+        print()
+        print(grader.get_display_question(Settings.display_item))
+        try:
+            response: str = input(PROMPT)
+        except (EOFError, KeyboardInterrupt):
+            print()
+            return
+        correct: bool = grader.check(response)
+        print("{} {}".format("correct:" if correct else "wrong:",
+                             grader.get_display_answer()))
+        print("{}/{}     {}%".format(
+            grader.number_of_correct_items, grader.total_number_of_items,
+            grader.percent_correct))
+        grader.next()
+
+
+def main() -> int:
+    """Quiz on the files given on the command line.
+
+    Returns:
+        int: The exit status, 1 if no questions could be loaded.
+    """
+    parser = argparse.ArgumentParser(
+        description="Quiz on data files in the terminal.")
+    parser.add_argument(
+        'files', nargs='*', metavar='FILE',
+        help="a data file, relative to the data directory (default: the "
+        "active files from the settings)")
+    args = parser.parse_args()
+
+    FileReader.load_settings()
+    file_paths: List[str] = args.files or Settings.active_files
+    reviews: Optional[ReviewLog] = None
+    if Settings.review_log:
+        reviews = ReviewLog(ReviewLog.log_path(Settings.directory_path))
+    try:
+        grader: Grader = Grader(file_paths, reviews=reviews)
+        # The error was already printed.
+        if len(grader.decks.data) == 0:
+            return 1
+        quiz(grader)
+    finally:
+        if reviews is not None:
+            reviews.close()  # Write the pending reviews.
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,9 @@
 """TODO: INSERT DOCSTRING."""
-from typing import List
+from typing import List, Tuple
 from random import randint
 from typing import Optional
+from normalizer import normalize
+from deck_pool import DeckPool
 
 
 class DataObject:
@@ -15,21 +17,79 @@ class DataObject:
     can be represented by just a single segment instead of all of
     the data.
 
-    Attributes:
-        data (List[List[str]]): The data this object contains.
+    The data itself is stored in a `DeckPool` shared by every object
+    loaded from the same file, each object is only a light view into
+    that pool.
 
     Properties:
+        data (List[List[str]]): The data this object contains.
         segments (int): The number of segements the data contains.
+        keys (Tuple[str, ...]): The cleaned strings the data contains.
+        pool (DeckPool): The pool storing this object's data.
+        source (str): The file this object was loaded from.
     """
 
-    def __init__(self, data: List[List[str]]) -> None:
-        """TODO: INSERT DOCSTRING."""
-        self.__data: List[List[str]] = data
+    __slots__ = ('__pool', '__idx')
+
+    def __init__(self, data: List[List[str]],
+                 pool: Optional[DeckPool] = None) -> None:
+        """Create a new object, adding its data to the given pool.
+
+        Args:
+            data (List[List[str]]): The data the object will store.
+            pool (DeckPool): The pool to store the data in, a new pool is
+                created if this is not given.
+        """
+        if pool is None:
+            pool = DeckPool()
+        self.__pool: DeckPool = pool
+        # The cleaned version of every string in the data is built once by
+        # the pool here, so checking a response only needs to clean the
+        # response itself.
+        self.__idx: int = pool.add(data)
+
+    @staticmethod
+    def from_pool(pool: DeckPool) -> List['DataObject']:
+        """Return a DataObject for every element stored in the pool.
+
+        Args:
+            pool (DeckPool): The pool containing the data.
+
+        Return:
+            List[DataObject]: One object for each element of the pool.
+        """
+        d_objs: List[DataObject] = []
+        for idx in range(len(pool)):
+            d_obj: DataObject = DataObject.__new__(DataObject)
+            d_obj.__pool = pool
+            d_obj.__idx = idx
+            d_objs.append(d_obj)
+        return d_objs
+
+    @property
+    def data(self) -> List[List[str]]:
+        """Return a copy of the data this object contains."""
+        return self.__pool.data(self.__idx)
 
     @property
     def segments(self) -> int:
         """Return the number of segments this object has."""
-        return len(self.__data)
+        return self.__pool.segment_count(self.__idx)
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        """Return the cleaned version of every string this object contains."""
+        return self.__pool.keys(self.__idx)
+
+    @property
+    def pool(self) -> DeckPool:
+        """Return the pool storing this object's data."""
+        return self.__pool
+
+    @property
+    def source(self) -> str:
+        """Return the file this object was loaded from, "" if it has none."""
+        return self.__pool.source
 
     def check(self, comare_str: str) -> bool:
         """Return if the comparison string is contained in this object's data.
@@ -40,12 +100,8 @@ class DataObject:
         Return:
             bool: If the object contained the input string.
         """
-        comare_str = self._clean_string(comare_str)
-        for segment in self.__data:
-            for string in segment:
-                if self._clean_string(string) == comare_str:
-                    return True
-        return False
+        return self.__pool.has_key(
+            self.__idx, self._clean_string(comare_str))
 
     def segment_str(self, idx: int) -> str:
         """Return the string of the segment of data at the given index.
@@ -67,7 +123,10 @@ class DataObject:
             idx = 0
 
         ret_val = ""
-        for string in self.__data[idx]:  # Concat every part of the segment.
+        if self.segments == 0:  # Object has no data.
+            return ret_val
+        # Concat every part of the segment.
+        for string in self.__pool.segment(self.__idx, idx):
             ret_val += string + " | "
         # Return the new string except for the trailing " | ".
         return ret_val[:-3].strip()
@@ -85,7 +144,8 @@ class DataObject:
     def _clean_string(line: str) -> str:
         """Remove all formatting from the given string.
 
-        This includes all ASCII symbols and spaces.
+        This includes all ASCII symbols and spaces by default, see
+        `normalizer.NormalizePolicy` for the options.
 
         Args:
             line (str): The string to be cleaned.
@@ -93,19 +153,15 @@ class DataObject:
         Return:
             str: The cleaned string.
         """
-        symbols: List[str] = [
-            '~', '`', '!', '@', '#', '$', '%', '^', '&', '*', '(', ')', '-',
-            '_', '=', '+', '[', ']', '{', '}', '|', '\\', ':', ';', '\'', '"',
-            ',', '<', '.', '>', '/', '?']
-        for s in symbols:
-            line = line.replace(s, "")
-        line = line.replace(" ", "")
-        return line.lower().strip()
+        return normalize(line)
 
     @staticmethod
     def check_all(d_objs: List['DataObject'], compare_str: str) -> bool:
         """Return if any of the DataObjects contain the given string.
 
+        This checks every DataObject, use an `AnswerIndex` when checking
+        against the same DataObjects repeatedly.
+
         Args:
             d_objs (List[DataObject]): The objects to be checked for
                 the input string.
@@ -146,7 +202,8 @@ class DataObject:
         return True
 
     @staticmethod
-    def create_new(data: List[List[str]]) -> Optional['DataObject']:
+    def create_new(data: List[List[str]],
+                   pool: Optional[DeckPool] = None) -> Optional['DataObject']:
         """Return a new DataObject if the data provided is well formatted.
 
         Return None otherwise.
@@ -154,11 +211,13 @@ class DataObject:
         Args:
             data (List[List[str]]): The data for the DataObject will
                 store.
+            pool (DeckPool): The pool to store the data in, a new pool is
+                created if this is not given.
 
         Return:
             DataObject: The new object if the data is well formed.
             None: If the data is not well formed.
         """
         if DataObject.verify(data):
-            return DataObject(data)
+            return DataObject(data, pool)
         return None
@@ -0,0 +1,185 @@
+"""Compiled binary cache of the DeckPools loaded from data files."""
+import hashlib
+import json
+import mmap
+import os
+import os.path
+import struct
+import sys
+from array import array
+from typing import Optional, Tuple
+from deck_pool import DeckPool, ID_TYPE
+from normalizer import get_policy
+
+
+# The directory (inside the data directory) the cache files are stored in.
+CACHE_DIR_NAME: str = ".learner_cache"
+# The extension added to the source file name for its cache file.
+CACHE_EXTENSION: str = ".deck"
+# Changed whenever the format of the cache files changes.
+CACHE_MAGIC: bytes = b"LRNDECK1"
+# magic, byte order, (padding), source mtime (ns), source size, source hash,
+# policy hash. The padding keeps the arrays after the header aligned.
+HEADER_FORMAT: struct.Struct = struct.Struct('<8s1s7xQQ32s32s')
+# Size of the chunks read when hashing the source file.
+HASH_CHUNK_SIZE: int = 1 << 20
+
+
+class DeckCache:
+    """Caches the parsed DeckPool of each data file in a binary file.
+
+    The cache file of a data file is written next to it (in CACHE_DIR_NAME)
+    the first time the data file is parsed. The cache contains the pool with
+    all of its cleaned answer keys, and is memory mapped when loaded so the
+    data file doesn't need to be parsed again.
+
+    A cache file is only used if the data file has the same size and
+    modification time as when the cache was written, or if the modification
+    time changed but the content hash is still the same. It is also not used
+    if the answer policy changed, since the cleaned keys depend on it.
+    """
+
+    @staticmethod
+    def cache_path(file_path: str) -> str:
+        """Return the path of the cache file for the given data file."""
+        dir_path, file_name = os.path.split(file_path)
+        return os.path.join(dir_path, CACHE_DIR_NAME,
+                            file_name + CACHE_EXTENSION)
+
+    @staticmethod
+    def load(file_path: str) -> Optional[DeckPool]:
+        """Return the cached pool of the data file, if the cache is valid.
+
+        Args:
+            file_path (str): The path of the data file.
+
+        Returns:
+            DeckPool: The cached pool, backed by the memory mapped cache.
+            None: If there is no valid cache for the file.
+        """
+        if not DeckCache.__supported():
+            return None
+        cache_path: str = DeckCache.cache_path(file_path)
+        try:
+            stat: os.stat_result = os.stat(file_path)
+            with open(cache_path, 'rb') as f:
+                # The map stays open after the file is closed, and is
+                # released once the pool using it is no longer used.
+                mapped: mmap.mmap = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):  # Missing or empty cache file.
+            return None
+
+        header: Tuple = HEADER_FORMAT.unpack_from(mapped) \
+            if len(mapped) >= HEADER_FORMAT.size else ()
+        if not DeckCache.__is_valid(header, file_path, stat):
+            mapped.close()
+            return None
+        if header[2] != stat.st_mtime_ns:
+            # The content is unchanged, store the new modification time so
+            # the file doesn't need to be hashed on every load.
+            DeckCache.__update_header(cache_path, header, stat)
+
+        view: memoryview = memoryview(mapped)[HEADER_FORMAT.size:]
+        try:
+            return DeckPool.read_from(view, file_path)
+        except ValueError:  # The cache file is corrupt.
+            pass
+        # Release the map here and not in the except block, since the views
+        # made before the error are kept alive by its traceback until then.
+        view.release()
+        mapped.close()
+        return None
+
+    @staticmethod
+    def save(file_path: str, pool: DeckPool,
+             stat: Optional[os.stat_result] = None) -> None:
+        """Write the cache file for the data file.
+
+        Failing to write the cache (i.e. the directory is read only) is not
+        an error, the data file will just be parsed again next time.
+
+        Args:
+            file_path (str): The path of the data file.
+            pool (DeckPool): The pool parsed from the data file.
+            stat (os.stat_result): The stat of the data file from before it
+                was parsed, so changes made while parsing invalidate the
+                cache.
+        """
+        if not DeckCache.__supported():
+            return
+        cache_path: str = DeckCache.cache_path(file_path)
+        temp_path: str = "{}.{}.tmp".format(cache_path, os.getpid())
+        try:
+            if stat is None:
+                stat = os.stat(file_path)
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(HEADER_FORMAT.pack(
+                    CACHE_MAGIC, DeckCache.__byte_order(), stat.st_mtime_ns,
+                    stat.st_size, DeckCache.__hash_file(file_path),
+                    DeckCache.__policy_hash()))
+                pool.write_to(f)
+            # Replace the old cache all at once, so a partially written
+            # cache is never read.
+            os.replace(temp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    @staticmethod
+    def __is_valid(header: Tuple, file_path: str,
+                   stat: os.stat_result) -> bool:
+        """Return if the cache header matches the current data file."""
+        if len(header) == 0:
+            return False
+        magic, byte_order, mtime_ns, size, file_hash, policy_hash = header
+        if magic != CACHE_MAGIC or byte_order != DeckCache.__byte_order() or \
+           policy_hash != DeckCache.__policy_hash() or size != stat.st_size:
+            return False
+        if mtime_ns == stat.st_mtime_ns:
+            return True
+        # The file was modified (or just touched), only use the cache if
+        # the content is still the same.
+        try:
+            return file_hash == DeckCache.__hash_file(file_path)
+        except OSError:
+            return False
+
+    @staticmethod
+    def __update_header(cache_path: str, header: Tuple,
+                        stat: os.stat_result) -> None:
+        """Replace the modification time stored in the cache header."""
+        try:
+            with open(cache_path, 'r+b') as f:
+                f.write(HEADER_FORMAT.pack(
+                    header[0], header[1], stat.st_mtime_ns, *header[3:]))
+        except OSError:
+            pass
+
+    @staticmethod
+    def __hash_file(file_path: str) -> bytes:
+        """Return the content hash of the file."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.digest()
+
+    @staticmethod
+    def __policy_hash() -> bytes:
+        """Return the hash of the current answer policy."""
+        return hashlib.sha256(json.dumps(
+            get_policy().as_dict(), sort_keys=True).encode('utf-8')).digest()
+
+    @staticmethod
+    def __byte_order() -> bytes:
+        """Return the byte order the arrays are written in."""
+        return b'l' if sys.byteorder == 'little' else b'b'
+
+    @staticmethod
+    def __supported() -> bool:
+        """Return if the cache format is supported on this platform."""
+        return array(ID_TYPE).itemsize == 4
@@ -0,0 +1,169 @@
+"""Keeps the active data files loaded, reloading only what changed."""
+import os
+import os.path
+from typing import Dict, List, Optional, Set, Tuple
+from answer_index import AnswerIndex
+from data_object import DataObject
+from deck_pool import DeckPool
+from file_reader import FileReader
+from normalizer import NormalizePolicy, get_policy
+from settings import Settings
+
+
+# The modification time and size of a file when it was loaded.
+FileSignature = Tuple[int, int]
+
+
+class DeckManager:
+    """Stores the DataObjects of each loaded data file.
+
+    When the active files change, only the files that were added or modified
+    since they were loaded are read again, and the files that are no longer
+    active are dropped. The answer index of every loaded DataObject is kept
+    up to date along with them.
+    """
+
+    def __init__(self) -> None:
+        """Create a manager with no files loaded."""
+        # The signature, the answer policy it was loaded with and the
+        # DataObjects of each loaded file by its path. The file must be read
+        # again if the policy changes, since its answer keys depend on it.
+        self.__decks: Dict[str, Tuple[FileSignature, NormalizePolicy,
+                                      List[DataObject]]] = {}
+        # The paths of the active files, in the order they are active.
+        self.__active: List[str] = []
+        self.__index: AnswerIndex = AnswerIndex()
+
+    @staticmethod
+    def signature(file_name: str) -> Optional[FileSignature]:
+        """Return the signature of a data file, or None if it doesn't exist.
+
+        Args:
+            file_name (str): The file, relative to the data directory.
+        """
+        try:
+            stat: os.stat_result = os.stat(
+                os.path.join(Settings.directory_path, file_name))
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def stale_files(self, file_paths: List[str]) -> List[str]:
+        """Return the files that need to be read to make them all loaded.
+
+        These are the files that are not loaded yet, or that were modified
+        since they were loaded. Only the file stats are checked, no files
+        are read.
+
+        Args:
+            file_paths (List[str]): The files to be checked, relative to the
+                data directory.
+
+        Returns:
+            List[str]: The files that need to be read.
+        """
+        policy: NormalizePolicy = get_policy()
+        stale: List[str] = []
+        for file_name in dict.fromkeys(file_paths):  # Skip duplicates.
+            loaded = self.__decks.get(
+                os.path.join(Settings.directory_path, file_name))
+            if loaded is None or loaded[1] != policy or \
+               loaded[0] != self.signature(file_name):
+                stale.append(file_name)
+        return stale
+
+    def sync(self, file_paths: List[str]) -> Optional[
+            Tuple[List[DataObject], List[DataObject]]]:
+        """Make the given files the loaded files.
+
+        Args:
+            file_paths (List[str]): The files that should be loaded,
+                relative to the data directory.
+
+        Returns:
+            Tuple[List[DataObject], List[DataObject]]: The DataObjects that
+                were added, and the DataObjects that were removed.
+            None: If there was an error loading any of the files, nothing
+                is changed in this case.
+        """
+        to_read: List[str] = self.stale_files(file_paths)
+        # Get the signatures before reading, so changes made while the files
+        # are read are picked up next time.
+        signatures: List[Optional[FileSignature]] = [
+            self.signature(file_name) for file_name in to_read]
+        pools: Optional[List[DeckPool]] = \
+            FileReader.read_decks(to_read, Settings.load_workers)
+        if pools is None:
+            return None
+
+        removed: List[DataObject] = self.retain(file_paths)
+        added: List[DataObject] = []
+        for file_name, signature, pool in zip(to_read, signatures, pools):
+            new_d_objs, old_d_objs = self.put(file_name, signature, pool)
+            added.extend(new_d_objs)
+            removed.extend(old_d_objs)
+        return added, removed
+
+    def retain(self, file_paths: List[str]) -> List[DataObject]:
+        """Set the active files, dropping every loaded file not in them.
+
+        The files that are not loaded yet are not read, they should be added
+        with `put` once they are read.
+
+        Args:
+            file_paths (List[str]): The files that should be loaded,
+                relative to the data directory.
+
+        Returns:
+            List[DataObject]: The DataObjects that were removed.
+        """
+        self.__active = list(dict.fromkeys(
+            os.path.join(Settings.directory_path, file_name)
+            for file_name in file_paths))
+        active: Set[str] = set(self.__active)
+        removed: List[DataObject] = []
+        for file_path in list(self.__decks.keys()):
+            if file_path not in active:
+                removed.extend(self.__decks.pop(file_path)[2])
+        self.__index.remove(removed)
+        return removed
+
+    def put(self, file_name: str, signature: Optional[FileSignature],
+            pool: DeckPool) -> Tuple[List[DataObject], List[DataObject]]:
+        """Add a file that has been read, replacing its old version.
+
+        Args:
+            file_name (str): The file, relative to the data directory.
+            signature (FileSignature): The signature of the file from before
+                it was read.
+            pool (DeckPool): The pool read from the file.
+
+        Returns:
+            Tuple[List[DataObject], List[DataObject]]: The DataObjects that
+                were added, and the DataObjects of the old version of the
+                file that were removed.
+        """
+        file_path: str = os.path.join(Settings.directory_path, file_name)
+        removed: List[DataObject] = []
+        if file_path in self.__decks:
+            removed = self.__decks.pop(file_path)[2]
+            self.__index.remove(removed)
+        added: List[DataObject] = DataObject.from_pool(pool)
+        self.__decks[file_path] = (
+            (0, 0) if signature is None else signature, get_policy(), added)
+        self.__index.add(added)
+        return added, removed
+
+    @property
+    def data(self) -> List[DataObject]:
+        """Return every loaded DataObject, in the order of the files."""
+        data: List[DataObject] = []
+        for file_path in self.__active:
+            if file_path in self.__decks:
+                data.extend(self.__decks[file_path][2])
+        return data
+
+    @property
+    def index(self) -> AnswerIndex:
+        """Return the answer index of every loaded DataObject."""
+        return self.__index
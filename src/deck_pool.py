@@ -0,0 +1,245 @@
+"""Compact storage for the data of many DataObjects."""
+from array import array
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, \
+                   Tuple
+from normalizer import normalize
+import struct
+
+
+# Array type code used for all ids and offsets (4 byte unsigned int).
+ID_TYPE: str = 'I'
+# The counts stored before the arrays when a pool is written.
+COUNTS_FORMAT: struct.Struct = struct.Struct('<8Q')
+
+
+class DeckPool:
+    """Stores the data of every DataObject loaded from a single source.
+
+    Instead of each DataObject keeping its own nested lists of strings, each
+    unique string is stored once in a shared pool (interned) and each
+    DataObject is described by offsets into flat arrays of ids:
+
+        cards[i] .. cards[i + 1]          segments of card i
+        segments[j] .. segments[j + 1]    variants (string ids) of segment j
+        key_offsets[i] .. key_offsets[i + 1]
+                                          cleaned key ids of card i
+
+    The cleaned version of each unique string is computed once when the
+    string is first added, and is stored in the same pool.
+
+    Attributes:
+        source (str): The file the data was loaded from.
+    """
+
+    def __init__(self, source: str = "") -> None:
+        """Create a new empty pool."""
+        self.source: str = source
+        # Every unique string, and the id of each string in the pool. The
+        # ids are only needed while adding data, see `compact`.
+        self.__strings: List[str] = []
+        self.__string_ids: Optional[Dict[str, int]] = {}
+        # The string id of the cleaned version of each string.
+        self.__string_keys: array = array(ID_TYPE)
+
+        self.__variants: array = array(ID_TYPE)
+        self.__segments: array = array(ID_TYPE, [0])
+        self.__cards: array = array(ID_TYPE, [0])
+        self.__keys: array = array(ID_TYPE)
+        self.__key_offsets: array = array(ID_TYPE, [0])
+
+    def __intern(self, string: str) -> int:
+        """Return the id of the string, adding it to the pool if needed."""
+        if self.__string_ids is None:  # Rebuild the ids after compacting.
+            self.__make_mutable()
+            self.__string_ids = {
+                string: i for i, string in enumerate(self.__strings)}
+        string_id: int = self.__string_ids.get(string, -1)
+        if string_id == -1:
+            string_id = len(self.__strings)
+            self.__strings.append(string)
+            self.__string_ids[string] = string_id
+            # Reserve the key slot before interning the key, since the key
+            # may be a new string itself.
+            self.__string_keys.append(string_id)
+            key: str = normalize(string)
+            if key != string:
+                self.__string_keys[string_id] = self.__intern(key)
+        return string_id
+
+    def add(self, data: List[List[str]]) -> int:
+        """Add the data for a new DataObject to the pool.
+
+        Args:
+            data (List[List[str]]): The data of the DataObject, this should
+                already be verified.
+
+        Returns:
+            int: The index of the new DataObject in the pool.
+        """
+        card_keys: List[int] = []
+        for segment in data:
+            for string in segment:
+                string_id: int = self.__intern(string)
+                self.__variants.append(string_id)
+                key_id: int = self.__string_keys[string_id]
+                if key_id not in card_keys:
+                    card_keys.append(key_id)
+            self.__segments.append(len(self.__variants))
+        self.__cards.append(len(self.__segments) - 1)
+        self.__keys.extend(card_keys)
+        self.__key_offsets.append(len(self.__keys))
+        return len(self) - 1
+
+    def compact(self) -> None:
+        """Release the memory only needed while adding data to the pool.
+
+        This should be called once all of the data has been added, adding
+        more data afterwards is still possible but slower.
+        """
+        self.__string_ids = None
+        if isinstance(self.__strings, list):
+            # Drop the list over-allocation.
+            self.__strings = self.__strings[:]
+
+    def __make_mutable(self) -> None:
+        """Copy any read only data (see `read_from`) so it can be added to."""
+        self.__strings = list(self.__strings)
+        self.__string_keys = array(ID_TYPE, self.__string_keys)
+        self.__variants = array(ID_TYPE, self.__variants)
+        self.__segments = array(ID_TYPE, self.__segments)
+        self.__cards = array(ID_TYPE, self.__cards)
+        self.__keys = array(ID_TYPE, self.__keys)
+        self.__key_offsets = array(ID_TYPE, self.__key_offsets)
+
+    def write_to(self, f: BinaryIO) -> None:
+        """Write the pool to a binary file, so it can be read by `read_from`.
+
+        Args:
+            f (BinaryIO): The file to be written to.
+        """
+        # Every string is encoded into one blob, with the offset of each
+        # string into the blob.
+        blob: bytearray = bytearray()
+        string_offsets: array = array(ID_TYPE, [0])
+        for string in self.__strings:
+            blob += string.encode('utf-8')
+            string_offsets.append(len(blob))
+
+        arrays: List[array] = [
+            string_offsets, array(ID_TYPE, self.__string_keys),
+            array(ID_TYPE, self.__variants), array(ID_TYPE, self.__segments),
+            array(ID_TYPE, self.__cards), array(ID_TYPE, self.__keys),
+            array(ID_TYPE, self.__key_offsets)]
+        f.write(COUNTS_FORMAT.pack(len(blob), *[len(a) for a in arrays]))
+        for arr in arrays:
+            f.write(arr.tobytes())
+        f.write(blob)
+
+    @staticmethod
+    def read_from(buffer: memoryview, source: str = "") -> 'DeckPool':
+        """Create a pool from the data written by `write_to`.
+
+        The pool reads directly from the buffer without copying it, so the
+        buffer (i.e. a memory mapped file) must stay valid while the pool
+        is used.
+
+        Args:
+            buffer (memoryview): The bytes written by `write_to`.
+            source (str): The file the data was loaded from.
+
+        Returns:
+            DeckPool: The pool using the data.
+
+        Raises:
+            ValueError: If the buffer does not contain a valid pool.
+        """
+        if len(buffer) < COUNTS_FORMAT.size:
+            raise ValueError("pool data is truncated")
+        counts: Tuple[int, ...] = COUNTS_FORMAT.unpack_from(buffer)
+        blob_len: int = counts[0]
+
+        views: List[memoryview] = []
+        offset: int = COUNTS_FORMAT.size
+        for count in counts[1:]:
+            end: int = offset + count * array(ID_TYPE).itemsize
+            if end > len(buffer):
+                raise ValueError("pool data is truncated")
+            views.append(buffer[offset:end].cast(ID_TYPE))
+            offset = end
+        if offset + blob_len != len(buffer):
+            raise ValueError("pool data has an unexpected size")
+
+        pool: DeckPool = DeckPool(source)
+        pool.__strings = _BlobStrings(buffer[offset:], views[0])
+        pool.__string_ids = None
+        (pool.__string_keys, pool.__variants, pool.__segments,
+         pool.__cards, pool.__keys, pool.__key_offsets) = views[1:]
+        return pool
+
+    def __len__(self) -> int:
+        """Return the number of DataObjects stored in the pool."""
+        return len(self.__cards) - 1
+
+    def segment_count(self, idx: int) -> int:
+        """Return the number of segments of the DataObject at `idx`."""
+        return self.__cards[idx + 1] - self.__cards[idx]
+
+    def segment(self, idx: int, segment_idx: int) -> List[str]:
+        """Return the strings of a segment of the DataObject at `idx`.
+
+        Args:
+            idx (int): The index of the DataObject.
+            segment_idx (int): The index of the segment in the DataObject.
+
+        Returns:
+            List[str]: Each variation of the segment.
+        """
+        segment: int = self.__cards[idx] + segment_idx
+        strings: List[str] = self.__strings
+        return [strings[string_id] for string_id in
+                self.__variants[self.__segments[segment]:
+                                self.__segments[segment + 1]]]
+
+    def data(self, idx: int) -> List[List[str]]:
+        """Return the full data of the DataObject at `idx`."""
+        return [self.segment(idx, i) for i in range(self.segment_count(idx))]
+
+    def keys(self, idx: int) -> Tuple[str, ...]:
+        """Return the unique cleaned strings of the DataObject at `idx`."""
+        strings: List[str] = self.__strings
+        return tuple(strings[key_id] for key_id in
+                     self.__keys[self.__key_offsets[idx]:
+                                 self.__key_offsets[idx + 1]])
+
+    def has_key(self, idx: int, key: str) -> bool:
+        """Return if the DataObject at `idx` contains the cleaned string."""
+        strings: List[str] = self.__strings
+        for key_id in self.__keys[self.__key_offsets[idx]:
+                                  self.__key_offsets[idx + 1]]:
+            if strings[key_id] == key:
+                return True
+        return False
+
+
+class _BlobStrings:
+    """Read only sequence of strings decoded on access from a utf-8 blob."""
+
+    def __init__(self, blob: memoryview, offsets: Sequence[int]) -> None:
+        """Use the given blob, string `i` is `blob[offsets[i]:offsets[i+1]]`.
+        """
+        self.__blob: memoryview = blob
+        self.__offsets: Sequence[int] = offsets
+
+    def __getitem__(self, idx: int) -> str:
+        """Return the string at the index."""
+        return str(self.__blob[self.__offsets[idx]:self.__offsets[idx + 1]],
+                   'utf-8')
+
+    def __len__(self) -> int:
+        """Return the number of strings."""
+        return len(self.__offsets) - 1
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over every string."""
+        for idx in range(len(self)):
+            yield self[idx]
@@ -1,23 +1,188 @@
-"""TODO: INSERT DOCSTRING."""
+"""Error reporting, logging and the errors raised by the app.
+
+The errors are logged and printed here, and displayed to the user by the
+error sink (see `set_error_sink`), so this doesn't depend on a UI.
+"""
+import atexit
 import traceback
 import logging
-from tkinter import messagebox
+import os.path
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import Queue
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+# The log file, in the directory of the app (not the working directory).
+LOG_PATH: str = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "log.txt")
+# The size the log can grow to before it is rotated, and the number of old
+# logs (log.txt.1, log.txt.2, ...) that are kept.
+LOG_MAX_BYTES: int = 1 << 20
+LOG_BACKUP_COUNT: int = 3
+# The name of the logger the app logs to.
+LOGGER_NAME: str = "learner"
+
+# The most messages listed in the message summarizing a group of errors,
+# the rest are only logged.
+MAX_LISTED_ERRORS: int = 10
+
+# Displays a message to the user, given if it is an error (instead of a
+# warning), the title and the message.
+ErrorSink = Callable[[bool, str, str], None]
+
+# The errors reported in each active `collect_errors` block, innermost last.
+# Each maps the message to the number of times it was reported.
+_error_groups: List[Dict[str, int]] = []
+# Writes the queued log records to the log file on a background thread, None
+# until the log is first used.
+_log_listener: Optional[QueueListener] = None
+
+
+class DataFileError(Exception):
+    """Raised when a data file can not be loaded.
+
+    Attributes:
+        file_path (str): The file that could not be loaded.
+        msg (str): A description of the problem.
+        line_no (int): The line of the file the problem is on, if known.
+    """
+
+    def __init__(self, file_path: str, msg: str,
+                 line_no: Optional[int] = None) -> None:
+        """Create the error, the arguments are kept so it can be pickled."""
+        super().__init__(file_path, msg, line_no)
+        self.file_path: str = file_path
+        self.msg: str = msg
+        self.line_no: Optional[int] = line_no
+
+    def __str__(self) -> str:
+        """Return the message, including the line if it is known."""
+        if self.line_no is None:
+            return self.msg
+        return "{} (line {})".format(self.msg, self.line_no)
+
+
+def _ignore_error(is_error: bool, title: str, msg: str) -> None:
+    """Display nothing, the default error sink.
+
+    Every error is already printed and logged when it is reported.
+    """
+    del is_error, title, msg
+
+
+# The sink the errors are displayed with, see `set_error_sink`.
+_error_sink: ErrorSink = _ignore_error
+
 
+def set_error_sink(sink: Optional[ErrorSink]) -> None:
+    """Set how the errors are displayed to the user.
 
-def _get_log():
-    """Create and return a log object."""
-    log_handler = logging.FileHandler("log.txt")
-    log = logging.getLogger()
-    log.addHandler(log_handler)
+    Args:
+        sink (ErrorSink): Called with each error (or group of errors, see
+            `collect_errors`) to display. The errors are only printed and
+            logged if this is None.
+    """
+    global _error_sink
+    _error_sink = _ignore_error if sink is None else sink
+
+
+def _get_log() -> logging.Logger:
+    """Return the app's logger, setting it up the first time.
+
+    Logging only puts the records in a queue, they are written to the log
+    file by a background thread. The file is only opened once something is
+    logged, and is rotated once it reaches LOG_MAX_BYTES. The queued records
+    are written when the program exits.
+    """
+    global _log_listener
+    log: logging.Logger = logging.getLogger(LOGGER_NAME)
+    if _log_listener is not None:
+        return log
+
+    file_handler: RotatingFileHandler = RotatingFileHandler(
+        LOG_PATH, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+        encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s %(levelname)s %(message)s"))
+    log_queue: Queue = Queue()
+    _log_listener = QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    log.addHandler(QueueHandler(log_queue))
+    # Records are only written to the log file, not to the root logger too.
+    log.propagate = False
     return log
 
 
+@contextmanager
+def collect_errors() -> Iterator[None]:
+    """Collect the errors reported in the block, then display them together.
+
+    The errors are logged as they are reported, but the same message is only
+    logged once. Once the block ends, a single message lists every message
+    and the number of times it was reported. Blocks can be nested, the
+    errors are only displayed once the outermost block ends.
+    """
+    _error_groups.append({})
+    try:
+        yield
+    finally:
+        errors: Dict[str, int] = _error_groups.pop()
+        if len(_error_groups) > 0:
+            # Add the errors to the enclosing block.
+            for msg, count in errors.items():
+                _error_groups[-1][msg] = \
+                    _error_groups[-1].get(msg, 0) + count
+        else:
+            _show_errors(errors)
+
+
+def _show_errors(errors: Dict[str, int]) -> None:
+    """Display the errors collected by `collect_errors` in one message."""
+    if len(errors) == 0:
+        return
+    if len(errors) == 1 and sum(errors.values()) == 1:
+        # Display a single error the same way `error` does.
+        _error_sink(False, "warning",
+                    "warning: {}".format(next(iter(errors))))
+        return
+
+    lines: List[str] = []
+    for msg, count in list(errors.items())[:MAX_LISTED_ERRORS]:
+        lines.append("- {}{}".format(
+            msg, "" if count == 1 else " (x{})".format(count)))
+    if len(errors) > MAX_LISTED_ERRORS:
+        lines.append("- ... and {} more, see log for more details".format(
+            len(errors) - MAX_LISTED_ERRORS))
+    repeated: Dict[str, int] = {
+        msg: count for msg, count in errors.items() if count > 1}
+    if len(repeated) > 0:
+        _get_log().warning("--- Logging repeated warnings ---\n%s", "\n".join(
+            "warning: {} (x{})".format(msg, count)
+            for msg, count in repeated.items()))
+    _error_sink(False, "warning", "{} warnings:\n\n{}".format(
+        sum(errors.values()), "\n".join(lines)))
+
+
 def error(msg: str) -> None:
-    """Log and display handled errors (i.e. file not found)."""
+    """Log and display handled errors (i.e. file not found).
+
+    Inside a `collect_errors` block the error is only displayed once the
+    block ends, along with every other error reported in it.
+    """
+    if len(_error_groups) > 0:
+        group: Dict[str, int] = _error_groups[-1]
+        if msg in group:  # Already logged.
+            group[msg] += 1
+            return
+        group[msg] = 1
     log = _get_log()
     log.warning("--- Logging warning ---\nwarning: %s", msg)
     print("warning:", msg)
-    messagebox.showwarning("warning", "warning: {}".format(msg))
+    if len(_error_groups) == 0:
+        _error_sink(False, "warning", "warning: {}".format(msg))
 
 
 def unhandled_error(item, exc, val, tb) -> None:
@@ -25,7 +190,22 @@ def unhandled_error(item, exc, val, tb) -> None:
     del item  # 'item' is not used in logging but required for the callback.
     log = _get_log()
     exception = traceback.TracebackException(exc, val, tb)
-    log.exception("--- Logging unhandled exception ---", exc_info=exception)
+    log.error("--- Logging unhandled exception ---", exc_info=(exc, val, tb))
     print(exception)
-    messagebox.showerror("unhandled exception", "error: an unhandled \
+    _error_sink(True, "unhandled exception", "error: an unhandled \
         exception has occured <{}> see log for more details".format(val))
+
+
+def fatal_error(exc: Exception) -> None:
+    """Log and display an unhandled error that stopped the program.
+
+    This must be called from the `except` block handling the error, so the
+    traceback is logged.
+    """
+    log = _get_log()
+    log.exception("--- Logging unhandled exception ---")
+    print("error: {}".format(exc))
+    _error_sink(
+        True, "unhandled exception",
+        ("error: an unhandled exception has occured <{}> see log for more "
+         "details").format(exc))
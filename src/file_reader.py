@@ -1,10 +1,27 @@
 """TODO: INSERT DOCSTRING."""
 import os.path
 import json
-from typing import List, Optional
+import multiprocessing
+import re
+from typing import Iterator, List, Optional, TextIO, Tuple
 from data_object import DataObject
-from exception import error
+from deck_pool import DeckPool
+from deck_cache import DeckCache
+from exception import collect_errors, error, DataFileError
 from settings import Settings, SETTINGS_PATH
+from normalizer import get_policy, set_policy, NormalizePolicy
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+# Number of characters read at a time when reading json files.
+JSON_CHUNK_SIZE: int = 1 << 16
+# Whitespace allowed between json values.
+JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# A value whose decoding fails or ends within this many characters of the
+# end of the read text may be cut off (i.e. "tru", "\\u00", "1.5e"), longer
+# than any json literal or escape.
+JSON_TOKEN_SLACK: int = 16
 
 
 class FileReader:
@@ -24,26 +41,14 @@ class FileReader:
                 the files.
             None: If there was an error loading in any objects.
         """
+        pools: Optional[List[DeckPool]] = \
+            FileReader.read_decks(file_paths, Settings.load_workers)
+        if pools is None:
+            return None
+
         data: List[DataObject] = []
-        for file_path in file_paths:
-            file_path = os.path.join(Settings.directory_path, file_path)
-
-            # Ensure the current file exists.
-            if not os.path.exists(file_path):
-                error(("unable to load file '{}', file could not be "
-                       "found").format(file_path))
-                return None
-
-            if file_path.endswith('.json'):  # Json data file.
-                if not FileReader.read_json(file_path, data):
-                    return None
-            elif file_path.endswith('.sfmt'):  # 'Simple Format' data file.
-                if not FileReader.read_sfmt(file_path, data):
-                    return None
-            else:
-                error(("the file '{}' is not a valid file format (.json or "
-                       ".sfmt)").format(file_path))
-                return None
+        for pool in pools:
+            data.extend(DataObject.from_pool(pool))
 
         # Ensure that data was loaded in, and the files were not empty.
         if len(data) == 0:
@@ -54,8 +59,200 @@ class FileReader:
         return data
 
     @staticmethod
-    def read_json(file_path: str, data: List[DataObject]) -> bool:
-        """Read in json files and adds the loaded DataObjects to `data`.
+    def read_decks(file_paths: List[str],
+                   workers: int = 0) -> Optional[List[DeckPool]]:
+        """Read the given files into one DeckPool per file.
+
+        See `iter_decks` for how the files are read.
+
+        Args:
+            file_paths (List[str]): A list of all the files to be read,
+                relative to the data directory.
+            workers (int): The number of worker processes to parse the
+                files with.
+
+        Returns:
+            List[DeckPool]: The pool of each file.
+            None: If there was an error loading any of the files, only the
+                error of the first failing file is reported.
+        """
+        try:
+            return list(FileReader.iter_decks(file_paths, workers))
+        except DataFileError as e:
+            error(str(e))
+            return None
+        except (BrokenProcessPool, OSError) as e:
+            # A worker process died, or the workers couldn't be started.
+            error("unable to load data files <{}>".format(e))
+            return None
+
+    @staticmethod
+    def iter_decks(file_paths: List[str],
+                   workers: int = 0) -> Iterator[DeckPool]:
+        """Yield the DeckPool of each of the given files as it is read.
+
+        The files can be parsed in parallel by a pool of worker processes,
+        the pools are always yielded in the order of `file_paths`.
+
+        Args:
+            file_paths (List[str]): A list of all the files to be read,
+                relative to the data directory.
+            workers (int): The number of worker processes to parse the
+                files with, the files are parsed one after another in this
+                process if this is less than 2.
+
+        Yields:
+            DeckPool: The pool of each file.
+
+        Raises:
+            DataFileError: The error of the first failing file.
+            BrokenProcessPool: If a worker process died.
+            OSError: If the worker processes couldn't be started.
+        """
+        full_paths: List[str] = [
+            os.path.join(Settings.directory_path, file_path)
+            for file_path in file_paths]
+
+        if workers < 2 or len(full_paths) < 2:
+            for file_path in full_paths:
+                yield FileReader.read_deck(file_path)
+        else:
+            yield from FileReader.__iter_decks_parallel(full_paths, workers)
+
+    @staticmethod
+    def __iter_decks_parallel(file_paths: List[str],
+                              workers: int) -> Iterator[DeckPool]:
+        """Parse the files with a pool of worker processes.
+
+        Files with an up to date compiled cache are loaded from the cache
+        in this process, only the other files are parsed by the workers.
+
+        Raises:
+            DataFileError: The error of the first failing file (in the order
+                of `file_paths`).
+            BrokenProcessPool: If a worker process died.
+            OSError: If the worker processes couldn't be started.
+        """
+        pools: List[Optional[DeckPool]] = [None] * len(file_paths)
+        if Settings.deck_cache:
+            pools = [DeckCache.load(file_path) for file_path in file_paths]
+        to_parse: List[str] = [file_path for file_path, pool
+                               in zip(file_paths, pools) if pool is None]
+        if len(to_parse) == 0:
+            yield from pools
+            return
+
+        policy: dict = get_policy().as_dict()
+        # The files are read on a background thread of the GUI, and forking
+        # a process with other threads running can leave locks held by them
+        # locked forever in the workers, so the workers are spawned instead.
+        executor: ProcessPoolExecutor = ProcessPoolExecutor(
+            max_workers=min(workers, len(to_parse)),
+            mp_context=multiprocessing.get_context('spawn'))
+        try:
+            # Results are collected in submission order, so the first error
+            # raised is from the first failing file.
+            parsed: Iterator[DeckPool] = executor.map(
+                _read_deck_worker, to_parse, [policy] * len(to_parse),
+                [Settings.deck_cache] * len(to_parse))
+            for pool in pools:
+                yield next(parsed) if pool is None else pool
+        finally:
+            # Don't wait for files after a failing file to be parsed.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def read_deck(file_path: str) -> DeckPool:
+        """Read a single file into a new DeckPool.
+
+        The compiled cache of the file is used if it is up to date,
+        otherwise the file is parsed and the cache is written.
+
+        Args:
+            file_path (str): The path of the file to be read.
+
+        Returns:
+            DeckPool: The pool containing all of the file's elements.
+
+        Raises:
+            DataFileError: If the file can not be found or is not valid.
+        """
+        if Settings.deck_cache:
+            pool: Optional[DeckPool] = DeckCache.load(file_path)
+            if pool is not None:
+                return pool
+        return FileReader.parse_deck(file_path, Settings.deck_cache)
+
+    @staticmethod
+    def parse_deck(file_path: str, write_cache: bool = False) -> DeckPool:
+        """Parse a single file into a new DeckPool, ignoring any cache.
+
+        Args:
+            file_path (str): The path of the file to be read.
+            write_cache (bool): If the compiled cache of the file should be
+                written after parsing it.
+
+        Returns:
+            DeckPool: The pool containing all of the file's elements.
+
+        Raises:
+            DataFileError: If the file can not be found or is not valid.
+        """
+        # Ensure the current file exists.
+        if not os.path.exists(file_path):
+            raise DataFileError(
+                file_path, "unable to load file '{}', file could not be "
+                "found".format(file_path))
+
+        # Get the file stats before parsing, so any changes made while the
+        # file is parsed invalidate the cache.
+        stat: os.stat_result = os.stat(file_path)
+        pool: DeckPool = DeckPool(file_path)
+        for _ in FileReader.iter_file(file_path, pool):
+            pass
+        if write_cache:
+            DeckCache.save(file_path, pool, stat)
+        return pool
+
+    @staticmethod
+    def iter_file(file_path: str, pool: Optional[DeckPool] = None,
+                  errors: Optional[List[DataFileError]] = None
+                  ) -> Iterator[DataObject]:
+        """Yield the DataObjects of a data file as they are parsed.
+
+        The parser is chosen by the file extension.
+
+        Args:
+            file_path (str): The data file to be read.
+            pool (DeckPool): The pool to store the data in, a new pool is
+                created for the file if this is not given.
+            errors (List[DataFileError]): If this is given, every problem
+                with the file is added to it instead of raised, and the
+                invalid elements are skipped (see `iter_json`).
+
+        Yields:
+            DataObject: Each element loaded from the file.
+
+        Raises:
+            DataFileError: If the file is not valid, and `errors` is None.
+        """
+        if file_path.endswith('.json'):  # Json data file.
+            return FileReader.iter_json(file_path, pool, errors)
+        if file_path.endswith('.sfmt'):  # 'Simple Format' data file.
+            return FileReader.iter_sfmt(file_path, pool, errors)
+        e = DataFileError(
+            file_path, "the file '{}' is not a valid file format (.json or "
+            ".sfmt)".format(file_path))
+        if errors is None:
+            raise e
+        errors.append(e)
+        return iter(())
+
+    @staticmethod
+    def iter_json(file_path: str, pool: Optional[DeckPool] = None,
+                  errors: Optional[List[DataFileError]] = None
+                  ) -> Iterator[DataObject]:
+        """Yield the DataObjects of a json file.
 
         Every json file should contain a 3D list of strings. The
         first dimention is the list containing all of the data
@@ -64,6 +261,83 @@ class FileReader:
         the DataObject. Each segment contains strings representing
         the values for that segment.
 
+        The file is read in chunks, and each element of the outer list is
+        decoded as soon as it has been read. So only the current element
+        is held in memory while parsing, not the whole file.
+
+        Args:
+            file_path (str): The json file to be read.
+            pool (DeckPool): The pool to store the data in, a new pool is
+                created for the file if this is not given.
+            errors (List[DataFileError]): If this is given, every invalid
+                element is added to it and skipped instead of raised. The
+                file is read until the end, unless the json itself is
+                invalid, since the following elements can't be found then.
+
+        Yields:
+            DataObject: Each element loaded from the file.
+
+        Raises:
+            DataFileError: If the file is not valid, and `errors` is None.
+        """
+        if pool is None:
+            pool = DeckPool(file_path)
+        with open(file_path, 'r', encoding='utf-8') as f:
+            try:
+                # Attempt to create a DataObject for each element in the
+                # list read from the file, as each element is read. All of
+                # the elements share one pool to store their data.
+                for line_no, elem in _JsonArrayReader(f, file_path):
+                    d_obj = DataObject.create_new(elem, pool)
+                    # Ensure the DataObject was able to be successfully
+                    # created.
+                    if d_obj is None:
+                        e = DataFileError(
+                            file_path, "unable to create DataObject, invalid "
+                            "data from file '{}': \"{}\"".format(
+                                file_path, elem), line_no)
+                        if errors is None:
+                            raise e
+                        errors.append(e)
+                        continue
+                    yield d_obj
+            except DataFileError as e:
+                # Invalid json, nothing after it can be read.
+                if errors is None:
+                    raise
+                errors.append(e)
+        pool.compact()
+
+    @staticmethod
+    def validate_file(file_path: str) -> Tuple[int, List[DataFileError]]:
+        """Parse a data file, finding every problem instead of the first.
+
+        No cache is read or written.
+
+        Args:
+            file_path (str): The path of the file to be checked.
+
+        Returns:
+            Tuple[int, List[DataFileError]]: The number of valid elements,
+                and the problems with the file (empty if it is valid).
+        """
+        errors: List[DataFileError] = []
+        count: int = 0
+        try:
+            for _ in FileReader.iter_file(file_path, errors=errors):
+                count += 1
+        except (OSError, UnicodeDecodeError) as e:
+            errors.append(DataFileError(
+                file_path, "unable to read file '{}' <{}>".format(
+                    file_path, e)))
+        return count, errors
+
+    @staticmethod
+    def read_json(file_path: str, data: List[DataObject]) -> bool:
+        """Read in json files and adds the loaded DataObjects to `data`.
+
+        See `iter_json` for the file format.
+
         Args:
             file_path (str): The json file to be read.
             data (List[DataObject]): The list that the newly created
@@ -72,37 +346,18 @@ class FileReader:
         Returns:
             bool: If all data was loaded properly (i.e. no errors).
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            # Read in the json from the file, if the json is valid.
-            f_data: List[List[List[str]]]
-            try:
-                f_data = json.loads(f.read())
-            except Exception as e:
-                error("invalid json in file '{}' <{}>".format(file_path, e))
-                return False
-
-            # Ensure the data read from the file, and is a list as
-            # expected.
-            if f_data is None or not isinstance(f_data, list):
-                error(("json in file '{}' does not contain a list as "
-                       "expected").format(file_path))
-                return False
-
-            # Attempt to create a DataObject for each element in
-            # the list read from the file.
-            for elem in f_data:
-                d_obj = DataObject.create_new(elem)
-                # Ensure the DataObject was able to be successfully created.
-                if d_obj is None:
-                    error(("unable to create DataObject, invalid data from "
-                           "file '{}': \"{}\"").format(file_path, elem))
-                    return False
-                data.append(d_obj)
+        try:
+            data.extend(FileReader.iter_json(file_path))
+        except DataFileError as e:
+            error(str(e))
+            return False
         return True
 
     @staticmethod
-    def read_sfmt(file_path: str, data: List[DataObject]) -> bool:
-        """Read in sfmt files and adds the loaded DataObjects to `data`.
+    def iter_sfmt(file_path: str, pool: Optional[DeckPool] = None,
+                  errors: Optional[List[DataFileError]] = None
+                  ) -> Iterator[DataObject]:
+        """Yield the DataObjects of a sfmt file as each line is parsed.
 
         sfmt stands for 'Simple Format' which is a file format designed
         to be simple and easy for the user to create.
@@ -119,43 +374,86 @@ class FileReader:
         turn into a DataObject with 3 segments consisting of
         [["this"], ["is", "a"], ["test"]].
 
+        The file is read one line at a time, so only the current line is
+        held in memory while parsing.
+
         Args:
             file_path (str): The sfmt file to be read.
-            data (List[DataObject]): The list that the newly created
-                data objects should be added to.
+            pool (DeckPool): The pool to store the data in, a new pool is
+                created for the file if this is not given.
+            errors (List[DataFileError]): If this is given, every invalid
+                line is added to it and skipped instead of raised.
 
-        Returns:
-            bool: If all data was loaded properly (i.e. no errors).
+        Yields:
+            DataObject: Each element loaded from the file.
+
+        Raises:
+            DataFileError: If the file is not valid, and `errors` is None.
         """
+        if pool is None:
+            pool = DeckPool(file_path)
         with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f.readlines():
+            for line_no, line in enumerate(f, 1):
                 line = line.strip()
                 if line == "":
                     continue
-                # Split the current line up into valid data for a DataObject
+                # Split the current line up into valid data for a
+                # DataObject, removing space formating from all strings.
                 line_data: List[List[str]] = \
-                    [s.split("/") for s in line.split("-")]
-                # Remove space formating from all strings.
-                for segment in line_data:
-                    for string in segment:
-                        string = string.strip()
+                    [[string.strip() for string in segment.split("/")]
+                     for segment in line.split("-")]
 
-                d_obj = DataObject.create_new(line_data)
+                d_obj = DataObject.create_new(line_data, pool)
                 # Ensure the DataObject was able to be successfully created.
                 if d_obj is None:
-                    error(("unable to create DataObject, invalid data from "
-                           "file '{}': \"{}\"").format(file_path, line_data))
-                    return False
-                data.append(d_obj)
+                    e = DataFileError(
+                        file_path, "unable to create DataObject, invalid "
+                        "data from file '{}': \"{}\"".format(
+                            file_path, line_data), line_no)
+                    if errors is None:
+                        raise e
+                    errors.append(e)
+                    continue
+                yield d_obj
+        pool.compact()
+
+    @staticmethod
+    def read_sfmt(file_path: str, data: List[DataObject]) -> bool:
+        """Read in sfmt files and adds the loaded DataObjects to `data`.
+
+        See `iter_sfmt` for the file format.
+
+        Args:
+            file_path (str): The sfmt file to be read.
+            data (List[DataObject]): The list that the newly created
+                data objects should be added to.
+
+        Returns:
+            bool: If all data was loaded properly (i.e. no errors).
+        """
+        try:
+            data.extend(FileReader.iter_sfmt(file_path))
+        except DataFileError as e:
+            error(str(e))
+            return False
         return True
 
     @staticmethod
     def load_settings() -> None:
         """Read in the settings json file and sets the settings values.
 
+        Every problem with the settings is displayed together once they are
+        loaded.
+
         Returns:
             None
         """
+        with collect_errors():
+            FileReader.__load_settings()
+
+    @staticmethod
+    def __load_settings() -> None:
+        """Read in the settings json file, see `load_settings`."""
         # Ensure the settings file exists.
         if not os.path.exists(SETTINGS_PATH):
             error(("unable to find settings file at '{}', please ensure it "
@@ -193,3 +491,124 @@ class FileReader:
 
         with open(SETTINGS_PATH, 'w') as f:
             f.write(Settings.as_json())
+
+
+class _JsonArrayReader:
+    """Iterates over the elements of a json list read from a file.
+
+    The file is read one chunk at a time, and only the text of the element
+    being decoded (plus at most one chunk) is kept in memory.
+    """
+
+    def __init__(self, f: TextIO, file_path: str) -> None:
+        """Read the elements of the list in the given file."""
+        self.__file: TextIO = f
+        self.__file_path: str = file_path
+        self.__decoder: json.JSONDecoder = json.JSONDecoder()
+        self.__buffer: str = ""
+        self.__pos: int = 0  # The position of the next unread character.
+        self.__eof: bool = False
+        self.__line_no: int = 1  # The line of the next unread character.
+
+    def __read_more(self) -> bool:
+        """Read the next chunk, return False if the file has ended."""
+        if self.__eof:
+            return False
+        chunk: str = self.__file.read(JSON_CHUNK_SIZE)
+        if chunk == "":
+            # Keep the buffer as it is, positions in it are still used.
+            self.__eof = True
+            return False
+        # Drop everything that has already been decoded.
+        self.__buffer = self.__buffer[self.__pos:] + chunk
+        self.__pos = 0
+        return True
+
+    def __advance(self, end: int) -> None:
+        """Move past everything before `end`, counting the lines."""
+        self.__line_no += self.__buffer.count('\n', self.__pos, end)
+        self.__pos = end
+
+    def __next_char(self) -> str:
+        """Skip any whitespace, and return the next character ('' at eof)."""
+        while True:
+            match = JSON_WHITESPACE.match(self.__buffer, self.__pos)
+            self.__advance(match.end())
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            if not self.__read_more():
+                return ""
+
+    def __invalid(self, reason: object) -> DataFileError:
+        """Return the error for invalid json at the current position."""
+        return DataFileError(
+            self.__file_path, "invalid json in file '{}' <{}>"
+            .format(self.__file_path, reason), self.__line_no)
+
+    def __decode(self) -> object:
+        """Decode and return the json value at the current position."""
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(
+                    self.__buffer, self.__pos)
+            except json.JSONDecodeError as e:
+                # The value may only be partially read if it failed near the
+                # end of the read text, or in a string that isn't closed
+                # yet. Read more and try again then, any other error is
+                # invalid json, so the rest of the file isn't read. The
+                # value is also invalid if the file has ended.
+                is_cut_off: bool = \
+                    e.pos + JSON_TOKEN_SLACK >= len(self.__buffer) or \
+                    e.msg.startswith("Unterminated string")
+                if not is_cut_off or not self.__read_more():
+                    raise self.__invalid(e.msg) from e
+                continue
+            # A value that ends near the end of the buffer (i.e. a number)
+            # may continue in the next chunk.
+            if end + JSON_TOKEN_SLACK >= len(self.__buffer) and \
+               self.__read_more():
+                continue
+            self.__advance(end)
+            return value
+
+    def __iter__(self) -> Iterator[Tuple[int, object]]:
+        """Yield the starting line and value of each element of the list.
+
+        Raises:
+            DataFileError: If the file is not a valid json list.
+        """
+        if self.__next_char() != '[':
+            raise DataFileError(
+                self.__file_path, "json in file '{}' does not contain a list "
+                "as expected".format(self.__file_path))
+        self.__advance(self.__pos + 1)
+
+        if self.__next_char() == ']':  # Empty list.
+            self.__advance(self.__pos + 1)
+        else:
+            while True:
+                self.__next_char()  # Skip to the start of the element.
+                line_no: int = self.__line_no
+                yield line_no, self.__decode()
+                char: str = self.__next_char()
+                self.__advance(self.__pos + 1)
+                if char == ']':
+                    break
+                if char != ',':
+                    raise self.__invalid(
+                        "expected ',' or ']' after an element")
+
+        # Ensure nothing comes after the list.
+        if self.__next_char() != "":
+            raise self.__invalid("extra data after the list")
+
+
+def _read_deck_worker(file_path: str, policy: dict,
+                      write_cache: bool) -> DeckPool:
+    """Parse a file into a DeckPool in a worker process.
+
+    The answer policy is passed along, since the worker process does not
+    load the settings itself.
+    """
+    set_policy(NormalizePolicy.from_dict(policy))
+    return FileReader.parse_deck(file_path, write_cache)
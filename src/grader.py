@@ -1,43 +1,260 @@
 """TODO: INSERT DOCSTRING."""
-from file_reader import FileReader
 from data_object import DataObject
 from quiz_queue import QuizQueue
-from typing import List, Optional
+from scheduler import Scheduler, LeitnerScheduler, SM2Scheduler, \
+    SCHEDULER_LEITNER, SCHEDULER_SM2, SCHEDULER_WEIGHTED, SCHEDULER_NAMES
+from weighted_sampler import WeightedSampler
+from interleaved_scheduler import InterleavedScheduler
+from answer_index import AnswerIndex
+from deck_manager import DeckManager, FileSignature
+from deck_pool import DeckPool
+from review_log import ReviewLog, ReviewState
+from exception import error
+from settings import Settings
+from typing import Dict, List, Optional
+import os.path
+import time
 
 
 # Data object displaying that an error occured.
 ERROR_D_OBJ: DataObject = DataObject([["ERROR"]])
+# Data object displayed while the files are still being loaded.
+LOADING_D_OBJ: DataObject = DataObject([["loading..."]])
 
 
 class Grader:
     """Simple grading object to control question grading.
 
     Used by the main form to grade and display questions (data objects) to
-    help remove the QuizQueue overhead. Utilizes the QuizQueue for storing
-    and getting data objects.
+    help remove the scheduler overhead. Utilizes the scheduler chosen in the
+    settings (the QuizQueue by default) for storing and getting data objects.
     """
 
-    def __init__(self, file_paths: List[str]):
-        """TODO: INSERT DOCSTRING."""
-        # Load in all data objects from the given files.
-        self.__raw_data: Optional[List[DataObject]] = \
-            FileReader.read_files(file_paths)
+    def __init__(self, file_paths: Optional[List[str]],
+                 decks: Optional[DeckManager] = None,
+                 reviews: Optional[ReviewLog] = None):
+        """Load the given files, and start quizzing on their elements.
 
-        # Display error data object if loading failed.
-        if self.__raw_data is None:
-            self.__raw_data = [ERROR_D_OBJ]
+        Args:
+            file_paths (List[str]): The data files to be loaded. If this is
+                None no files are read, and the files should be added as
+                they are read with `add_deck`.
+            decks (DeckManager): The manager of the loaded files, files it
+                already has loaded are not read again. A new manager is
+                created if this is not given.
+            reviews (ReviewLog): The log the review state of the elements
+                is restored from and saved to. Nothing is saved if this is
+                not given.
+        """
+        self.__decks: DeckManager = \
+            DeckManager() if decks is None else decks
+        self.reviews: Optional[ReviewLog] = reviews
+        # If loading the files failed, the error was already reported so
+        # there is no need to also report that no elements were found.
+        self.__load_failed: bool = False
+        # Load in all data objects from the given files.
+        if file_paths is not None:
+            self.__load_failed = self.__decks.sync(file_paths) is None
+        self.__raw_data: List[DataObject] = \
+            self.__loaded_data(file_paths is not None)
 
-        # Create a quiz queue to randomize the elements.
-        self.__elements: QuizQueue = QuizQueue(self.__raw_data)
-        self.__curr_element: DataObject = self.__elements.dequeue()
+        # Create a scheduler to decide the order of the elements.
+        self.__elements: Scheduler = self.__new_scheduler(self.__raw_data)
+        self.__restore_reviews(self.__raw_data)
+        self.__curr_element: DataObject = self.__elements.next()
 
         # Track the satistics of the total number of quiz elements, and the
         # number the user got correct.
         self.__total_items: int = 0
-        if self.__raw_data is not None:
+        if not self.is_loading:
             self.__total_items = len(self.__raw_data)
         self.__number_correct: int = 0
 
+    @staticmethod
+    def __new_scheduler(data: List[DataObject]) -> Scheduler:
+        """Return the scheduler for the elements, from the settings."""
+        if Settings.interleave_decks:
+            # The ratios are stored by file name, but the elements have the
+            # full path of their file.
+            ratios: Dict[str, int] = {
+                os.path.join(Settings.directory_path, file_name): ratio
+                for file_name, ratio in Settings.deck_ratios.items()}
+            return InterleavedScheduler(
+                data, ratios, Grader.__new_deck_scheduler)
+        return Grader.__new_deck_scheduler(data)
+
+    @staticmethod
+    def __new_deck_scheduler(data: List[DataObject]) -> Scheduler:
+        """Return the scheduler chosen in the settings for the elements."""
+        if Settings.scheduler == SCHEDULER_LEITNER:
+            return LeitnerScheduler(data, Settings.recycle_offset)
+        if Settings.scheduler == SCHEDULER_SM2:
+            return SM2Scheduler(data, Settings.recycle_offset)
+        if Settings.scheduler == SCHEDULER_WEIGHTED:
+            return WeightedSampler(data)
+        return QuizQueue(
+            data, Settings.recycle_offset, Settings.lazy_shuffle)
+
+    def __restore_reviews(self, d_objs: List[DataObject]) -> None:
+        """Give the scheduler the saved review state of the data objects.
+
+        The state is only used if it was saved with the same scheduler.
+        """
+        if self.reviews is None or len(self.reviews) == 0:
+            return
+        scheduler: int = SCHEDULER_NAMES.index(Settings.scheduler)
+        for d_obj in d_objs:
+            state: Optional[ReviewState] = \
+                self.reviews.get(ReviewLog.card_hash(d_obj))
+            if state is not None and state.scheduler == scheduler:
+                self.__elements.import_state(d_obj, state.fields)
+
+    def __save_review(self, is_correct: bool) -> None:
+        """Save the review state of the current data object."""
+        if self.reviews is None or \
+           self.__curr_element in (ERROR_D_OBJ, LOADING_D_OBJ):
+            return
+        card_hash: int = ReviewLog.card_hash(self.__curr_element)
+        old_state: Optional[ReviewState] = self.reviews.get(card_hash)
+        attempts: int = 0 if old_state is None else old_state.attempts
+        correct: int = 0 if old_state is None else old_state.correct
+        self.reviews.record(card_hash, ReviewState(
+            attempts + 1, correct + int(is_correct), time.time(),
+            SCHEDULER_NAMES.index(Settings.scheduler),
+            self.__elements.export_state(self.__curr_element)))
+
+    def __loaded_data(self, is_done: bool) -> List[DataObject]:
+        """Return the loaded data objects, or a placeholder if there are none.
+
+        Args:
+            is_done (bool): If all of the files have been loaded. The error
+                object is used if so, and the loading object if not.
+        """
+        data: List[DataObject] = self.__decks.data
+        # Ensure that data was loaded in, and the files were not empty.
+        if len(data) == 0:
+            if not is_done:
+                return [LOADING_D_OBJ]
+            if not self.__load_failed:
+                error("no elements were able to be found from any of the "
+                      "given files")
+            # Display error data object if loading failed.
+            return [ERROR_D_OBJ]
+        return data
+
+    def __apply_changes(self, added: List[DataObject],
+                        removed: List[DataObject], is_done: bool) -> bool:
+        """Update the scheduler and statistics after the files changed.
+
+        Args:
+            added (List[DataObject]): The data objects that were loaded.
+            removed (List[DataObject]): The data objects that were dropped.
+            is_done (bool): If all of the files have been loaded.
+
+        Returns:
+            bool: If the loaded data objects changed.
+        """
+        was_placeholder: bool = \
+            self.__raw_data[0] in (ERROR_D_OBJ, LOADING_D_OBJ)
+        if len(added) == 0 and len(removed) == 0 and \
+           not (is_done and self.is_loading):
+            return False
+
+        new_data: List[DataObject] = self.__loaded_data(is_done)
+        if was_placeholder or new_data[0] in (ERROR_D_OBJ, LOADING_D_OBJ):
+            # Nothing to keep, start a new queue.
+            self.__elements = self.__new_scheduler(new_data)
+            self.__restore_reviews(new_data)
+            self.__curr_element = self.__elements.next()
+        else:
+            self.__elements.remove(removed)
+            self.__elements.add(added)
+            self.__restore_reviews(added)
+            # Move on if the current data object was removed.
+            if any(d_obj is self.__curr_element for d_obj in removed):
+                self.__curr_element = self.__elements.next()
+        self.__raw_data = new_data
+        self.__total_items = 0 if self.is_loading else len(new_data)
+        return True
+
+    def update_files(self, file_paths: List[str]) -> bool:
+        """Change the loaded files, keeping the quiz progress.
+
+        Only the files that were added or modified are read, the scheduler
+        and statistics are updated in place.
+
+        Args:
+            file_paths (List[str]): The data files that should be loaded.
+
+        Returns:
+            bool: If the loaded data objects changed.
+        """
+        changes = self.__decks.sync(file_paths)
+        # Keep the current data objects if loading failed.
+        if changes is None:
+            return False
+        self.__load_failed = False
+        return self.__apply_changes(changes[0], changes[1], True)
+
+    def stale_files(self, file_paths: List[str]) -> List[str]:
+        """Return the files that must be read for all of them to be loaded.
+
+        See `DeckManager.stale_files`.
+        """
+        return self.__decks.stale_files(file_paths)
+
+    def retain_files(self, file_paths: List[str]) -> bool:
+        """Drop every loaded file that is not in `file_paths`.
+
+        The files that are not loaded yet are not read, they should be added
+        with `add_deck` once they are read.
+
+        Args:
+            file_paths (List[str]): The data files that should be loaded.
+
+        Returns:
+            bool: If the loaded data objects changed.
+        """
+        return self.__apply_changes(
+            [], self.__decks.retain(file_paths), False)
+
+    def add_deck(self, file_name: str, signature: Optional[FileSignature],
+                 pool: DeckPool) -> bool:
+        """Add a file that has been read, keeping the quiz progress.
+
+        Args:
+            file_name (str): The data file that was read.
+            signature (FileSignature): The signature of the file from before
+                it was read.
+            pool (DeckPool): The pool read from the file.
+
+        Returns:
+            bool: If the loaded data objects changed.
+        """
+        added, removed = self.__decks.put(file_name, signature, pool)
+        return self.__apply_changes(added, removed, False)
+
+    def finish_loading(self, failed: bool = False) -> bool:
+        """Set that every file has been added, after using `add_deck`.
+
+        Shows the error if no data objects were loaded.
+
+        Args:
+            failed (bool): If loading a file failed. The error should
+                already be reported, so no error is shown if no data
+                objects were loaded.
+
+        Returns:
+            bool: If the loaded data objects changed.
+        """
+        self.__load_failed = failed
+        return self.__apply_changes([], [], True)
+
+    @property
+    def is_loading(self) -> bool:
+        """Get if no files have been loaded yet, see `add_deck`."""
+        return self.__raw_data[0] is LOADING_D_OBJ
+
     def get_display_question(self, segment_idx: int) -> str:
         """Get the segment of a data object.
 
@@ -62,13 +279,14 @@ class Grader:
         return str(self.__curr_element)
 
     def next(self) -> None:
-        """Move on to the next data object from the quiz queue."""
-        self.__curr_element = self.__elements.dequeue()
+        """Move on to the next data object from the scheduler."""
+        self.__curr_element = self.__elements.next()
 
     def check(self, input_str: str) -> bool:
         """Check if the input string is correct for the current data object.
 
-        Recycle the data object back into the quiz queue if it is not.
+        The answer is recorded by the scheduler, which decides when the
+        data object is given again.
 
         Args:
             input_str (str): The string to be checked.
@@ -77,14 +295,34 @@ class Grader:
             bool: If the input string was correct or not.
         """
         is_correct: bool = self.__curr_element.check(input_str)
-        # If the answer is wrong add it back in near the front of the
-        # queue, so it can be given again.
-        if not is_correct:
-            self.__elements.recycle()
-        else:
+        # If the answer is wrong the scheduler gives it again soon.
+        self.__elements.record(is_correct)
+        self.__save_review(is_correct)
+        if is_correct:
             self.__number_correct += 1
         return is_correct
 
+    def check_any(self, input_str: str) -> bool:
+        """Check if the input string is correct for any loaded data object.
+
+        Args:
+            input_str (str): The string to be checked.
+
+        Returns:
+            bool: If any data object contains the input string.
+        """
+        return self.__decks.index.contains(input_str)
+
+    @property
+    def decks(self) -> DeckManager:
+        """Get the manager of the loaded files."""
+        return self.__decks
+
+    @property
+    def index(self) -> AnswerIndex:
+        """Get the answer index of all the loaded elements."""
+        return self.__decks.index
+
     @property
     def total_number_of_items(self) -> int:
         """Get the total number of elements loaded."""
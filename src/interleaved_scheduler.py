@@ -0,0 +1,136 @@
+"""Scheduler interleaving the elements of each data file."""
+from typing import Callable, Dict, List, Optional, Tuple
+from data_object import DataObject
+from scheduler import Scheduler
+
+
+class InterleavedScheduler(Scheduler):
+    """Scheduler giving the elements of each data file (deck) in turn.
+
+    Every deck has its own scheduler deciding the order of its elements, and
+    the decks take turns in a fixed cycle. A deck with a ratio of 3 gets 3
+    turns for every turn of a deck with a ratio of 1, no matter how many
+    elements either deck has. The turns of each deck are spread evenly over
+    the cycle, and the cycle is only rebuilt when decks are added or
+    removed, so picking the next deck is O(1).
+    """
+
+    def __init__(self, data: List[DataObject], ratios: Dict[str, int],
+                 new_scheduler: Callable[[List[DataObject]], Scheduler]):
+        """Create a scheduler of the given elements.
+
+        Args:
+            data (List[DataObject]): The elements to be quizzed on.
+            ratios (Dict[str, int]): The number of turns of each deck in the
+                cycle by its file (see `DataObject.source`), decks that
+                aren't in it have 1 turn.
+            new_scheduler (Callable[[List[DataObject]], Scheduler]): Creates
+                the scheduler of a deck from its elements.
+        """
+        self.__ratios: Dict[str, int] = ratios
+        self.__new_scheduler: Callable[[List[DataObject]], Scheduler] = \
+            new_scheduler
+        # The scheduler of each deck by its file, in the order they were
+        # added.
+        self.__decks: Dict[str, Scheduler] = {}
+        # The deck of each turn, and the next turn.
+        self.__cycle: List[Scheduler] = []
+        self.__turn: int = 0
+        # The deck of the last given element.
+        self.__last_deck: Optional[Scheduler] = None
+        self.add(data)
+
+    @staticmethod
+    def __group(d_objs: List[DataObject]) -> Dict[str, List[DataObject]]:
+        """Return the elements grouped by their file."""
+        groups: Dict[str, List[DataObject]] = {}
+        for d_obj in d_objs:
+            groups.setdefault(d_obj.source, []).append(d_obj)
+        return groups
+
+    def __build_cycle(self) -> None:
+        """Spread the turns of every deck evenly over a new cycle.
+
+        This is a smooth weighted round robin, each turn goes to the deck
+        furthest behind its share of the turns.
+        """
+        weights: List[Tuple[Scheduler, int]] = [
+            (deck, max(1, self.__ratios.get(source, 1)))
+            for source, deck in self.__decks.items()]
+        total: int = sum(weight for _, weight in weights)
+        credits: List[int] = [0] * len(weights)
+        self.__cycle = []
+        for _ in range(total):
+            for idx, (_, weight) in enumerate(weights):
+                credits[idx] += weight
+            best: int = credits.index(max(credits))
+            credits[best] -= total
+            self.__cycle.append(weights[best][0])
+        self.__turn = 0
+
+    def next(self) -> DataObject:
+        """Return the next element of the deck whose turn it is."""
+        self.__last_deck = self.__cycle[self.__turn]
+        self.__turn = (self.__turn + 1) % len(self.__cycle)
+        return self.__last_deck.next()
+
+    def record(self, is_correct: bool) -> None:
+        """Record the answer with the deck of the last given element.
+
+        Args:
+            is_correct (bool): If the answer was correct.
+        """
+        if self.__last_deck is not None:
+            self.__last_deck.record(is_correct)
+
+    def add(self, d_objs: List[DataObject]) -> None:
+        """Add new elements to their decks, creating any new decks.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be added.
+        """
+        new_decks: bool = False
+        for source, group in self.__group(d_objs).items():
+            if source in self.__decks:
+                self.__decks[source].add(group)
+            else:
+                self.__decks[source] = self.__new_scheduler(group)
+                new_decks = True
+        if new_decks:
+            self.__build_cycle()
+
+    def remove(self, d_objs: List[DataObject]) -> None:
+        """Remove elements from their decks, dropping any empty decks.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be removed.
+        """
+        removed_decks: bool = False
+        for source, group in self.__group(d_objs).items():
+            deck: Optional[Scheduler] = self.__decks.get(source)
+            if deck is None:
+                continue
+            deck.remove(group)
+            if len(deck) == 0:
+                del self.__decks[source]
+                removed_decks = True
+                if deck is self.__last_deck:
+                    self.__last_deck = None
+        if removed_decks:
+            self.__build_cycle()
+
+    def __len__(self) -> int:
+        """Return the number of elements to be quizzed on."""
+        return sum(len(deck) for deck in self.__decks.values())
+
+    def export_state(self, d_obj: DataObject) -> Tuple[float, ...]:
+        """Return the values the deck's scheduler keeps for an element."""
+        deck: Optional[Scheduler] = self.__decks.get(d_obj.source)
+        return () if deck is None else deck.export_state(d_obj)
+
+    def import_state(self, d_obj: DataObject,
+                     state: Tuple[float, ...]) -> None:
+        """Restore the values of an element in its deck's scheduler."""
+        deck: Optional[Scheduler] = self.__decks.get(d_obj.source)
+        if deck is not None:
+            deck.import_state(d_obj, state)
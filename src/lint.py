@@ -0,0 +1,101 @@
+"""Check data files for invalid elements, without starting the GUI.
+
+Run from the src directory with:
+    python3 lint.py [-j WORKERS] PATH [PATH ...]
+
+Each path is a data file, or a directory that is searched (including its
+subdirectories) for data files. Every problem is printed as
+'file:line: message', and the exit status is 1 if there were any.
+"""
+import argparse
+import os
+import os.path
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Tuple
+from exception import DataFileError
+from file_reader import FileReader
+
+
+# The extensions of the data files, see `FileReader.iter_file`.
+DATA_EXTENSIONS: Tuple[str, ...] = ('.json', '.sfmt')
+# The number of files given to a worker process at a time.
+WORKER_CHUNK_SIZE: int = 8
+
+
+def find_files(paths: List[str]) -> Iterator[str]:
+    """Yield the data files in the given files and directories.
+
+    Files given directly are always yielded, so a file with the wrong
+    extension is reported.
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for dir_path, dir_names, file_names in os.walk(path):
+            # Skip hidden directories (i.e. the deck caches), and check the
+            # files in the same order every time.
+            dir_names[:] = sorted(
+                name for name in dir_names if not name.startswith('.'))
+            for file_name in sorted(file_names):
+                if file_name.endswith(DATA_EXTENSIONS):
+                    yield os.path.join(dir_path, file_name)
+
+
+def format_error(e: DataFileError) -> str:
+    """Return the line printed for a problem."""
+    if e.line_no is None:
+        return "{}: {}".format(e.file_path, e.msg)
+    return "{}:{}: {}".format(e.file_path, e.line_no, e.msg)
+
+
+def main() -> int:
+    """Check the files given on the command line.
+
+    Returns:
+        int: The exit status, 1 if any problems were found.
+    """
+    parser = argparse.ArgumentParser(
+        description="Check data files for invalid elements.")
+    parser.add_argument(
+        'paths', nargs='+', metavar='PATH',
+        help="a data file, or a directory containing data files")
+    parser.add_argument(
+        '-j', '--workers', type=int, default=os.cpu_count() or 1,
+        help="the number of files checked at once (default: the number of "
+        "CPUs)")
+    args = parser.parse_args()
+
+    file_paths: List[str] = list(find_files(args.paths))
+    results: Iterator[Tuple[int, List[DataFileError]]]
+    executor = None
+    if args.workers < 2 or len(file_paths) < 2:
+        results = map(FileReader.validate_file, file_paths)
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=min(args.workers, len(file_paths)))
+        results = executor.map(FileReader.validate_file, file_paths,
+                               chunksize=WORKER_CHUNK_SIZE)
+
+    elements: int = 0
+    problems: int = 0
+    try:
+        # The results are in the order of the files, so the output is the
+        # same every time.
+        for count, errors in results:
+            elements += count
+            problems += len(errors)
+            for e in errors:
+                print(format_error(e))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    print("checked {} files, {} valid elements, {} problems".format(
+        len(file_paths), elements, problems), file=sys.stderr)
+    return 1 if problems > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
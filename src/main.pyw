@@ -1,37 +1,35 @@
 """TODO: INSERT DOCSTRING."""
 from main_form import MainForm
-from main_form import FormReturnStatus
-import logging
-from tkinter import messagebox
+from main_form import FormReturnStatus, show_error_dialog
+from exception import fatal_error, set_error_sink
 from file_reader import FileReader
+from deck_manager import DeckManager
+from typing import Optional
 
 
 def main_loop() -> None:
-    """TODO: INSERT DOCSTRING."""
+    """Run the main form until it is closed, creating it again on restart.
+
+    The files loaded by a form are given to the next one, so only the files
+    that changed are read again.
+    """
+    decks: Optional[DeckManager] = None
     while True:
         FileReader.load_settings()
-        main_form: MainForm = MainForm()
-        form_status: FormReturnStatus = FormReturnStatus.RUNNING
-
-        while form_status is FormReturnStatus.RUNNING:
-            form_status = main_form.update()
+        main_form: MainForm = MainForm(decks)
+        # Run the form until it is closed or restarted.
+        form_status: FormReturnStatus = main_form.run()
 
         if form_status is FormReturnStatus.RESTART:
+            decks = main_form.grader.decks
             continue
         break
 
 
 if __name__ == '__main__':
-
+    # Display the errors in message boxes.
+    set_error_sink(show_error_dialog)
     try:
         main_loop()
     except Exception as e:
-        log_handler = logging.FileHandler("log.txt")
-        log = logging.getLogger()
-        log.addHandler(log_handler)
-        log.exception("--- Logging unhandled exception ---")
-        print("error: {}".format(e))
-        messagebox.showerror(
-            "unhandled exception",
-            ("error: an unhandled exception has occured <{}> see log for more "
-             "details").format(e))
+        fatal_error(e)
@@ -2,13 +2,20 @@
 import exception
 import tkinter as tk
 from tkinter import Frame, Text, Label, Button, S, X, BOTH, FLAT, CENTER, \
-                    WORD, LEFT, DISABLED, NORMAL, END, TclError, Entry, RIGHT
+                    WORD, LEFT, DISABLED, NORMAL, END, Entry, RIGHT, messagebox
 from queue import Queue
+from threading import Thread
+from functools import partial
 from grader import Grader
+from deck_manager import DeckManager, FileSignature
+from deck_pool import DeckPool
+from file_reader import FileReader
+from review_log import ReviewLog
+from exception import DataFileError
 from theme import Theme, ThemeGroup
 from settings import Settings
 from settings_form import SettingsForm
-from typing import Tuple
+from typing import Iterator, List, Optional, Set, Tuple
 from enum import Enum
 
 
@@ -20,22 +27,59 @@ INITAL_MESSAGE: str = "Welcome!\nPress \"Begin\" to start"
 # Wait time in ms before progress unlocks upon a wrong answer.
 PROGRESS_UNBLOCK_DURATION: int = 3000
 RETURN_KEY: str = '<Return>'  # Return key. Key bound to submit button.
+RESTART_KEY: str = '<F5>'  # Key bound to restarting the form.
+# Wait time in ms between running the actions scheduled by other threads.
+ACTION_POLL_INTERVAL: int = 50
 FIXED_ELEMENT_FONT_SIZE = 12  # Font size of all fixed font size ui elements.
 
 
+def show_error_dialog(is_error: bool, title: str, msg: str) -> None:
+    """Display an error in a message box, the error sink of the GUI.
+
+    See `exception.set_error_sink`.
+    """
+    if is_error:
+        messagebox.showerror(title, msg)
+    else:
+        messagebox.showwarning(title, msg)
+
+
 class MainForm:
     """TODO: INSERT DOCSTRING."""
 
-    def __init__(self):
-        """TODO: INSERT DOCSTRING."""
+    def __init__(self, decks: Optional[DeckManager] = None):
+        """Create the form, and start loading the active files.
+
+        Args:
+            decks (DeckManager): The files loaded by a previous form, the
+                files that haven't changed are not read again.
+        """
         # Set the exception callback to handle any of the exceptions
         # that are raised.
         tk.Tk.report_callback_exception = exception.unhandled_error
         # Set what the program will do when closed (stop / restart).
         self.return_status: FormReturnStatus = FormReturnStatus.STOP
 
-        # Load all of the 'quiz' elements.
-        self.grader: Grader = Grader(Settings.active_files)
+        # The log the review state of the questions is saved to, see
+        # open_reviews.
+        self.reviews: Optional[ReviewLog] = None
+        self.open_reviews()
+        # Create the grader without any 'quiz' elements, the elements are
+        # loaded in the background once the form is created (see
+        # load_files).
+        self.grader: Grader = Grader(None, decks, self.reviews)
+        # Tracks the background loading of the data files. Every load gets
+        # a new generation, so the results of an older load are ignored.
+        self.load_generation: int = 0
+        self.files_to_load: int = 0
+        self.files_loaded: int = 0
+        # Tracks if the loaded elements changed while loading, and if the
+        # user should be told once loading is finished.
+        self.load_changed: bool = False
+        self.announce_load: bool = False
+        # The message shown in the display box when no question is being
+        # shown. The loading progress is displayed below it.
+        self.status_message: Optional[str] = None
 
         # Set form values from the settings.
         self.font_style: str = Settings.typeface
@@ -44,11 +88,10 @@ class MainForm:
         self.display_item: int = Settings.display_item
         self.theme: Theme = Theme()
 
-        self.settings_form: SettingsForm = None
-        # Tracks if the settings form has closed. If so preform singe action
-        # updates, such as updating the Grader, this is to limit number
-        # of unnessicary file reads.
-        self.update_after_settings_finish: bool = False
+        # The settings form, None if it isn't open, and the keys of the
+        # settings changed since it was opened.
+        self.settings_form: Optional[SettingsForm] = None
+        self.settings_changes: Set[str] = set()
 
         # Create the main form and configure it.
         self.form = tk.Tk()
@@ -72,29 +115,42 @@ class MainForm:
         self.progress_blocked: bool = False
 
         # A queue that other threads can store function calls to be
-        # executed by the main thread on a form update.
+        # executed by the main thread, see run_scheduled_actions.
         self.scheduled_actions: Queue = Queue()
 
         self.create_widgets()  # Populate the form.
         # Set the 'Enter' key to activate the submit button so the user
         # can submit using the keyboard.
         self.form.bind(RETURN_KEY, self.submit_callback)
+        # Restart to apply the settings that can only be changed in
+        # settings.json.
+        self.form.bind(RESTART_KEY, lambda event: self.restart())
         self.theme.set_theme_color()  # Theme the form.
-        self.display(INITAL_MESSAGE)  # Show the user the welcome message.
+        self.show_status(INITAL_MESSAGE)  # Show the user the welcome message.
+        self.load_files(Settings.active_files)
+        self.form.after(ACTION_POLL_INTERVAL, self.run_scheduled_actions)
 
-    def refresh_settings(self) -> None:
+    def refresh_settings(self, changed: Optional[Set[str]] = None) -> None:
         """Update all elements with varying settings.
 
         This makes it so the form doesn't need to be reset to apply settings,
         and settings changes can be viewed live as they are made.
+
+        Args:
+            changed (Set[str]): The keys of the settings that changed, only
+                the elements using them are updated. Every element is
+                updated if this is not given.
         """
         # The segment of the data objects to display.
         self.display_item = Settings.display_item
-        self.font_size = Settings.font_size
-        self.font_style = Settings.typeface
-        self.display_box.config(font=(self.font_style, self.font_size))
-        self.theme.update_colors()
-        self.theme.set_theme_color()
+        if changed is None or "font_size" in changed or \
+           "typeface" in changed:
+            self.font_size = Settings.font_size
+            self.font_style = Settings.typeface
+            self.display_box.config(font=(self.font_style, self.font_size))
+        if changed is None or "current_theme" in changed:
+            self.theme.update_colors()
+            self.theme.set_theme_color()
 
     def create_widgets(self) -> None:
         """Create all form elements, and populate the form.
@@ -198,7 +254,8 @@ class MainForm:
         del event  # The 'event' from the callback is never used, delete it.
         # Move on to the next question, displaying it to the user.
         if self.is_reviewing:
-            if not self.progress_blocked:
+            # The user can start as soon as the first file is loaded.
+            if not self.progress_blocked and not self.grader.is_loading:
                 self.next_question()
                 self.is_reviewing = False
                 self.theme.set_theme_color()
@@ -224,11 +281,40 @@ class MainForm:
         Callback function for the 'settings' button.
         """
         if self.settings_form is None:
-            self.settings_form = SettingsForm()
+            self.settings_changes = set()
+            self.settings_form = SettingsForm(
+                self.form, self.settings_changed, self.settings_closed)
+
+    def settings_changed(self, changed: Set[str]) -> None:
+        """Show the changes made in the settings form live.
+
+        Args:
+            changed (Set[str]): The keys of the settings that changed.
+        """
+        self.settings_changes |= changed
+        self.refresh_settings(changed)
+
+    def settings_closed(self) -> None:
+        """Apply the settings once the settings form has closed.
+
+        The grader is only updated after the settings form has closed since
+        it reads data files to get it's data, and we want to limit file
+        reading as much as possible. That's why this isn't in
+        refresh_settings. Only new or modified files are read, and the
+        current progress is kept.
+        """
+        self.settings_form = None
+        # Cancelling restores the saved settings, so update everything that
+        # was changed while the form was open.
+        self.refresh_settings(self.settings_changes)
+        self.open_reviews()
+        self.grader.reviews = self.reviews
+        self.load_files(Settings.active_files, announce=True)
 
     def next_question(self) -> None:
         """Move on to the next question, displaying it."""
         self.grader.next()
+        self.status_message = None
         self.display(self.grader.get_display_question(self.display_item))
 
     def answer_correct(self) -> None:
@@ -256,7 +342,8 @@ class MainForm:
         # Unblock the progress after the unblock duration. This is done
         # by creating a thread that waits for the given duration, then
         # enqueues a call to the unblock method. That call will then
-        # be dequeued and called by the main thread on the next update.
+        # be dequeued and called by the main thread (see
+        # run_scheduled_actions).
         #
         # Timer(PROGRESS_UNBLOCK_DURATION,
         #     lambda: self.scheduled_actions.put(
@@ -280,6 +367,157 @@ class MainForm:
         # Lock the display text box so that it can't be edited.
         self.display_box.config(state=DISABLED)
 
+    def open_reviews(self) -> None:
+        """Open the review log of the data directory, if it is enabled.
+
+        The open log is closed (writing its pending records) if the data
+        directory changed or the log was disabled.
+        """
+        path: Optional[str] = None
+        if Settings.review_log:
+            path = ReviewLog.log_path(Settings.directory_path)
+        if self.reviews is not None and self.reviews.path == path:
+            return
+        if self.reviews is not None:
+            self.reviews.close()
+        self.reviews = None if path is None else ReviewLog(path)
+
+    def show_status(self, msg: Optional[str] = None) -> None:
+        """Display a status message, with the loading progress below it.
+
+        Args:
+            msg (str): The new status message. The current message is shown
+                again with the new progress if this is not given, nothing is
+                shown if a question is being displayed instead.
+        """
+        if msg is not None:
+            self.status_message = msg
+        if self.status_message is None:  # A question is being displayed.
+            return
+        if self.files_loaded < self.files_to_load:
+            self.display("{}\n\nloading files {}/{} ({} questions)".format(
+                self.status_message, self.files_loaded, self.files_to_load,
+                self.grader.total_number_of_items))
+        else:
+            self.display(self.status_message)
+
+    def load_files(self, file_paths: List[str],
+                   announce: bool = False) -> None:
+        """Load the given data files in the background.
+
+        Files that are already loaded and haven't changed are kept, and
+        files that are no longer in `file_paths` are dropped right away.
+        Each file is given to the grader once it is read, through
+        `scheduled_actions`.
+
+        Args:
+            file_paths (List[str]): The data files to be loaded.
+            announce (bool): If the user should be told when the loaded
+                questions changed.
+        """
+        self.load_generation += 1
+        self.announce_load = announce
+        self.load_changed = self.grader.retain_files(file_paths)
+        to_load: List[str] = self.grader.stale_files(file_paths)
+        self.files_to_load = len(to_load)
+        self.files_loaded = 0
+        if len(to_load) == 0:
+            self.loading_finished(self.load_generation)
+            return
+        Thread(target=self.load_files_worker,
+               args=(self.load_generation, to_load), daemon=True).start()
+        self.show_status()
+
+    def load_files_worker(self, generation: int,
+                          file_names: List[str]) -> None:
+        """Read the given data files, this runs on a background thread.
+
+        The results are passed to the main thread through
+        `scheduled_actions`, since the form and the grader should only be
+        used by the main thread.
+
+        Args:
+            generation (int): The load this belongs to.
+            file_names (List[str]): The data files to be read.
+        """
+        # Get the signatures before reading, so changes made while the
+        # files are read are picked up next time.
+        signatures: List[Optional[FileSignature]] = [
+            DeckManager.signature(file_name) for file_name in file_names]
+        pools: Iterator[DeckPool] = \
+            FileReader.iter_decks(file_names, Settings.load_workers)
+        try:
+            for file_name, signature in zip(file_names, signatures):
+                pool: DeckPool = next(pools)
+                if generation != self.load_generation:
+                    return  # A newer load has started.
+                self.scheduled_actions.put(partial(
+                    self.file_loaded, generation, file_name, signature,
+                    pool))
+        except Exception as e:  # Report the error on the main thread.
+            msg: str = str(e) if isinstance(e, DataFileError) else \
+                "unable to load data files <{}>".format(e)
+            self.scheduled_actions.put(partial(
+                self.loading_failed, generation, msg))
+            return
+        finally:
+            pools.close()
+        self.scheduled_actions.put(partial(self.loading_finished, generation))
+
+    def file_loaded(self, generation: int, file_name: str,
+                    signature: Optional[FileSignature],
+                    pool: DeckPool) -> None:
+        """Give a file that was read in the background to the grader."""
+        if generation != self.load_generation:
+            return  # A newer load has started.
+        if self.grader.add_deck(file_name, signature, pool):
+            self.load_changed = True
+        self.files_loaded += 1
+        self.update_stats()
+        self.show_status()
+
+    def loading_finished(self, generation: int) -> None:
+        """Finish loading the files, once they have all been read."""
+        if generation != self.load_generation:
+            return  # A newer load has started.
+        self.finish_load(False)
+
+    def loading_failed(self, generation: int, msg: str) -> None:
+        """Report that a file failed to load, and finish loading.
+
+        The files read before the failing file are kept.
+
+        Args:
+            generation (int): The load that failed.
+            msg (str): The error to be reported.
+        """
+        if generation != self.load_generation:
+            return  # A newer load has started.
+        exception.error(msg)
+        self.finish_load(True)
+
+    def finish_load(self, failed: bool) -> None:
+        """Give the grader the end of the load, and show the result.
+
+        Args:
+            failed (bool): If a file failed to load, see
+                `Grader.finish_loading`.
+        """
+        if self.grader.finish_loading(failed):
+            self.load_changed = True
+        self.files_to_load = self.files_loaded
+        self.update_stats()
+        if self.announce_load and self.load_changed:
+            self.show_status("-- new questions loaded --")
+            # Set that the user is reviewing, so the next question is not
+            # automatically wrong when they hit the next button directly
+            # after changing the settings (updating the grader). This lets
+            # them view the next question as normal.
+            self.is_reviewing = True
+            self.submit_button.config(text="Next")
+        else:
+            self.show_status()
+
     def update_stats(self) -> None:
         """Update the stats label, to display the most recent statistics."""
         self.stats_label.config(
@@ -288,45 +526,71 @@ class MainForm:
                 self.grader.total_number_of_items,
                 self.grader.percent_correct))
 
-    def restart(self) -> None:
-        """Restart the form."""
-        self.form.destroy()
-        self.return_status = FormReturnStatus.RESTART
+    def restart(self, hard: bool = False) -> None:
+        """Restart the form.
 
-    def update(self) -> 'FormReturnStatus':
-        """Update the form screen.
+        By default the settings are read again and applied to the existing
+        form, and the quiz starts over with the files that are already
+        loaded (only new or modified files are read).
 
-        This is used to update the screen every 'tick' when this
-        function is called.
+        Args:
+            hard (bool): If the form should be destroyed and created again
+                instead (see FormReturnStatus.RESTART).
+        """
+        if hard:
+            self.form.destroy()
+            self.return_status = FormReturnStatus.RESTART
+            return
+
+        if self.settings_form is not None:
+            # Don't run settings_closed, the settings are read again and the
+            # files are loaded below.
+            self.settings_form.close(notify=False)
+            self.settings_form = None
+        FileReader.load_settings()
+        self.refresh_settings()
+        self.open_reviews()
+        # Keep the loaded files, the grader only gets them once loading has
+        # finished.
+        self.grader = Grader(None, self.grader.decks, self.reviews)
+        self.is_reviewing = True
+        self.progress_blocked = False
+        self.submit_button.config(text="Begin")
+        self.theme.set_theme_color()
+        self.update_stats()
+        self.show_status(INITAL_MESSAGE)
+        self.load_files(Settings.active_files)
+
+    def run_scheduled_actions(self) -> None:
+        """Execute the function calls scheduled by other threads.
+
+        This runs on the main thread every ACTION_POLL_INTERVAL ms, Tk is
+        idle in between. The errors reported by the actions are displayed
+        together once they have all run.
+
+        The next run is scheduled even if an action raises, so one failing
+        action doesn't stop the actions scheduled after it.
         """
         try:
-            if self.settings_form is not None:
-                self.settings_form = self.settings_form.update()
-                self.refresh_settings()
-                self.update_after_settings_finish = True
-            elif self.update_after_settings_finish:
-                # Only update the grader after the settings form has closed
-                # since it reads data files to get it's data, and we want to
-                # limit file reading as much as possible. That's why this isn't
-                # in refresh_settings.
-                self.grader = Grader(Settings.active_files)
-                self.display("-- new questions loaded --")
-                self.update_stats()
-                # Set that the user is reviewing, so the next question is
-                # not automatically wrong when they hit the next button
-                # directly after changing the settings (updating the grader).
-                # This lets them view the next question as normal.
-                self.is_reviewing = True
-                self.update_after_settings_finish = False
-
-            if not self.scheduled_actions.empty():
-                # Execute the scheduled function.
-                self.scheduled_actions.get()()
-            self.form.update_idletasks()
-            self.form.update()
-        except TclError:  # The form has been destroyed (i.e. on restart)
-            return self.return_status
-        return FormReturnStatus.RUNNING
+            with exception.collect_errors():
+                while not self.scheduled_actions.empty():
+                    # Execute the scheduled function.
+                    self.scheduled_actions.get()()
+        finally:
+            self.form.after(ACTION_POLL_INTERVAL, self.run_scheduled_actions)
+
+    def run(self) -> 'FormReturnStatus':
+        """Run the form until it is closed.
+
+        Returns:
+            FormReturnStatus: If the program should stop, or restart the
+                form.
+        """
+        self.form.mainloop()
+        if self.reviews is not None:
+            self.reviews.close()  # Write the pending reviews.
+            self.reviews = None
+        return self.return_status
 
 
 class FormReturnStatus(Enum):
@@ -0,0 +1,167 @@
+"""Answer normalization shared by the grader and the data file loaders.
+
+Every string the user is graded against, and every response the user
+enters, is passed through the same normalizer, so that formatting such as
+symbols, spacing and capitalization is ignored when grading.
+"""
+import string
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+
+# The ASCII symbols that are removed by default. This is every ASCII
+# punctuation character.
+DEFAULT_SYMBOLS: str = string.punctuation
+# The number of recently normalized strings to keep cached.
+CACHE_SIZE: int = 4096
+
+# Case handling options.
+CASE_LOWER: str = "lower"  # Use str.lower (the original behaviour).
+CASE_FOLD: str = "casefold"  # Use str.casefold (i.e. 'ß' matches 'ss').
+CASE_KEEP: str = "keep"  # Capitalization must match.
+CASE_OPTIONS = (CASE_LOWER, CASE_FOLD, CASE_KEEP)
+
+# Whitespace handling options.
+WHITESPACE_SPACES: str = "spaces"  # Remove spaces, strip the ends.
+WHITESPACE_ALL: str = "all"  # Remove every whitespace character.
+WHITESPACE_KEEP: str = "keep"  # Only strip the ends.
+WHITESPACE_OPTIONS = (WHITESPACE_SPACES, WHITESPACE_ALL, WHITESPACE_KEEP)
+
+
+class NormalizePolicy:
+    """Describes how strings are normalized before being compared.
+
+    Attributes:
+        symbols (str): Every character that is removed from the strings.
+        case (str): How capitalization is handled, one of CASE_OPTIONS.
+        whitespace (str): How whitespace is handled, one of
+            WHITESPACE_OPTIONS.
+    """
+
+    def __init__(self, symbols: str = DEFAULT_SYMBOLS,
+                 case: str = CASE_LOWER,
+                 whitespace: str = WHITESPACE_SPACES) -> None:
+        """Create a new policy, raise ValueError if an option is invalid."""
+        if not isinstance(symbols, str):
+            raise ValueError("symbols must be type 'str', got {}"
+                             .format(type(symbols)))
+        if case not in CASE_OPTIONS:
+            raise ValueError("case must be one of {}, got '{}'"
+                             .format(CASE_OPTIONS, case))
+        if whitespace not in WHITESPACE_OPTIONS:
+            raise ValueError("whitespace must be one of {}, got '{}'"
+                             .format(WHITESPACE_OPTIONS, whitespace))
+        self.symbols: str = symbols
+        self.case: str = case
+        self.whitespace: str = whitespace
+
+    @staticmethod
+    def from_dict(data: dict) -> 'NormalizePolicy':
+        """Create a policy from its settings representation.
+
+        Missing values use the defaults. Raise ValueError if the data is
+        not valid.
+
+        Args:
+            data (dict): The settings data for the policy.
+
+        Returns:
+            NormalizePolicy: The new policy.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("expected type 'dict', got {}"
+                             .format(type(data)))
+        return NormalizePolicy(
+            data.get("symbols", DEFAULT_SYMBOLS),
+            data.get("case", CASE_LOWER),
+            data.get("whitespace", WHITESPACE_SPACES))
+
+    def as_dict(self) -> dict:
+        """Return the settings representation of this policy."""
+        return {
+            "symbols": self.symbols,
+            "case": self.case,
+            "whitespace": self.whitespace
+        }
+
+    def __eq__(self, other: object) -> bool:
+        """Return if both policies normalize strings the same way."""
+        if not isinstance(other, NormalizePolicy):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self) -> int:
+        """Return the hash of the policy options."""
+        return hash((self.symbols, self.case, self.whitespace))
+
+
+class Normalizer:
+    """Normalizes strings according to a NormalizePolicy.
+
+    All of the removed characters are compiled into a single translation
+    table, so a string is cleaned in one pass instead of one pass for every
+    symbol. Results are cached since the same responses and answers are
+    normalized repeatedly.
+    """
+
+    def __init__(self, policy: Optional[NormalizePolicy] = None) -> None:
+        """Compile the translation table for the given policy."""
+        self.policy: NormalizePolicy = policy or NormalizePolicy()
+
+        removed: str = self.policy.symbols
+        if self.policy.whitespace == WHITESPACE_SPACES:
+            removed += " "
+        elif self.policy.whitespace == WHITESPACE_ALL:
+            removed += string.whitespace
+        self.__table: Dict[int, None] = str.maketrans("", "", removed)
+
+        self.__case: Optional[Callable[[str], str]] = None
+        if self.policy.case == CASE_LOWER:
+            self.__case = str.lower
+        elif self.policy.case == CASE_FOLD:
+            self.__case = str.casefold
+
+        self.normalize: Callable[[str], str] = \
+            lru_cache(maxsize=CACHE_SIZE)(self.__normalize)
+
+    def __normalize(self, line: str) -> str:
+        """Return the normalized version of the given string."""
+        line = line.translate(self.__table)
+        if self.__case is not None:
+            line = self.__case(line)
+        if self.policy.whitespace == WHITESPACE_ALL:
+            # Remove any non ASCII whitespace the table doesn't cover.
+            return "".join(line.split())
+        return line.strip()
+
+
+# The normalizer used for all grading.
+_current: Normalizer = Normalizer()
+
+
+def normalize(line: str) -> str:
+    """Normalize a string with the current policy.
+
+    Args:
+        line (str): The string to be normalized.
+
+    Returns:
+        str: The normalized string.
+    """
+    return _current.normalize(line)
+
+
+def get_policy() -> NormalizePolicy:
+    """Return the policy currently used for normalizing."""
+    return _current.policy
+
+
+def set_policy(policy: NormalizePolicy) -> None:
+    """Set the policy to be used for all following normalizing.
+
+    Args:
+        policy (NormalizePolicy): The new policy.
+    """
+    global _current
+    if policy != _current.policy:
+        _current = Normalizer(policy)
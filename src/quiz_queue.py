@@ -1,41 +1,104 @@
 """TODO: INSERT DOCSTRING."""
 from data_object import DataObject
-from queue import Queue
-from typing import List
-from random import randint
+from scheduler import Scheduler, RECYCLE_OFFSET
+from collections import deque
+from typing import Deque, Dict, Iterator, List, Optional
+from random import Random
 
 
-class QuizQueue:
+class QuizQueue(Scheduler):
     """Queue to store DataObjects used to quiz the user.
 
     The queue automatically randomizes and refills itself every time it is
     empty. This means that 'next()' can be called indefinitly. This allows for
     the user to be quized on items randomly.
+
+    The queue only stores the index of each element in the data, so moving
+    elements around in the queue is cheap. In lazy mode the random order of
+    a refill is generated one element at a time as the elements are given,
+    so the first element after a refill is available immediately even for
+    very large decks.
     """
 
-    def __init__(self, data: List[DataObject]):
-        """TODO: INSERT DOCSTRING."""
+    def __init__(self, data: List[DataObject],
+                 recycle_offset: int = RECYCLE_OFFSET, lazy: bool = False,
+                 rng: Optional[Random] = None):
+        """Create a queue of the given elements.
+
+        Args:
+            data (List[DataObject]): The elements to be quizzed on.
+            recycle_offset (int): The number of elements given before a
+                recycled element is given again.
+            lazy (bool): If the random order of each refill is generated
+                as the elements are given, instead of all at once.
+            rng (Random): The random number generator used to order the
+                elements, seed it to get the same order every time. A new
+                unseeded generator is used if this is not given.
+        """
         # A list of all the DataObjects. This is used to refill the queue.
-        self.__data: List[DataObject] = data
-        self.__queue: Queue = Queue()
-        # The most recent item to be dequeued.
-        self.__last_item: DataObject = data[0]
+        self.__data: List[DataObject] = list(data)
+        # The indices (into __data) of the elements in the queue.
+        self.__queue: Deque[int] = deque()
+        # The index of the most recent item to be dequeued, -1 if there is
+        # none.
+        self.__last_idx: int = -1
+        self.recycle_offset: int = recycle_offset
+        self.lazy: bool = lazy
+        self.__rng: Random = Random() if rng is None else rng
+        # The rest of the current refill in lazy mode, given after the
+        # elements in __queue.
+        self.__pending: Optional[Iterator[int]] = None
 
     def __fill_queue(self) -> None:
         """Refill the queue in a random order."""
-        # A list of the indicies of all the elements to be inserted.
+        if self.lazy:
+            self.__pending = self.__permutation(len(self.__data))
+            return
+        # A list of the indicies of all the elements to be inserted, in a
+        # random order.
         data_indicies: List[int] = list(range(len(self.__data)))
+        self.__rng.shuffle(data_indicies)
+        self.__queue.extend(data_indicies)
 
-        while len(data_indicies) != 0:
-            # Generate a random index from data_indicies to insert.
-            curr_idx: int = randint(0, len(data_indicies) - 1)
-            # Insert the DataObject from the given index, chosen by the random
-            # index.
-            curr_item: DataObject = self.__data[data_indicies[curr_idx]]
-            self.__queue.put(curr_item)
-            # Remove the index of object that was just inserted from the
-            # so it isn't added more than once.
-            del data_indicies[curr_idx]
+    def __permutation(self, length: int) -> Iterator[int]:
+        """Generate a random order of the indices up to `length`.
+
+        This is a Fisher-Yates shuffle of range(length) that only stores the
+        positions that have been swapped, so each index is generated in O(1)
+        without creating the whole list first.
+        """
+        # The index at each swapped position, every other position still
+        # holds its own index.
+        swapped: Dict[int, int] = {}
+        for pos in range(length):
+            # Pick a random position out of the ones not given yet, and move
+            # the index at the current position into it.
+            rand_pos: int = self.__rng.randrange(pos, length)
+            curr_idx: int = swapped.pop(pos, pos)
+            if rand_pos == pos:
+                yield curr_idx
+            else:
+                yield swapped.get(rand_pos, rand_pos)
+                swapped[rand_pos] = curr_idx
+
+    def __pull_pending(self, count: Optional[int] = None) -> None:
+        """Move elements of the lazy refill into the queue.
+
+        Args:
+            count (int): The number of elements the queue should have, every
+                pending element is moved if this is None.
+        """
+        if self.__pending is None:
+            return
+        if count is None:
+            self.__queue.extend(self.__pending)
+        else:
+            for idx in self.__pending:
+                self.__queue.append(idx)
+                if len(self.__queue) >= count:
+                    return
+        # Every element of the refill was moved.
+        self.__pending = None
 
     def recycle(self) -> None:
         """Re-insert the last dequeued item back toward the front of the queue.
@@ -43,19 +106,56 @@ class QuizQueue:
         This is used in the case the user got a question wrong, so the same
         question will reappear shortly after.
         """
-        new_queue: Queue = Queue()
-        idx: int = 0
-        # Add first 3 old items to the new queue.
-        while not self.__queue.empty() and idx < 3:
-            new_queue.put(self.__queue.get())
-            idx += 1
-        # Add the recycled element back into the new queue.
-        new_queue.put(self.__last_item)
-        # Finish copying the old queue items into the new queue.
-        while not self.__queue.empty():
-            new_queue.put(self.__queue.get())
-            idx += 1
-        self.__queue = new_queue
+        if self.__last_idx == -1:  # Nothing to recycle.
+            return
+        # The elements of a lazy refill must be in the queue to insert
+        # between them.
+        self.__pull_pending(self.recycle_offset)
+        # Insert the recycled element after the first `recycle_offset`
+        # elements, or at the end if the queue is shorter than that.
+        self.__queue.insert(min(self.recycle_offset, len(self.__queue)),
+                            self.__last_idx)
+
+    def add(self, d_objs: List[DataObject]) -> None:
+        """Add new elements to be quizzed on.
+
+        The new elements are added to the end of the queue in a random
+        order, so they are given before the queue is refilled.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be added.
+        """
+        new_indices: List[int] = list(range(
+            len(self.__data), len(self.__data) + len(d_objs)))
+        self.__data.extend(d_objs)
+        self.__rng.shuffle(new_indices)
+        self.__queue.extend(new_indices)
+
+    def remove(self, d_objs: List[DataObject]) -> None:
+        """Remove elements so they are no longer quizzed on.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be removed.
+        """
+        # The indices change, so the rest of a lazy refill can't be
+        # generated anymore.
+        self.__pull_pending()
+        removed = {id(d_obj) for d_obj in d_objs}
+        # Map the index of every element that is kept to its new index.
+        new_indices: Dict[int, int] = {}
+        new_data: List[DataObject] = []
+        for idx, d_obj in enumerate(self.__data):
+            if id(d_obj) not in removed:
+                new_indices[idx] = len(new_data)
+                new_data.append(d_obj)
+        self.__data = new_data
+        self.__queue = deque(new_indices[idx] for idx in self.__queue
+                             if idx in new_indices)
+        self.__last_idx = new_indices.get(self.__last_idx, -1)
+
+    def __len__(self) -> int:
+        """Return the number of elements to be quizzed on."""
+        return len(self.__data)
 
     def dequeue(self) -> DataObject:
         """Dequeue and return the next element in the queue.
@@ -65,10 +165,20 @@ class QuizQueue:
         Returns:
             DataObject: The object the user should be quized on.
         """
-        if self.__queue.empty():
+        if len(self.__queue) == 0:
+            self.__pull_pending(1)
+        if len(self.__queue) == 0:
             self.__fill_queue()
+            self.__pull_pending(1)
+
+        self.__last_idx = self.__queue.popleft()
+        return self.__data[self.__last_idx]
 
-        ret_val: DataObject = self.__queue.get()
-        self.__last_item = ret_val
+    def next(self) -> DataObject:
+        """Return the next element in the queue, see `dequeue`."""
+        return self.dequeue()
 
-        return ret_val
+    def record(self, is_correct: bool) -> None:
+        """Recycle the last dequeued element if it was answered wrong."""
+        if not is_correct:
+            self.recycle()
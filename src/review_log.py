@@ -0,0 +1,227 @@
+"""Persistent review state of every card, stored in an append-only log."""
+import hashlib
+import os
+import os.path
+import struct
+from queue import Queue
+from threading import Lock, Thread
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from data_object import DataObject
+from scheduler import SCHEDULER_FIELDS
+
+
+# The name of the log file, stored in the data directory.
+REVIEW_LOG_NAME: str = ".learner_reviews.log"
+# Changed whenever the format of the log changes.
+LOG_MAGIC: bytes = b"LRNREVS1"
+# card hash, last seen (unix time), attempts, correct answers, scheduler
+# (index in SCHEDULER_NAMES), (padding), scheduler values. The padding keeps
+# the records 64 bytes.
+RECORD_FORMAT: struct.Struct = struct.Struct(
+    '<QdIIB7x{}d'.format(SCHEDULER_FIELDS))
+# Only the card hash of a record, used to find the last record of each card
+# without unpacking every record.
+HASH_FORMAT: struct.Struct = struct.Struct(
+    '<Q{}x'.format(RECORD_FORMAT.size - 8))
+# The log is compacted once it has this many times more records than cards,
+# and at least COMPACT_MIN_RECORDS records.
+COMPACT_RATIO: int = 4
+COMPACT_MIN_RECORDS: int = 1 << 16
+# The number of records read at a time when the log is replayed.
+REPLAY_CHUNK_RECORDS: int = 1 << 20
+
+
+class ReviewState(NamedTuple):
+    """The review state of a card."""
+
+    attempts: int
+    correct: int
+    last_seen: float
+    scheduler: int
+    fields: Tuple[float, ...]
+
+
+class ReviewLog:
+    """Stores the review state of every card, keyed by the card's hash.
+
+    Every change is appended to the log file as a record of the card's new
+    state, so the state of a card is its last record. The log is read
+    (replayed) when it is opened, and is written by a background thread so
+    recording a review never waits for the disk. Records are written in
+    batches of everything recorded since the last write.
+
+    Once the log has many more records than cards, the background thread
+    compacts it by writing a new log with only the last record of each card.
+    """
+
+    def __init__(self, path: str):
+        """Open the log at the given path, reading the state of every card.
+
+        A log that can't be read is started over, it is not an error.
+
+        Args:
+            path (str): The path of the log file.
+        """
+        self.path: str = path
+        # The last record of every card by its hash. The records are kept
+        # packed in tuples, since the log can have a lot of cards.
+        self.__states: Dict[int, Tuple] = {}
+        # The number of records in the log file, and if new records can be
+        # appended to it. A missing or damaged log is written again from
+        # __states before anything is appended.
+        self.__records: int = 0
+        self.__is_valid: bool = self.__replay()
+        # Guards __states, which the writer thread reads when compacting.
+        self.__lock: Lock = Lock()
+        # The packed records waiting to be written, None stops the writer.
+        self.__pending: Queue = Queue()
+        self.__writer: Thread = Thread(target=self.__write_loop, daemon=True)
+        self.__writer.start()
+
+    @staticmethod
+    def log_path(directory_path: str) -> str:
+        """Return the path of the log for the given data directory."""
+        return os.path.join(directory_path, REVIEW_LOG_NAME)
+
+    @staticmethod
+    def card_hash(d_obj: DataObject) -> int:
+        """Return the hash of a card, which is the same every run.
+
+        The hash only depends on the content of the card, so a card keeps
+        its state if it is moved to another file.
+        """
+        content: str = "\x1e".join(
+            "\x1f".join(segment) for segment in d_obj.data)
+        return int.from_bytes(hashlib.blake2b(
+            content.encode('utf-8'), digest_size=8).digest(), 'little')
+
+    def __replay(self) -> bool:
+        """Read the last record of every card from the log.
+
+        Returns:
+            bool: If new records can be appended to the log.
+        """
+        chunk_size: int = RECORD_FORMAT.size * REPLAY_CHUNK_RECORDS
+        partial: int = 0
+        try:
+            with open(self.path, 'rb') as f:
+                if f.read(len(LOG_MAGIC)) != LOG_MAGIC:
+                    return False
+                for chunk in iter(lambda: f.read(chunk_size), b""):
+                    # Ignore a partly written record at the end (i.e. from
+                    # a crash), only the last chunk can be shorter.
+                    partial = len(chunk) % RECORD_FORMAT.size
+                    view: memoryview = \
+                        memoryview(chunk)[:len(chunk) - partial]
+                    # Find the last record of each card in the chunk (later
+                    # records replace earlier ones), then only unpack those.
+                    last_records: Dict[int, int] = {
+                        card_hash: idx for idx, (card_hash,)
+                        in enumerate(HASH_FORMAT.iter_unpack(view))}
+                    self.__states.update({
+                        card_hash: RECORD_FORMAT.unpack_from(
+                            view, idx * RECORD_FORMAT.size)
+                        for card_hash, idx in last_records.items()})
+                    self.__records += len(view) // RECORD_FORMAT.size
+        except OSError:
+            return False
+        # The records appended after a partial record would be misaligned.
+        return partial == 0
+
+    def __len__(self) -> int:
+        """Return the number of cards with a review state."""
+        return len(self.__states)
+
+    def get(self, card_hash: int) -> Optional[ReviewState]:
+        """Return the review state of a card, or None if it has none."""
+        record: Optional[Tuple] = self.__states.get(card_hash)
+        if record is None:
+            return None
+        return ReviewState(record[2], record[3], record[1], record[4],
+                           record[5:])
+
+    def record(self, card_hash: int, state: ReviewState) -> None:
+        """Set the review state of a card.
+
+        The state is written to the log in the background.
+        """
+        # Pad the scheduler values, the schedulers don't all store the same
+        # number of values.
+        fields: Tuple[float, ...] = tuple(state.fields[:SCHEDULER_FIELDS]) + \
+            (0.0,) * (SCHEDULER_FIELDS - len(state.fields))
+        record: Tuple = (card_hash, state.last_seen, state.attempts,
+                         state.correct, state.scheduler, *fields)
+        with self.__lock:
+            self.__states[card_hash] = record
+        self.__pending.put(RECORD_FORMAT.pack(*record))
+
+    def close(self) -> None:
+        """Write every pending record, and stop the writer thread."""
+        self.__pending.put(None)
+        self.__writer.join()
+
+    def __write_loop(self) -> None:
+        """Write the pending records, this runs on the writer thread."""
+        # Compact a long log right away, so it is quick to replay next time.
+        self.__compact_if_long()
+        running: bool = True
+        while running:
+            # Wait for a record, then take every other pending record to
+            # write them all at once.
+            batch: List[bytes] = [self.__pending.get()]
+            while not self.__pending.empty():
+                batch.append(self.__pending.get())
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            if len(batch) == 0:
+                continue
+
+            if not self.__is_valid:
+                # The states already contain the batch, it is appended
+                # again which doesn't change anything.
+                self.__compact()
+            if self.__is_valid:
+                self.__append(batch)
+            self.__compact_if_long()
+
+    def __compact_if_long(self) -> None:
+        """Compact the log if it has many more records than cards."""
+        if self.__is_valid and self.__records >= COMPACT_MIN_RECORDS and \
+           self.__records > COMPACT_RATIO * len(self.__states):
+            self.__compact()
+
+    def __append(self, batch: List[bytes]) -> None:
+        """Append the packed records to the log."""
+        try:
+            with open(self.path, 'ab') as f:
+                f.write(b"".join(batch))
+        except OSError:
+            return
+        self.__records += len(batch)
+
+    def __compact(self) -> None:
+        """Replace the log with one only containing the current states.
+
+        The records recorded after the states are copied are still pending,
+        so they are appended to the new log after it replaces the old one.
+        """
+        with self.__lock:
+            records: List[Tuple] = list(self.__states.values())
+        temp_path: str = "{}.{}.tmp".format(self.path, os.getpid())
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(LOG_MAGIC)
+                f.write(b"".join(
+                    RECORD_FORMAT.pack(*record) for record in records))
+            # Replace the old log all at once, so a partially written log is
+            # never read.
+            os.replace(temp_path, self.path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self.__records = len(records)
+        self.__is_valid = True
@@ -0,0 +1,417 @@
+"""Schedulers deciding the order the user is quizzed on the DataObjects."""
+import heapq
+from abc import ABC, abstractmethod
+from collections import deque
+from random import Random
+from typing import Deque, Dict, List, Optional, Tuple
+from data_object import DataObject
+
+
+# The names of the schedulers, used in the settings.
+SCHEDULER_QUEUE: str = "queue"
+SCHEDULER_LEITNER: str = "leitner"
+SCHEDULER_SM2: str = "sm2"
+SCHEDULER_WEIGHTED: str = "weighted"
+SCHEDULER_NAMES: Tuple[str, ...] = (
+    SCHEDULER_QUEUE, SCHEDULER_LEITNER, SCHEDULER_SM2, SCHEDULER_WEIGHTED)
+
+# The most values a scheduler stores for each element, see `export_state`.
+SCHEDULER_FIELDS: int = 4
+# The default number of elements given before an element answered wrong.
+RECYCLE_OFFSET: int = 3
+# The number of reviews until a card in each Leitner box is due again.
+LEITNER_INTERVALS: Tuple[int, ...] = (8, 32, 128, 512, 2048)
+# The number of reviews that make up one SM-2 interval step (a "day" in the
+# original algorithm).
+SM2_STEP: int = 8
+# The starting and minimum ease factor of an SM-2 card.
+SM2_EASE: float = 2.5
+SM2_MIN_EASE: float = 1.3
+# The change to the ease factor of an SM-2 card answered wrong.
+SM2_WRONG_EASE: float = -0.32
+
+
+class Scheduler(ABC):
+    """Decides the order the user is quizzed on the DataObjects.
+
+    `next` gives the element to quiz the user on, and `record` is called
+    with if the user answered it correctly. It can be called indefinitly,
+    the scheduler decides when each element is given again.
+    """
+
+    @abstractmethod
+    def next(self) -> DataObject:
+        """Return the next element the user should be quized on."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def record(self, is_correct: bool) -> None:
+        """Record if the user answered the last given element correctly.
+
+        Args:
+            is_correct (bool): If the answer was correct.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def add(self, d_objs: List[DataObject]) -> None:
+        """Add new elements to be quizzed on.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be added.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def remove(self, d_objs: List[DataObject]) -> None:
+        """Remove elements so they are no longer quizzed on.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be removed.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of elements to be quizzed on."""
+        raise NotImplementedError
+
+    def export_state(self, d_obj: DataObject) -> Tuple[float, ...]:
+        """Return the values the scheduler keeps for an element.
+
+        These are stored so the element can be given in the same way the
+        next time the program is run, see `import_state`.
+
+        Args:
+            d_obj (DataObject): The element.
+
+        Returns:
+            Tuple[float, ...]: Up to SCHEDULER_FIELDS values, the scheduler
+                keeps nothing by default.
+        """
+        del d_obj  # Nothing is kept by default.
+        return ()
+
+    def import_state(self, d_obj: DataObject,
+                     state: Tuple[float, ...]) -> None:
+        """Restore the values of an element, returned by `export_state`.
+
+        Args:
+            d_obj (DataObject): The element.
+            state (Tuple[float, ...]): The values of the element, which may
+                be padded with extra zeros.
+        """
+        del d_obj, state  # Nothing is kept by default.
+
+
+class DueScheduler(Scheduler):
+    """Scheduler giving each element again once it is due.
+
+    Time is counted in reviews (the number of elements given), so an element
+    due in 10 reviews is given again after 10 other elements. The elements
+    that have been given are kept in a heap ordered by when they are due, so
+    the next element is found in O(log n). Elements that have never been
+    given are given in a random order whenever no element is due.
+
+    Subclasses decide how long until an element is due again with `_review`.
+    """
+
+    def __init__(self, data: List[DataObject],
+                 recycle_offset: int = RECYCLE_OFFSET,
+                 rng: Optional[Random] = None):
+        """Create a scheduler of the given elements.
+
+        Args:
+            data (List[DataObject]): The elements to be quizzed on.
+            recycle_offset (int): The number of elements given before an
+                element answered wrong is given again.
+            rng (Random): The random number generator used to order the new
+                elements. A new unseeded generator is used if this is not
+                given.
+        """
+        self.recycle_offset: int = recycle_offset
+        self.__rng: Random = Random() if rng is None else rng
+        # The elements by their card id, and the card id of each element by
+        # its id().
+        self.__cards: Dict[int, DataObject] = {}
+        self.__card_ids: Dict[int, int] = {}
+        self.__next_card_id: int = 0
+        # The card ids of the elements that have never been given.
+        self.__new: Deque[int] = deque()
+        # (due, sequence number, card id) of the elements that have been
+        # given. Removed and rescheduled elements are left in the heap, an
+        # entry is only valid if it is in __entries.
+        self.__heap: List[Tuple[int, int, int]] = []
+        self.__entries: Dict[int, Tuple[int, int]] = {}
+        self.__sequence: int = 0
+        # The number of elements given so far.
+        self.__clock: int = 0
+        # The card id of the last given element, if it hasn't been
+        # recorded yet, and when it was due.
+        self.__current: Optional[int] = None
+        self.__current_due: Optional[int] = None
+        self.add(data)
+
+    @property
+    def clock(self) -> int:
+        """Get the number of elements given so far."""
+        return self.__clock
+
+    def _new_card(self, card_id: int) -> None:
+        """Start tracking the state of a new element."""
+
+    def _drop_card(self, card_id: int) -> None:
+        """Stop tracking the state of a removed element."""
+
+    def _export_card(self, card_id: int) -> Tuple[float, ...]:
+        """Return the state of an element, see `export_state`."""
+        return ()
+
+    def _import_card(self, card_id: int, state: Tuple[float, ...]) -> None:
+        """Restore the state of an element, see `import_state`."""
+
+    @abstractmethod
+    def _review(self, card_id: int, is_correct: bool) -> int:
+        """Update the state of a reviewed element.
+
+        Args:
+            card_id (int): The card id of the element.
+            is_correct (bool): If the answer was correct.
+
+        Returns:
+            int: The number of reviews until the element is due again.
+        """
+        raise NotImplementedError
+
+    def __push(self, card_id: int, due: int) -> None:
+        """Schedule an element, replacing its old entry in the heap."""
+        self.__sequence += 1
+        self.__entries[card_id] = (due, self.__sequence)
+        heapq.heappush(self.__heap, (due, self.__sequence, card_id))
+
+    def __peek(self) -> Optional[Tuple[int, int, int]]:
+        """Return the valid heap entry due first, dropping invalid ones."""
+        while len(self.__heap) != 0:
+            due, sequence, card_id = self.__heap[0]
+            if self.__entries.get(card_id) == (due, sequence):
+                return self.__heap[0]
+            heapq.heappop(self.__heap)
+        return None
+
+    def __put_back(self) -> None:
+        """Put back the last given element if it wasn't recorded."""
+        if self.__current is None:
+            return
+        if self.__current_due is None:  # It was never given before.
+            self.__new.append(self.__current)
+        else:
+            # The element keeps its due time, but is given after the other
+            # elements due at the same time.
+            self.__push(self.__current, self.__current_due)
+        self.__current = None
+
+    def next(self) -> DataObject:
+        """Return the next element the user should be quized on.
+
+        This is the element due first if it is due, otherwise a new element,
+        or the element due first if there are no new elements.
+        """
+        self.__put_back()
+        self.__clock += 1
+        entry: Optional[Tuple[int, int, int]] = self.__peek()
+        # Skip the new elements that have been removed, or that were
+        # scheduled by `import_state`.
+        while len(self.__new) != 0 and (self.__new[0] not in self.__cards or
+                                        self.__new[0] in self.__entries):
+            self.__new.popleft()
+
+        if entry is None or (entry[0] > self.__clock and
+                             len(self.__new) != 0):
+            self.__current = self.__new.popleft()
+            self.__current_due = None
+        else:
+            heapq.heappop(self.__heap)
+            self.__current = entry[2]
+            self.__current_due = entry[0]
+            del self.__entries[self.__current]
+        return self.__cards[self.__current]
+
+    def record(self, is_correct: bool) -> None:
+        """Record if the user answered the last given element correctly.
+
+        The element is scheduled again depending on the answer.
+
+        Args:
+            is_correct (bool): If the answer was correct.
+        """
+        if self.__current is None:
+            return
+        self.__push(self.__current, self.__clock +
+                    self._review(self.__current, is_correct))
+        self.__current = None
+
+    def add(self, d_objs: List[DataObject]) -> None:
+        """Add new elements to be quizzed on.
+
+        The new elements are given in a random order, after the elements
+        that are due.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be added.
+        """
+        new_ids: List[int] = []
+        for d_obj in d_objs:
+            card_id: int = self.__next_card_id
+            self.__next_card_id += 1
+            self.__cards[card_id] = d_obj
+            self.__card_ids[id(d_obj)] = card_id
+            self._new_card(card_id)
+            new_ids.append(card_id)
+        self.__rng.shuffle(new_ids)
+        self.__new.extend(new_ids)
+
+    def remove(self, d_objs: List[DataObject]) -> None:
+        """Remove elements so they are no longer quizzed on.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be removed.
+        """
+        for d_obj in d_objs:
+            card_id: Optional[int] = self.__card_ids.pop(id(d_obj), None)
+            if card_id is None:
+                continue
+            # Entries left in the heap and new elements are skipped once
+            # they are no longer in __cards.
+            del self.__cards[card_id]
+            self.__entries.pop(card_id, None)
+            self._drop_card(card_id)
+            if card_id == self.__current:
+                self.__current = None
+
+    def __len__(self) -> int:
+        """Return the number of elements to be quizzed on."""
+        return len(self.__cards)
+
+    def export_state(self, d_obj: DataObject) -> Tuple[float, ...]:
+        """Return the values the scheduler keeps for an element.
+
+        The first value is the number of reviews until the element is due,
+        or -1 if it isn't scheduled. The rest are from the subclass.
+        """
+        card_id: Optional[int] = self.__card_ids.get(id(d_obj))
+        if card_id is None:
+            return ()
+        entry: Optional[Tuple[int, int]] = self.__entries.get(card_id)
+        remaining: float = -1.0 if entry is None else entry[0] - self.__clock
+        return (remaining,) + self._export_card(card_id)
+
+    def import_state(self, d_obj: DataObject,
+                     state: Tuple[float, ...]) -> None:
+        """Restore the values of an element, returned by `export_state`.
+
+        An element that was scheduled is no longer new, and is due after
+        the same number of reviews as when it was exported.
+        """
+        card_id: Optional[int] = self.__card_ids.get(id(d_obj))
+        if card_id is None or len(state) == 0 or card_id == self.__current:
+            return
+        self._import_card(card_id, state[1:])
+        if state[0] >= 0:
+            self.__push(card_id, self.__clock + int(state[0]))
+
+
+class LeitnerScheduler(DueScheduler):
+    """Scheduler using Leitner boxes.
+
+    Every element starts in the first box. An element answered correctly
+    moves up a box, and one answered wrong moves back to the first box. The
+    higher the box, the longer until the element is given again (see
+    LEITNER_INTERVALS).
+    """
+
+    def __init__(self, data: List[DataObject],
+                 recycle_offset: int = RECYCLE_OFFSET,
+                 rng: Optional[Random] = None):
+        """Create a scheduler of the given elements, see `DueScheduler`."""
+        # The box of each element by its card id.
+        self.__boxes: Dict[int, int] = {}
+        super().__init__(data, recycle_offset, rng)
+
+    def _new_card(self, card_id: int) -> None:
+        """Put a new element in the first box."""
+        self.__boxes[card_id] = 0
+
+    def _drop_card(self, card_id: int) -> None:
+        """Forget the box of a removed element."""
+        del self.__boxes[card_id]
+
+    def _export_card(self, card_id: int) -> Tuple[float, ...]:
+        """Return the box of the element."""
+        return (self.__boxes[card_id],)
+
+    def _import_card(self, card_id: int, state: Tuple[float, ...]) -> None:
+        """Restore the box of the element."""
+        self.__boxes[card_id] = max(0, min(
+            int(state[0]), len(LEITNER_INTERVALS) - 1))
+
+    def _review(self, card_id: int, is_correct: bool) -> int:
+        """Move the element between boxes, see `DueScheduler._review`."""
+        if not is_correct:
+            self.__boxes[card_id] = 0
+            return self.recycle_offset + 1
+        box: int = self.__boxes[card_id]
+        self.__boxes[card_id] = min(box + 1, len(LEITNER_INTERVALS) - 1)
+        return LEITNER_INTERVALS[box]
+
+
+class SM2Scheduler(DueScheduler):
+    """Scheduler using the SM-2 spaced repetition algorithm.
+
+    Each element has an ease factor, and the interval until it is given
+    again is multiplied by it every time it is answered correctly. An
+    element answered wrong starts over with a smaller ease factor. Intervals
+    are counted in steps of SM2_STEP reviews.
+    """
+
+    def __init__(self, data: List[DataObject],
+                 recycle_offset: int = RECYCLE_OFFSET,
+                 rng: Optional[Random] = None):
+        """Create a scheduler of the given elements, see `DueScheduler`."""
+        # [ease factor, correct answers in a row, interval (in steps)] of
+        # each element by its card id.
+        self.__states: Dict[int, List[float]] = {}
+        super().__init__(data, recycle_offset, rng)
+
+    def _new_card(self, card_id: int) -> None:
+        """Start a new element with the starting ease factor."""
+        self.__states[card_id] = [SM2_EASE, 0, 0]
+
+    def _drop_card(self, card_id: int) -> None:
+        """Forget the state of a removed element."""
+        del self.__states[card_id]
+
+    def _export_card(self, card_id: int) -> Tuple[float, ...]:
+        """Return the ease, correct answers in a row and interval."""
+        return tuple(self.__states[card_id])
+
+    def _import_card(self, card_id: int, state: Tuple[float, ...]) -> None:
+        """Restore the ease, correct answers in a row and interval."""
+        self.__states[card_id] = [
+            max(SM2_MIN_EASE, state[0]), int(state[1]), int(state[2])]
+
+    def _review(self, card_id: int, is_correct: bool) -> int:
+        """Update the ease and interval, see `DueScheduler._review`."""
+        state: List[float] = self.__states[card_id]
+        if not is_correct:
+            state[0] = max(SM2_MIN_EASE, state[0] + SM2_WRONG_EASE)
+            state[1] = 0
+            state[2] = 0
+            return self.recycle_offset + 1
+        state[1] += 1
+        if state[1] == 1:
+            state[2] = 1
+        elif state[1] == 2:
+            state[2] = 6
+        else:
+            state[2] = round(state[2] * state[0])
+        return int(state[2]) * SM2_STEP
@@ -0,0 +1,489 @@
+"""Serve the quiz to many users at once, over HTTP and WebSockets.
+
+Run from the src directory with:
+    python3 server.py [--host HOST] [--port PORT] [--directory DIR] [FILE ...]
+
+The files are relative to the data directory, the active files from the
+settings are used if none are given. The files are loaded once and shared
+by every session, each session has its own scheduler and statistics. The
+sessions always use `lazy_shuffle`, so starting a session doesn't shuffle
+the whole deck.
+
+Opening the server in a browser gives a quiz page, which uses the
+WebSocket at /ws (one session per connection). The HTTP API is:
+    POST   /sessions              Start a session.
+    GET    /sessions/<id>         The current question.
+    POST   /sessions/<id>/answer  Check {"answer": "..."}.
+    POST   /sessions/<id>/next    Move on to the next question.
+    GET    /sessions/<id>/stats   The statistics.
+    DELETE /sessions/<id>         End a session.
+Every reply is a json object, including the statistics of the session.
+WebSocket messages are json objects like {"action": "answer", "answer":
+"..."}, the actions are "question", "answer", "next" and "stats".
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import secrets
+import struct
+import sys
+import time
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from deck_manager import DeckManager
+from exception import error
+from file_reader import FileReader
+from grader import Grader
+from settings import Settings
+
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8080
+# The number of connections waiting to be accepted, enough for a classroom
+# connecting at once.
+LISTEN_BACKLOG: int = 1024
+# The largest request head, and the largest request body or WebSocket
+# message.
+MAX_HEADER_BYTES: int = 1 << 14
+MAX_BODY_BYTES: int = 1 << 16
+# The most sessions at once, and the time in seconds a session is kept
+# without being used. Idle sessions are dropped every SWEEP_INTERVAL
+# seconds.
+MAX_SESSIONS: int = 10000
+SESSION_TIMEOUT: float = 3600.0
+SWEEP_INTERVAL: float = 60.0
+# Added to the client's key to accept a WebSocket connection (RFC 6455).
+WEBSOCKET_GUID: bytes = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# WebSocket frame opcodes, and close codes.
+WS_TEXT: int = 0x1
+WS_CLOSE: int = 0x8
+WS_PING: int = 0x9
+WS_PONG: int = 0xA
+WS_UNSUPPORTED: int = 1003
+WS_TOO_BIG: int = 1009
+# The page served at /, a quiz using the WebSocket.
+INDEX_PAGE: str = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Learner</title></head>
+<body style="font-family: sans-serif; text-align: center">
+<pre id="display" style="font-size: 2em; white-space: pre-wrap"></pre>
+<form id="form"><input id="guess" autocomplete="off" autofocus>
+<button>Submit</button></form>
+<p id="stats"></p>
+<script>
+const socket = new WebSocket("ws://" + location.host + "/ws");
+const display = document.getElementById("display");
+const guess = document.getElementById("guess");
+let isReviewing = false;
+socket.onopen = () => socket.send(JSON.stringify({action: "question"}));
+socket.onclose = () => { display.textContent = "disconnected"; };
+socket.onmessage = (event) => {
+  const reply = JSON.parse(event.data);
+  if ("error" in reply) {
+    display.textContent = reply.error;
+    return;
+  }
+  if ("question" in reply) display.textContent = reply.question;
+  if ("correct" in reply) display.textContent =
+    (reply.correct ? "correct" : "wrong") + "\\n\\n" + reply.answer;
+  document.getElementById("stats").textContent = reply.stats.correct +
+    "/" + reply.stats.total + "     " + reply.stats.percent + "%";
+};
+document.getElementById("form").onsubmit = (event) => {
+  event.preventDefault();
+  socket.send(JSON.stringify(isReviewing ? {action: "next"} :
+                             {action: "answer", answer: guess.value}));
+  isReviewing = !isReviewing;
+  guess.value = "";
+};
+</script></body></html>
+"""
+
+
+class RequestError(Exception):
+    """Raised when a request can't be handled, with the HTTP status."""
+
+    def __init__(self, status: HTTPStatus, msg: str) -> None:
+        """Create the error for the given status."""
+        super().__init__(status, msg)
+        self.status: HTTPStatus = status
+        self.msg: str = msg
+
+
+class Session:
+    """The quiz of a single user, over the shared loaded files."""
+
+    def __init__(self, decks: DeckManager):
+        """Start a quiz on the files loaded by `decks`."""
+        self.grader: Grader = Grader(None, decks)
+        # If the current question was answered, it can only be answered
+        # once.
+        self.is_answered: bool = False
+        self.last_used: float = time.monotonic()
+
+    def run(self, action: str, request: dict) -> dict:
+        """Run an action of the session, and return the reply.
+
+        Args:
+            action (str): One of "question", "answer", "next" and "stats".
+            request (dict): The request, the answer is in "answer".
+
+        Raises:
+            RequestError: If the action or request is not valid.
+        """
+        self.last_used = time.monotonic()
+        reply: dict = {}
+        if action == "answer":
+            answer = request.get("answer")
+            if not isinstance(answer, str):
+                raise RequestError(HTTPStatus.BAD_REQUEST,
+                                   "expected a string 'answer'")
+            if self.is_answered:
+                raise RequestError(HTTPStatus.CONFLICT,
+                                   "the question was already answered")
+            self.is_answered = True
+            reply["correct"] = self.grader.check(answer)
+            reply["answer"] = self.grader.get_display_answer()
+        elif action == "next":
+            self.grader.next()
+            self.is_answered = False
+            reply["question"] = self.question
+        elif action == "question":
+            reply["question"] = self.question
+        elif action != "stats":
+            raise RequestError(HTTPStatus.NOT_FOUND,
+                               "unknown action '{}'".format(action))
+        reply["stats"] = {
+            "correct": self.grader.number_of_correct_items,
+            "total": self.grader.total_number_of_items,
+            "percent": self.grader.percent_correct}
+        return reply
+
+    @property
+    def question(self) -> str:
+        """Get the current question."""
+        return self.grader.get_display_question(Settings.display_item)
+
+
+class QuizServer:
+    """Serves a session to each user over the same loaded files.
+
+    Everything runs on one asyncio event loop, so the sessions and the
+    loaded files are never used by two requests at once. Each connection
+    is kept open for the following requests (HTTP keep-alive).
+    """
+
+    def __init__(self, decks: DeckManager):
+        """Create a server for the files loaded by `decks`.
+
+        The files should not be changed while the server is running.
+        """
+        self.decks: DeckManager = decks
+        self.sessions: Dict[str, Session] = {}
+
+    def new_session(self) -> Tuple[str, Session]:
+        """Start a session, and return its id and the session."""
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise RequestError(HTTPStatus.SERVICE_UNAVAILABLE,
+                               "too many sessions")
+        session_id: str = secrets.token_urlsafe(16)
+        session: Session = Session(self.decks)
+        self.sessions[session_id] = session
+        return session_id, session
+
+    async def serve_forever(self, host: str, port: int) -> None:
+        """Serve until cancelled, printing the address once listening."""
+        server: asyncio.AbstractServer = await asyncio.start_server(
+            self.__handle_connection, host, port, limit=MAX_HEADER_BYTES,
+            backlog=LISTEN_BACKLOG)
+        address: Tuple = server.sockets[0].getsockname()
+        print("serving {} questions on http://{}:{}".format(
+            len(self.decks.data), address[0], address[1]), flush=True)
+        sweeper: asyncio.Task = asyncio.ensure_future(self.__sweep())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+    async def __sweep(self) -> None:
+        """Drop the sessions that haven't been used for SESSION_TIMEOUT."""
+        while True:
+            await asyncio.sleep(SWEEP_INTERVAL)
+            oldest: float = time.monotonic() - SESSION_TIMEOUT
+            for session_id, session in list(self.sessions.items()):
+                if session.last_used < oldest:
+                    del self.sessions[session_id]
+
+    async def __handle_connection(self, reader: asyncio.StreamReader,
+                                  writer: asyncio.StreamWriter) -> None:
+        """Handle the requests of a connection until it is closed."""
+        try:
+            while True:
+                try:
+                    head: bytes = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    return  # The client closed the connection.
+                except asyncio.LimitOverrunError:
+                    writer.write(self.__response(
+                        HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+                        {"error": "request head too large"}, False))
+                    return
+
+                try:
+                    method, path, version, headers = self.__parse_head(head)
+                    length: int = int(headers.get("content-length", "0"))
+                    if not 0 <= length <= MAX_BODY_BYTES:
+                        raise RequestError(
+                            HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            "request body too large")
+                except (RequestError, ValueError) as e:
+                    status: HTTPStatus = e.status if \
+                        isinstance(e, RequestError) else HTTPStatus.BAD_REQUEST
+                    writer.write(self.__response(
+                        status, {"error": str(e)}, False))
+                    return
+                body: bytes = await reader.readexactly(length)
+
+                if path == "/ws" and \
+                   headers.get("upgrade", "").lower() == "websocket":
+                    await self.__handle_websocket(reader, writer, headers)
+                    return
+
+                keep_alive: bool = version == "HTTP/1.1" and \
+                    headers.get("connection", "").lower() != "close"
+                if method == "GET" and path == "/":
+                    writer.write(self.__response(
+                        HTTPStatus.OK, INDEX_PAGE, keep_alive))
+                else:
+                    try:
+                        status, reply = self.__route(method, path, body)
+                    except RequestError as e:
+                        status, reply = e.status, {"error": e.msg}
+                    writer.write(self.__response(status, reply, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client went away.
+        finally:
+            writer.close()
+
+    @staticmethod
+    def __parse_head(head: bytes) -> Tuple[str, str, str, Dict[str, str]]:
+        """Return the method, path, version and headers of a request.
+
+        The header names are in lower case.
+        """
+        lines: List[str] = head.decode('latin-1').split("\r\n")
+        parts: List[str] = lines[0].split(" ")
+        if len(parts) != 3:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "invalid request line")
+        headers: Dict[str, str] = {}
+        for line in lines[1:]:
+            if line == "":
+                continue
+            name, sep, value = line.partition(":")
+            if sep == "":
+                raise RequestError(HTTPStatus.BAD_REQUEST, "invalid header")
+            headers[name.strip().lower()] = value.strip()
+        # The query string isn't used.
+        return parts[0], parts[1].split("?", 1)[0], parts[2], headers
+
+    def __route(self, method: str, path: str,
+                body: bytes) -> Tuple[HTTPStatus, dict]:
+        """Handle an API request, and return the status and reply."""
+        parts: List[str] = path.strip("/").split("/")
+        if parts[0] != "sessions" or len(parts) > 3:
+            raise RequestError(HTTPStatus.NOT_FOUND, "unknown path")
+        if len(parts) == 1:
+            if method != "POST":
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED,
+                                   "expected POST")
+            session_id, session = self.new_session()
+            reply: dict = session.run("question", {})
+            reply["session"] = session_id
+            return HTTPStatus.CREATED, reply
+
+        session: Optional[Session] = self.sessions.get(parts[1])
+        if session is None:
+            raise RequestError(HTTPStatus.NOT_FOUND, "unknown session")
+        if len(parts) == 2:
+            if method == "DELETE":
+                del self.sessions[parts[1]]
+                return HTTPStatus.OK, {}
+            if method != "GET":
+                raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED,
+                                   "expected GET or DELETE")
+            return HTTPStatus.OK, session.run("question", {})
+
+        action: str = parts[2]
+        expected: str = "GET" if action == "stats" else "POST"
+        if method != expected:
+            raise RequestError(HTTPStatus.METHOD_NOT_ALLOWED,
+                               "expected {}".format(expected))
+        request: dict = {}
+        if len(body) > 0:
+            try:
+                request = json.loads(body)
+            except ValueError:
+                raise RequestError(HTTPStatus.BAD_REQUEST, "invalid json")
+            if not isinstance(request, dict):
+                raise RequestError(HTTPStatus.BAD_REQUEST,
+                                   "expected a json object")
+        return HTTPStatus.OK, session.run(action, request)
+
+    @staticmethod
+    def __response(status: HTTPStatus, reply, keep_alive: bool) -> bytes:
+        """Return an HTTP response with the reply (a dict as json, or html).
+        """
+        content_type: str = "text/html; charset=utf-8"
+        if isinstance(reply, dict):
+            reply = json.dumps(reply)
+            content_type = "application/json"
+        body: bytes = reply.encode('utf-8')
+        return ("HTTP/1.1 {} {}\r\nContent-Type: {}\r\nContent-Length: {}"
+                "\r\nConnection: {}\r\n\r\n").format(
+                    status.value, status.phrase, content_type, len(body),
+                    "keep-alive" if keep_alive else "close"
+                    ).encode('latin-1') + body
+
+    async def __handle_websocket(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter,
+                                 headers: Dict[str, str]) -> None:
+        """Run a session over a WebSocket, until it is closed."""
+        key: str = headers.get("sec-websocket-key", "")
+        accept: str = base64.b64encode(hashlib.sha1(
+            key.encode('latin-1') + WEBSOCKET_GUID).digest()).decode()
+        writer.write((
+            "HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n"
+            "Connection: Upgrade\r\nSec-WebSocket-Accept: {}\r\n\r\n"
+        ).format(accept).encode('latin-1'))
+
+        session_id: Optional[str] = None
+        try:
+            session_id, session = self.new_session()
+            while True:
+                opcode, payload = await self.__read_frame(reader)
+                if opcode == WS_CLOSE:
+                    writer.write(self.__frame(WS_CLOSE, payload[:2]))
+                    return
+                if opcode == WS_PING:
+                    writer.write(self.__frame(WS_PONG, payload))
+                    continue
+                if opcode != WS_TEXT:
+                    writer.write(self.__frame(
+                        WS_CLOSE, struct.pack('!H', WS_UNSUPPORTED)))
+                    return
+                try:
+                    request = json.loads(payload)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                    reply: dict = session.run(
+                        str(request.get("action")), request)
+                except ValueError:
+                    reply = {"error": "expected a json object"}
+                except RequestError as e:
+                    reply = {"error": e.msg}
+                writer.write(self.__frame(
+                    WS_TEXT, json.dumps(reply).encode('utf-8')))
+                await writer.drain()
+        except RequestError as e:  # The session couldn't be started.
+            writer.write(self.__frame(WS_TEXT, json.dumps(
+                {"error": e.msg}).encode('utf-8')))
+        except ValueError:  # The message was too large.
+            writer.write(self.__frame(
+                WS_CLOSE, struct.pack('!H', WS_TOO_BIG)))
+        finally:
+            if session_id is not None:
+                self.sessions.pop(session_id, None)
+
+    @staticmethod
+    async def __read_frame(reader: asyncio.StreamReader) -> Tuple[int, bytes]:
+        """Read a WebSocket frame, and return its opcode and payload.
+
+        Fragmented messages are not supported, the fragments are returned
+        as frames with no opcode (0).
+
+        Raises:
+            ValueError: If the payload is larger than MAX_BODY_BYTES.
+        """
+        head: bytes = await reader.readexactly(2)
+        opcode: int = head[0] & 0x0F
+        length: int = head[1] & 0x7F
+        if length == 126:
+            length, = struct.unpack('!H', await reader.readexactly(2))
+        elif length == 127:
+            length, = struct.unpack('!Q', await reader.readexactly(8))
+        if length > MAX_BODY_BYTES:
+            raise ValueError("frame too large")
+        mask: bytes = await reader.readexactly(4) if head[1] & 0x80 else b""
+        payload: bytes = await reader.readexactly(length)
+        if not head[0] & 0x80:
+            opcode = 0  # Part of a fragmented message.
+        if mask and length > 0:
+            # Unmask all of the payload at once as one big integer.
+            key: bytes = (mask * (length // 4 + 1))[:length]
+            payload = (int.from_bytes(payload, 'big') ^
+                       int.from_bytes(key, 'big')).to_bytes(length, 'big')
+        return opcode, payload
+
+    @staticmethod
+    def __frame(opcode: int, payload: bytes) -> bytes:
+        """Return a WebSocket frame from the server (unmasked)."""
+        if len(payload) < 126:
+            head: bytes = struct.pack('!BB', 0x80 | opcode, len(payload))
+        elif len(payload) < 1 << 16:
+            head = struct.pack('!BBH', 0x80 | opcode, 126, len(payload))
+        else:
+            head = struct.pack('!BBQ', 0x80 | opcode, 127, len(payload))
+        return head + payload
+
+
+def main() -> int:
+    """Load the files given on the command line, and serve them.
+
+    Returns:
+        int: The exit status, 1 if no questions could be loaded.
+    """
+    parser = argparse.ArgumentParser(
+        description="Serve the quiz over HTTP and WebSockets.")
+    parser.add_argument(
+        'files', nargs='*', metavar='FILE',
+        help="a data file, relative to the data directory (default: the "
+        "active files from the settings)")
+    parser.add_argument(
+        '--host', default=DEFAULT_HOST,
+        help="the address to listen on (default: {}, use 0.0.0.0 to serve "
+        "other computers)".format(DEFAULT_HOST))
+    parser.add_argument(
+        '--port', type=int, default=DEFAULT_PORT,
+        help="the port to listen on (default: {})".format(DEFAULT_PORT))
+    parser.add_argument(
+        '--directory', help="the data directory (default: the one from the "
+        "settings)")
+    args = parser.parse_args()
+
+    FileReader.load_settings()
+    if args.directory is not None:
+        Settings.directory_path = args.directory
+    # Shuffle the questions of each session as they are given, so starting
+    # a session doesn't shuffle the whole deck first.
+    Settings.lazy_shuffle = True
+    decks: DeckManager = DeckManager()
+    if decks.sync(args.files or Settings.active_files) is None:
+        return 1  # The error was already printed.
+    if len(decks.data) == 0:
+        error("no elements were able to be found from any of the given "
+              "files")
+        return 1
+    try:
+        asyncio.run(QuizServer(decks).serve_forever(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,8 @@
 """TODO: INSERT DOCSTRING."""
 from exception import error
-from typing import List
+from normalizer import NormalizePolicy, set_policy
+from scheduler import SCHEDULER_NAMES, SCHEDULER_QUEUE
+from typing import Dict, List
 import os.path
 import json
 
@@ -31,6 +33,27 @@ class Settings:
     # The current theme colors.
     theme_colors: List[str] = ['#F0F0F0', '#D0D0D0', '#FFFFFF', '#000000',
                                '#008000', '#B22222']
+    # How answers and responses are normalized before being compared.
+    answer_policy: dict = NormalizePolicy().as_dict()
+    # Number of processes used to load data files, 0 loads them one after
+    # another.
+    load_workers: int = 0
+    # If compiled caches of the data files are written and used.
+    deck_cache: bool = True
+    # Number of questions given before a question answered wrong is given
+    # again.
+    recycle_offset: int = 3
+    # If the random order of the questions is generated as they are given,
+    # instead of all at once when the quiz queue is refilled.
+    lazy_shuffle: bool = False
+    # The name of the scheduler deciding the order of the questions.
+    scheduler: str = SCHEDULER_QUEUE
+    # If the review state of every question is saved between runs.
+    review_log: bool = True
+    # If the questions of each active file take turns, and the number of
+    # turns of each file (1 if it isn't in deck_ratios).
+    interleave_decks: bool = False
+    deck_ratios: Dict[str, int] = {}
 
     @staticmethod
     def load_from(data: dict) -> None:
@@ -116,6 +139,105 @@ class Settings:
             error(("settings unable to load typeface, expected type 'str', "
                    "got {}").format(type(new_typeface)))
 
+        # Verify and set the new answer policy. The policy verifies its own
+        # values. This setting is optional, so older settings files without
+        # it keep using the default policy.
+        new_answer_policy: dict = data.get("answer_policy", None)
+        if new_answer_policy is not None:
+            try:
+                policy: NormalizePolicy = \
+                    NormalizePolicy.from_dict(new_answer_policy)
+                set_policy(policy)
+                Settings.answer_policy = policy.as_dict()
+            except ValueError as e:
+                error("settings unable to load answer policy <{}>".format(e))
+
+        # Verify and set the number of load workers. Ensure it is a non
+        # negative integer. This setting is optional.
+        new_load_workers: int = data.get("load_workers", None)
+        if new_load_workers is not None:
+            if isinstance(new_load_workers, int) and new_load_workers >= 0:
+                Settings.load_workers = new_load_workers
+            else:
+                error(("settings unable to load load workers, expected a non "
+                       "negative 'int', got {}").format(new_load_workers))
+
+        # Verify and set if the deck cache is used. Ensure it is a bool. This
+        # setting is optional.
+        new_deck_cache: bool = data.get("deck_cache", None)
+        if new_deck_cache is not None:
+            if isinstance(new_deck_cache, bool):
+                Settings.deck_cache = new_deck_cache
+            else:
+                error(("settings unable to load deck cache, expected type "
+                       "'bool', got {}").format(type(new_deck_cache)))
+
+        # Verify and set the recycle offset. Ensure it is a non negative
+        # integer. This setting is optional.
+        new_recycle_offset: int = data.get("recycle_offset", None)
+        if new_recycle_offset is not None:
+            if isinstance(new_recycle_offset, int) and \
+               new_recycle_offset >= 0:
+                Settings.recycle_offset = new_recycle_offset
+            else:
+                error(("settings unable to load recycle offset, expected a "
+                       "non negative 'int', got {}").format(
+                           new_recycle_offset))
+
+        # Verify and set if the quiz queue is shuffled lazily. Ensure it is a
+        # bool. This setting is optional.
+        new_lazy_shuffle: bool = data.get("lazy_shuffle", None)
+        if new_lazy_shuffle is not None:
+            if isinstance(new_lazy_shuffle, bool):
+                Settings.lazy_shuffle = new_lazy_shuffle
+            else:
+                error(("settings unable to load lazy shuffle, expected type "
+                       "'bool', got {}").format(type(new_lazy_shuffle)))
+
+        # Verify and set the scheduler. Ensure it is the name of one of the
+        # schedulers. This setting is optional.
+        new_scheduler: str = data.get("scheduler", None)
+        if new_scheduler is not None:
+            if new_scheduler in SCHEDULER_NAMES:
+                Settings.scheduler = new_scheduler
+            else:
+                error(("settings unable to load scheduler, expected one of "
+                       "{}, got {}").format(SCHEDULER_NAMES, new_scheduler))
+
+        # Verify and set if the review log is used. Ensure it is a bool.
+        # This setting is optional.
+        new_review_log: bool = data.get("review_log", None)
+        if new_review_log is not None:
+            if isinstance(new_review_log, bool):
+                Settings.review_log = new_review_log
+            else:
+                error(("settings unable to load review log, expected type "
+                       "'bool', got {}").format(type(new_review_log)))
+
+        # Verify and set if the files are interleaved. Ensure it is a bool.
+        # This setting is optional.
+        new_interleave_decks: bool = data.get("interleave_decks", None)
+        if new_interleave_decks is not None:
+            if isinstance(new_interleave_decks, bool):
+                Settings.interleave_decks = new_interleave_decks
+            else:
+                error(("settings unable to load interleave decks, expected "
+                       "type 'bool', got {}").format(
+                           type(new_interleave_decks)))
+
+        # Verify and set the deck ratios. Ensure it is a dict of file names
+        # to positive integers. This setting is optional.
+        new_deck_ratios: Dict[str, int] = data.get("deck_ratios", None)
+        if new_deck_ratios is not None:
+            if isinstance(new_deck_ratios, dict) and all(
+                    isinstance(ratio, int) and ratio > 0
+                    for ratio in new_deck_ratios.values()):
+                Settings.deck_ratios = new_deck_ratios
+            else:
+                error(("settings unable to load deck ratios, expected a "
+                       "'dict' of file names to positive 'int', got {}")
+                      .format(new_deck_ratios))
+
         # Retrieve the key for the current theme to be loaded.
         theme_colors_key: str = data.get("current_theme", "")
         Settings.current_theme = theme_colors_key
@@ -205,4 +327,13 @@ class Settings:
         ret_data["font_size"] = Settings.font_size
         ret_data["typeface"] = Settings.typeface
         ret_data["current_theme"] = Settings.current_theme
+        ret_data["answer_policy"] = Settings.answer_policy
+        ret_data["load_workers"] = Settings.load_workers
+        ret_data["deck_cache"] = Settings.deck_cache
+        ret_data["recycle_offset"] = Settings.recycle_offset
+        ret_data["lazy_shuffle"] = Settings.lazy_shuffle
+        ret_data["scheduler"] = Settings.scheduler
+        ret_data["review_log"] = Settings.review_log
+        ret_data["interleave_decks"] = Settings.interleave_decks
+        ret_data["deck_ratios"] = Settings.deck_ratios
         return json.dumps(ret_data, indent=4)
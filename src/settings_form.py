@@ -2,12 +2,12 @@
 import tkinter as tk
 from tkinter import Frame, Listbox, Button, Label, Entry, Spinbox, BOTH, \
                     LEFT, RIGHT, FLAT, TOP, X, Y, SW, HORIZONTAL, END, Scale, \
-                    BOTTOM, ACTIVE, TclError
+                    BOTTOM, ACTIVE
 from settings import Settings
 from file_reader import FileReader
 import os
 import os.path
-from typing import List, Dict, Tuple
+from typing import Callable, Dict, Set, Tuple
 
 INIT_SCREEN_SIZE: str = '500x500'  # Starting screen size.
 MIN_SCREEN_SIZE: Tuple[int, int] = (500, 500)  # Minimum screen size.
@@ -26,16 +26,26 @@ CURRENT_THEME_STR: str = 'current: {}'
 class SettingsForm:
     """TODO: INSERT DOCSTRING."""
 
-    def __init__(self):
-        """TODO: INSERT DOCSTRING."""
-        self.form = tk.Tk()
+    def __init__(self, master: tk.Misc,
+                 on_change: Callable[[Set[str]], None],
+                 on_close: Callable[[], None]):
+        """Open the settings form as a window of the given form.
+
+        Args:
+            master (tk.Misc): The form this form belongs to.
+            on_change (Callable[[Set[str]], None]): Called with the keys of
+                the settings that changed whenever a form value changes a
+                setting, so the changes can be shown live.
+            on_close (Callable[[], None]): Called once the form has closed.
+        """
+        self.on_change: Callable[[Set[str]], None] = on_change
+        self.on_close: Callable[[], None] = on_close
+        self.form = tk.Toplevel(master)
         self.form.geometry(INIT_SCREEN_SIZE)
         self.form.minsize(MIN_SCREEN_SIZE[0], MIN_SCREEN_SIZE[1])
         self.form.title(SCREEN_TITLE)
-
-        # Store the last status of the directory path to determine if the
-        # directory changed in order to update the file display boxes.
-        self.last_dir_path: str = Settings.directory_path
+        # Closing the window keeps the current (unsaved) settings.
+        self.form.protocol("WM_DELETE_WINDOW", self.close)
 
         # Each file in the current directory is stored as the key of a
         # dictionary, with each key mapping to a bool of if that file
@@ -53,6 +63,8 @@ class SettingsForm:
         self.sel_item_in_active_files: int = 0
         self.sel_item_in_disabled_files: int = 0
 
+        # Tracks if the form is open, so on_close is only called once.
+        self.is_open: bool = True
         self.create_widgets()
 
     def create_widgets(self):
@@ -137,12 +149,15 @@ class SettingsForm:
             background=LIGHT_GRAY, foreground=BLACK)
         self.directory_label.pack(side=LEFT)
 
+        self.directory_value = tk.StringVar(
+            self.form, value=Settings.directory_path)
         self.directory_input = Entry(
-            self.directory_frame, text='null', font=DEFAULT_FONT,
-            background=WHITE, relief=FLAT, width=DEFAULT_WIDTH,
-            foreground=BLACK, highlightthickness=0)
+            self.directory_frame, textvariable=self.directory_value,
+            font=DEFAULT_FONT, background=WHITE, relief=FLAT,
+            width=DEFAULT_WIDTH, foreground=BLACK, highlightthickness=0)
         self.directory_input.pack(side=LEFT)
-        self.directory_input.insert(0, Settings.directory_path)
+        self.directory_value.trace_add(
+            'write', lambda *args: self.directory_changed())
         # ------------------------------
 
         # ----- FONT SIZE SETTING -----
@@ -160,6 +175,11 @@ class SettingsForm:
             resolution=4, length=175, foreground=BLACK, highlightthickness=0)
         self.font_size_input.pack(side=LEFT)
         self.font_size_input.set(Settings.font_size)
+        # Set after the initial value, so only changes by the user are
+        # applied.
+        self.font_size_input.config(
+            command=lambda value: self.apply({
+                "font_size": self.font_size_input.get()}))
         # ------------------------------
 
         # ----- TYPEFACE SETTING -----
@@ -171,12 +191,15 @@ class SettingsForm:
             background=LIGHT_GRAY, foreground=BLACK)
         self.typeface_label.pack(side=LEFT)
 
+        self.typeface_value = tk.StringVar(self.form, value=Settings.typeface)
         self.typeface_input = Entry(
-            self.typeface_frame, text='Verdana', font=DEFAULT_FONT,
-            width=DEFAULT_WIDTH, background=WHITE, relief=FLAT,
-            foreground=BLACK, highlightthickness=0)
+            self.typeface_frame, textvariable=self.typeface_value,
+            font=DEFAULT_FONT, width=DEFAULT_WIDTH, background=WHITE,
+            relief=FLAT, foreground=BLACK, highlightthickness=0)
         self.typeface_input.pack(side=LEFT)
-        self.typeface_input.insert(0, Settings.typeface)
+        self.typeface_value.trace_add(
+            'write', lambda *args: self.apply({
+                "typeface": self.typeface_value.get()}))
         # ------------------------------
 
         # ----- THEME SETTING -----
@@ -199,6 +222,8 @@ class SettingsForm:
         for theme_name in Settings.theme_names:
             self.theme_input.insert(END, theme_name)
         self.theme_input.select_set(0)
+        self.theme_input.bind(
+            '<<ListboxSelect>>', lambda event: self.theme_changed())
         # ------------------------------
 
         # ----- ITEM RANGE -----
@@ -212,13 +237,19 @@ class SettingsForm:
             background=LIGHT_GRAY, foreground=BLACK)
         self.display_item_label.pack(side=LEFT)
 
+        self.display_item_value = tk.StringVar(
+            self.form, value=str(Settings.display_item))
         self.display_item_input = Spinbox(
             self.display_item_frame, from_=-1, to=100, font=DEFAULT_FONT,
             width=DEFAULT_WIDTH-4, background=WHITE, relief=FLAT,
-            foreground=BLACK, highlightthickness=0)
+            foreground=BLACK, highlightthickness=0,
+            textvariable=self.display_item_value)
         self.display_item_input.pack(side=LEFT)
-        self.display_item_input.delete(0, END)
-        self.display_item_input.insert(0, Settings.display_item)
+        # The Spinbox resets its value to `from_` when it is created, so
+        # set it again.
+        self.display_item_value.set(str(Settings.display_item))
+        self.display_item_value.trace_add(
+            'write', lambda *args: self.display_item_changed())
         # ------------------------------
 
         # ----- SAVE AND CANCEL BUTTONS -----
@@ -241,12 +272,92 @@ class SettingsForm:
     def cancel_callback(self) -> None:
         """Restore the previous saved settings and close the form."""
         FileReader.load_settings()
-        self.form.destroy()
+        self.close()
 
     def save_callback(self) -> None:
         """Save the newly updated settings and close the form."""
         FileReader.save_settings()
+        self.close()
+
+    def close(self, notify: bool = True) -> None:
+        """Close the form, and tell the main form.
+
+        Args:
+            notify (bool): If `on_close` should be called, the main form
+                doesn't need to be told when it closes the form itself.
+        """
+        if not self.is_open:
+            return
+        self.is_open = False
         self.form.destroy()
+        if notify:
+            self.on_close()
+
+    def apply(self, values: dict) -> None:
+        """Set the values that changed to the settings.
+
+        The main form is told which settings changed, nothing is done if no
+        value changed.
+
+        Args:
+            values (dict): The new values by their settings key.
+        """
+        changed: Dict[str, object] = {
+            key: value for key, value in values.items()
+            if getattr(Settings, key) != value}
+        if len(changed) == 0:
+            return
+        Settings.set_value(changed)
+        self.on_change(set(changed))
+
+    def files_changed(self) -> None:
+        """Set the active files to the settings."""
+        self.apply({"active_files": [
+            f for f in self.all_files if self.all_files[f]]})
+
+    def directory_changed(self) -> None:
+        """Set the directory to the settings, and show its files."""
+        new_dir_path: str = self.directory_value.get()
+        if new_dir_path == Settings.directory_path:
+            return
+        self.apply({"directory_path": new_dir_path})
+        # Update the current working files and file display boxes. This is
+        # done to always display the files that are in the current
+        # directory.
+        self.load_all_files()
+        self.refresh_active_files()
+        self.refresh_disabled_files()
+        self.files_changed()
+
+    def display_item_changed(self) -> None:
+        """Set the display item to the settings, 0 if it isn't valid."""
+        display_item: int = 0
+        try:
+            display_item = int(self.display_item_value.get())
+        except ValueError:
+            pass
+        self.apply({"display_item": display_item})
+
+    def theme_changed(self) -> None:
+        """Set the selected theme to the settings.
+
+        The selection is ignored if it isn't a theme (i.e. the title
+        portion).
+        """
+        selection: tuple = self.theme_input.curselection()
+        if len(selection) == 0:
+            return
+        theme_name: str = str(self.theme_input.get(selection[0]))
+        if theme_name not in Settings.theme_names or \
+           theme_name == Settings.current_theme:
+            return
+        self.apply({"current_theme": theme_name})
+        # Reset the first element of the Listbox which displays the current
+        # theme, this shows the user the name of the theme that is
+        # currently enabled.
+        self.theme_input.delete(0)
+        self.theme_input.insert(
+            0, CURRENT_THEME_STR.format(Settings.current_theme))
 
     def activate_callback(self) -> None:
         """Take currently selected 'disabled' file and sets it to 'enabled'."""
@@ -265,6 +376,7 @@ class SettingsForm:
         self.refresh_active_files()
         self.refresh_disabled_files()
         self.disabled_files.activate(self.sel_item_in_disabled_files)
+        self.files_changed()
 
     def disable_callback(self) -> None:
         """Take currently selected 'enabled' file and sets it to 'disabled'."""
@@ -283,6 +395,7 @@ class SettingsForm:
         self.refresh_active_files()
         self.refresh_disabled_files()
         self.active_files.activate(self.sel_item_in_active_files)
+        self.files_changed()
 
     def refresh_active_files(self) -> None:
         """Clear and fill active files text box with current active files.
@@ -326,97 +439,3 @@ class SettingsForm:
                 # dict.
                 all_files[file] = is_active
         self.all_files = all_files
-
-    def update_directory_path(self) -> str:
-        """Return the current directory in the directory input box.
-
-        Update the current working files and file display boxes if
-        a new directory was set.
-
-        Returns:
-            str: The directory path to be saved to the settings.
-        """
-        new_dir_path: str = self.directory_input.get()
-        # Update the current working files and file display boxes if the
-        # directory changed. This is done to always display the files that
-        # are in the current directory.
-        if self.last_dir_path != Settings.directory_path:
-            self.load_all_files()
-            self.refresh_active_files()
-            self.refresh_disabled_files()
-            self.last_dir_path = Settings.directory_path
-        # Set the last directory, then return the new directory to be
-        # set the the settings. This makes it so that the elements update
-        # from the conditional above. This is because the Settings will be
-        # updated after this function returns.
-        elif new_dir_path != Settings.directory_path:
-            self.last_dir_path = Settings.directory_path
-            return new_dir_path
-        return Settings.directory_path
-
-    def update_theme(self) -> str:
-        """Return the current theme in the theme input box.
-
-        Use current theme if new theme isn't valid (i.e. title portion), and
-        update the currenly selected theme in the input box.
-
-        Returns:
-            str: The name of the new theme to be saved to the settings.
-        """
-        # Get the current selected theme from the Listbox. If the theme
-        # is not valid, set it to the current theme so that a valid theme
-        # is always used.
-        theme_name: str = str(self.theme_input.get(ACTIVE))
-        if theme_name not in Settings.theme_names:
-            theme_name = Settings.current_theme
-        # Reset the first element of the Listbox which displays the current
-        # theme, this shows the user the name of the theme that is currently
-        # enabled. This also has the side effect of that element not being
-        # able to be selected (which doesn't change anything).
-        self.theme_input.delete(0)
-        self.theme_input.insert(
-            0, CURRENT_THEME_STR.format(Settings.current_theme))
-
-        return theme_name
-
-    def update_settings(self) -> None:
-        """Set all of the current form values to the settings."""
-        # Get the current directory path.
-        dir_path: str = self.update_directory_path()
-        # Get the current theme name.
-        theme_name: str = self.update_theme()
-        # Get all active files.
-        active_files: List[str] = [f for f in self.all_files
-                                   if self.all_files[f]]
-        # Get the current display item, or 0 if invalid value.
-        display_item: int = 0
-        try:
-            display_item = int(self.display_item_input.get())
-        except ValueError:
-            pass
-
-        # Update the setings to the new values.
-        Settings.set_value({
-            "directory_path": dir_path,
-            "active_files": active_files,
-            "display_item": display_item,
-            "font_size": self.font_size_input.get(),
-            "typeface": self.typeface_input.get(),
-            "current_theme": theme_name,
-            })
-
-    def update(self):
-        """Update the form screen.
-
-        This is used to update the screen and settings every 'tick' when this
-        function is called.
-        """
-        try:
-            self.update_settings()
-            self.form.update_idletasks()
-            self.form.update()
-        except TclError:  # The form has been destroyed (i.e. on exit)
-            # Return None so the main form knows this form is no longer active.
-            return None
-        # Return itself so the main form knows this form is still active.
-        return self
@@ -5,21 +5,36 @@ from settings import Settings
 
 
 class Theme:
-    """TODO: INSERT DOCSTRING."""
+    """Colors the grouped tkinter elements of a form.
+
+    The options of each group in each state (see ThemeState) are worked
+    out once when the colors are loaded, so coloring the form is one
+    `config` call per element. Elements that already have the options of a
+    state are skipped, so flashing the grading colors stays cheap with many
+    elements.
+    """
 
     def __init__(self):
-        """TODO: INSERT DOCSTRING."""
+        """Create a theme with no elements, using the settings' colors."""
         self.__colors: dict = None  # Store each color for the theme.
+        # The options given to each group in each state. Only the options
+        # that change in a state are given, a group missing from a state
+        # keeps its colors.
+        self.__styles: Dict[ThemeState, Dict[ThemeGroup, dict]] = {}
         self.update_colors()  # Set the colors upon loading.
 
         # Stores tkinter form items to their respective color grouping
         # so that they are colored properly.
-        self.__item_groups: Dict(str, list) = {
+        self.__item_groups: Dict[ThemeGroup, list] = {
             ThemeGroup.MAIN_GROUP: [],
             ThemeGroup.BUTTON_GROUP: [],
             ThemeGroup.LABEL_GROUP: [],
             ThemeGroup.TEXT_BOX_GROUP: []
         }
+        # The options last given to each item by its id(). The option dicts
+        # are only created in update_colors, so they are compared by
+        # identity.
+        self.__applied: Dict[int, dict] = {}
 
     def update_colors(self) -> None:
         """Set current theme colors from the colors saved in the settings."""
@@ -32,6 +47,30 @@ class Theme:
             ThemeColor.CORRECT_COLOR: theme_colors[4],
             ThemeColor.INCORRECT_COLOR: theme_colors[5]
         }
+        text_color: str = self.__colors[ThemeColor.TEXT_COLOR]
+        self.__styles = {
+            ThemeState.NORMAL: {
+                ThemeGroup.MAIN_GROUP: {
+                    "background": self.__colors[ThemeColor.MAIN_COLOR]},
+                ThemeGroup.BUTTON_GROUP: {
+                    "background": self.__colors[ThemeColor.SECONDARY_COLOR],
+                    "foreground": text_color},
+                ThemeGroup.LABEL_GROUP: {
+                    "background": self.__colors[ThemeColor.MAIN_COLOR],
+                    "foreground": text_color},
+                ThemeGroup.TEXT_BOX_GROUP: {
+                    "background": self.__colors[ThemeColor.BACK_COLOR],
+                    "foreground": text_color}
+            }
+        }
+        # Only the main elements and labels display the grading colors.
+        for state, color in ((ThemeState.CORRECT, ThemeColor.CORRECT_COLOR),
+                             (ThemeState.INCORRECT,
+                              ThemeColor.INCORRECT_COLOR)):
+            self.__styles[state] = {
+                ThemeGroup.MAIN_GROUP: {"background": self.__colors[color]},
+                ThemeGroup.LABEL_GROUP: {"background": self.__colors[color]}
+            }
 
     def add_to_group(self, item, group: 'ThemeGroup') -> None:
         """Add tkinter form element to a color grouping.
@@ -42,6 +81,20 @@ class Theme:
         """
         self.__item_groups[group].append(item)
 
+    def set_state(self, state: 'ThemeState') -> None:
+        """Color every grouped element for the given state.
+
+        Args:
+            state (ThemeState): The state to be displayed.
+        """
+        styles: Dict[ThemeGroup, dict] = self.__styles[state]
+        for group, options in styles.items():
+            for elem in self.__item_groups[group]:
+                # Skip the elements that already have these options.
+                if self.__applied.get(id(elem)) is not options:
+                    elem.config(**options)
+                    self.__applied[id(elem)] = options
+
     def set_theme_color(self) -> None:
         """Set normal theme coloring to all grouped elements.
 
@@ -49,54 +102,15 @@ class Theme:
         to reset the color after the color has been changed to a grading
         color.
         """
-        # Iterate through all the grouped elements, applying the specific
-        # coloring required for each individual group.
-        for key in self.__item_groups:
-            for elem in self.__item_groups[key]:
-                if key is ThemeGroup.MAIN_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.MAIN_COLOR])
-                elif key is ThemeGroup.BUTTON_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.SECONDARY_COLOR])
-                    elem.config(
-                        foreground=self.__colors[ThemeColor.TEXT_COLOR])
-                elif key is ThemeGroup.LABEL_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.MAIN_COLOR])
-                    elem.config(
-                        foreground=self.__colors[ThemeColor.TEXT_COLOR])
-                elif key is ThemeGroup.TEXT_BOX_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.BACK_COLOR])
-                    elem.config(
-                        foreground=self.__colors[ThemeColor.TEXT_COLOR])
+        self.set_state(ThemeState.NORMAL)
 
     def set_correct_color(self) -> None:
         """Set 'correct' grading color to the elements that display it."""
-        # Iterate through all the grouped elements, applying the specific
-        # coloring required for each individual group.
-        for key in self.__item_groups:
-            for elem in self.__item_groups[key]:
-                if key is ThemeGroup.MAIN_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.CORRECT_COLOR])
-                elif key is ThemeGroup.LABEL_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.CORRECT_COLOR])
+        self.set_state(ThemeState.CORRECT)
 
     def set_incorrect_color(self) -> None:
         """Set 'incorrect' grading color to the elements that display it."""
-        # Iterate through all the grouped elements, applying the specific
-        # coloring required for each individual group.
-        for key in self.__item_groups:
-            for elem in self.__item_groups[key]:
-                if key is ThemeGroup.MAIN_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.INCORRECT_COLOR])
-                elif key is ThemeGroup.LABEL_GROUP:
-                    elem.config(
-                        background=self.__colors[ThemeColor.INCORRECT_COLOR])
+        self.set_state(ThemeState.INCORRECT)
 
 
 class ThemeGroup(Enum):
@@ -121,3 +135,11 @@ class ThemeColor(Enum):
     TEXT_COLOR: str = "text_color"
     CORRECT_COLOR: str = "correct_color"
     INCORRECT_COLOR: str = "incorrect_color"
+
+
+class ThemeState(Enum):
+    """Enum for the states the elements can be colored for."""
+
+    NORMAL: str = "normal"
+    CORRECT: str = "correct"
+    INCORRECT: str = "incorrect"
@@ -0,0 +1,248 @@
+"""Scheduler giving the elements answered wrong recently more often."""
+from array import array
+from random import Random
+from typing import Dict, List, Optional, Tuple
+from data_object import DataObject
+from scheduler import Scheduler
+
+
+# How much the latest answer changes the error rate of an element, the error
+# rate is a moving average of the last ~1/ERROR_DECAY answers.
+ERROR_DECAY: float = 0.3
+# The error rate of an element that has never been answered.
+INITIAL_ERROR: float = 0.5
+# Added to the error rate of every element, so elements that are always
+# answered correctly are still given sometimes.
+MIN_WEIGHT: float = 0.02
+
+
+class FenwickTree:
+    """Fenwick (binary indexed) tree of non negative float weights.
+
+    Changing a weight and finding the element at a point of the cumulative
+    weight are both O(log n), so elements can be sampled by weight without
+    a pass over all of them.
+    """
+
+    def __init__(self, weights: List[float] = ()):
+        """Create a tree of the given weights in O(n)."""
+        self.__weights: array = array('d', weights)
+        # The tree is 1 indexed, __tree[i] is the sum of the weights of the
+        # (i & -i) elements ending at element i - 1.
+        self.__tree: array = array('d', [0.0])
+        self.__tree.extend(self.__weights)
+        for idx in range(1, len(self.__tree)):
+            parent: int = idx + (idx & -idx)
+            if parent < len(self.__tree):
+                self.__tree[parent] += self.__tree[idx]
+
+    def __len__(self) -> int:
+        """Return the number of weights."""
+        return len(self.__weights)
+
+    def __getitem__(self, idx: int) -> float:
+        """Return the weight of an element."""
+        return self.__weights[idx]
+
+    def __setitem__(self, idx: int, weight: float) -> None:
+        """Change the weight of an element in O(log n)."""
+        delta: float = weight - self.__weights[idx]
+        self.__weights[idx] = weight
+        idx += 1
+        while idx < len(self.__tree):
+            self.__tree[idx] += delta
+            idx += idx & -idx
+
+    def append(self, weight: float) -> None:
+        """Add an element to the end in O(log n)."""
+        self.__weights.append(weight)
+        idx: int = len(self.__tree)
+        # The new node covers the new element, and the (idx & -idx) - 1
+        # elements before it.
+        self.__tree.append(weight + self.prefix_sum(idx - 1) -
+                           self.prefix_sum(idx - (idx & -idx)))
+
+    def prefix_sum(self, count: int) -> float:
+        """Return the sum of the first `count` weights in O(log n)."""
+        total: float = 0.0
+        while count > 0:
+            total += self.__tree[count]
+            count -= count & -count
+        return total
+
+    @property
+    def total(self) -> float:
+        """Get the sum of all the weights in O(log n)."""
+        return self.prefix_sum(len(self.__weights))
+
+    @property
+    def weights(self) -> List[float]:
+        """Get a copy of all the weights."""
+        return self.__weights.tolist()
+
+    def find(self, value: float) -> int:
+        """Return the element at a point of the cumulative weight in O(log n).
+
+        Args:
+            value (float): The point, from 0 up to (not including) `total`.
+
+        Returns:
+            int: The index of the element whose weight covers the point,
+                elements with no weight are never returned unless the point
+                is not below `total`.
+        """
+        pos: int = 0
+        # The highest power of 2 not above the number of elements.
+        step: int = 1 << (len(self.__tree).bit_length() - 1)
+        while step > 0:
+            next_pos: int = pos + step
+            if next_pos < len(self.__tree) and \
+               self.__tree[next_pos] <= value:
+                pos = next_pos
+                value -= self.__tree[next_pos]
+            step >>= 1
+        return pos
+
+
+class WeightedSampler(Scheduler):
+    """Scheduler giving each element with a chance based on its error rate.
+
+    The chance of each element being given is proportional to a moving
+    average of how often it was answered wrong (plus MIN_WEIGHT). The
+    weights are kept in a FenwickTree, so giving an element and updating its
+    weight are both O(log n). The last given element is never given twice
+    in a row (unless it is the only element).
+    """
+
+    def __init__(self, data: List[DataObject], rng: Optional[Random] = None):
+        """Create a sampler of the given elements.
+
+        Args:
+            data (List[DataObject]): The elements to be quizzed on.
+            rng (Random): The random number generator used to pick the
+                elements, seed it to get the same order every time. A new
+                unseeded generator is used if this is not given.
+        """
+        self.__rng: Random = Random() if rng is None else rng
+        # The element in each slot of the tree, None if it was removed.
+        self.__slots: List[Optional[DataObject]] = []
+        # The slot of each element by its id().
+        self.__slot_ids: Dict[int, int] = {}
+        self.__error_rates: array = array('d')
+        self.__tree: FenwickTree = FenwickTree()
+        # The slot of the last given element, its weight is 0 until the
+        # next element is given.
+        self.__last_slot: Optional[int] = None
+        self.add(data)
+
+    def __weight(self, slot: int) -> float:
+        """Return the weight of the element in the slot from its error."""
+        return MIN_WEIGHT + self.__error_rates[slot]
+
+    def __rebuild(self) -> None:
+        """Drop the removed slots, and rebuild the tree in O(n).
+
+        This also clears the rounding errors built up in the tree.
+        """
+        slots: List[Optional[DataObject]] = []
+        error_rates: array = array('d')
+        last_slot: Optional[int] = None
+        for slot, d_obj in enumerate(self.__slots):
+            if d_obj is None:
+                continue
+            if slot == self.__last_slot:
+                last_slot = len(slots)
+            slots.append(d_obj)
+            error_rates.append(self.__error_rates[slot])
+        self.__slots = slots
+        self.__error_rates = error_rates
+        self.__last_slot = last_slot
+        self.__slot_ids = {
+            id(d_obj): slot for slot, d_obj in enumerate(slots)}
+        self.__tree = FenwickTree([
+            0.0 if slot == last_slot else self.__weight(slot)
+            for slot in range(len(slots))])
+
+    def next(self) -> DataObject:
+        """Return an element picked by weight."""
+        slot: Optional[int] = self.__last_slot
+        total: float = self.__tree.total
+        if total > 0:
+            slot = self.__tree.find(self.__rng.random() * total)
+            if slot >= len(self.__tree) or self.__tree[slot] <= 0:
+                # Rounding errors in the tree, rebuild it and pick again.
+                self.__rebuild()
+                slot = self.__tree.find(
+                    self.__rng.random() * self.__tree.total)
+        # Give the last element its weight back, and take the weight of the
+        # new one so it isn't given twice in a row.
+        if self.__last_slot is not None and self.__last_slot != slot:
+            self.__tree[self.__last_slot] = self.__weight(self.__last_slot)
+        self.__tree[slot] = 0.0
+        self.__last_slot = slot
+        return self.__slots[slot]
+
+    def record(self, is_correct: bool) -> None:
+        """Update the error rate of the last given element.
+
+        Args:
+            is_correct (bool): If the answer was correct.
+        """
+        if self.__last_slot is None:
+            return
+        self.__error_rates[self.__last_slot] += ERROR_DECAY * (
+            (0.0 if is_correct else 1.0) -
+            self.__error_rates[self.__last_slot])
+
+    def add(self, d_objs: List[DataObject]) -> None:
+        """Add new elements to be quizzed on, with the initial error rate.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be added.
+        """
+        for d_obj in d_objs:
+            self.__slot_ids[id(d_obj)] = len(self.__slots)
+            self.__slots.append(d_obj)
+            self.__error_rates.append(INITIAL_ERROR)
+        # Appending to the tree is O(log n) per element, rebuilding it is
+        # faster when many elements are added.
+        if len(d_objs) * len(self.__slots).bit_length() > len(self.__slots):
+            self.__rebuild()
+        else:
+            for slot in range(len(self.__slots) - len(d_objs),
+                              len(self.__slots)):
+                self.__tree.append(self.__weight(slot))
+
+    def remove(self, d_objs: List[DataObject]) -> None:
+        """Remove elements so they are no longer quizzed on.
+
+        Args:
+            d_objs (List[DataObject]): The elements to be removed.
+        """
+        for d_obj in d_objs:
+            slot: Optional[int] = self.__slot_ids.pop(id(d_obj), None)
+            if slot is not None:
+                self.__slots[slot] = None
+        # Rebuilding is O(n), which is the same as finding the elements.
+        self.__rebuild()
+
+    def __len__(self) -> int:
+        """Return the number of elements to be quizzed on."""
+        return len(self.__slot_ids)
+
+    def export_state(self, d_obj: DataObject) -> Tuple[float, ...]:
+        """Return the error rate of an element."""
+        slot: Optional[int] = self.__slot_ids.get(id(d_obj))
+        if slot is None:
+            return ()
+        return (self.__error_rates[slot],)
+
+    def import_state(self, d_obj: DataObject,
+                     state: Tuple[float, ...]) -> None:
+        """Restore the error rate of an element."""
+        slot: Optional[int] = self.__slot_ids.get(id(d_obj))
+        if slot is None or len(state) == 0:
+            return
+        self.__error_rates[slot] = max(0.0, min(state[0], 1.0))
+        if slot != self.__last_slot:
+            self.__tree[slot] = self.__weight(slot)